@@ -4,11 +4,17 @@ from contextlib import contextmanager
 from typing import Generator, Optional, AsyncGenerator
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy.pool import NullPool
 from sqlalchemy.sql import text
 
+from app.config import settings
+from app.utils.pool_helper import InstrumentedQueuePool, InstrumentedAsyncQueuePool, pool_stats
+from app.utils.replica_helper import ReplicaRouter
+
 # Initialize logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +53,17 @@ class DatabaseManager:
             autoflush=False,
             bind=self.engine
         )
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_session_local: Optional[async_sessionmaker] = None
+        self.replica_engines = [] if self.testing else [
+            self._create_engine(url) for url in settings.REPLICA_DATABASE_URLS
+        ]
+        self.replicas = ReplicaRouter(
+            self.SessionLocal,
+            self.replica_engines,
+            strategy=settings.REPLICA_SELECTION,
+            pin_seconds=settings.READ_YOUR_WRITES_SECONDS
+        )
         logger.info(f"Database Manager initialized in {'testing' if self.testing else 'production'} mode")
 
     def _get_database_url(self) -> str:
@@ -61,21 +78,64 @@ class DatabaseManager:
 
         return database_url
 
-    def _create_engine(self) -> Engine:
-        """Create and configure database engine."""
+    @staticmethod
+    def _pool_options() -> dict:
+        """Pool settings shared by the sync and async engines."""
+        return {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+
+    def _create_engine(self, database_url: Optional[str] = None) -> Engine:
+        """Create and configure database engine, for the primary unless another URL is given."""
         try:
             return create_engine(
-                self.database_url,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=1800  # Recycle connections after 30 minutes
+                database_url or self.database_url,
+                poolclass=InstrumentedQueuePool,
+                **self._pool_options()
             )
         except Exception as e:
             error_msg = f"Failed to create database engine: {str(e)}"
             logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """
+        Async engine over asyncpg for the same database, created on first use
+        so processes that never touch it do not need the driver.
+        """
+        if self._async_engine is None:
+            url = make_url(self.database_url).set(drivername="postgresql+asyncpg")
+            # Test clients run each request on a fresh event loop, and asyncpg
+            # connections cannot move between loops, so tests skip pooling
+            pool_options = {"poolclass": NullPool} if self.testing else {
+                "poolclass": InstrumentedAsyncQueuePool,
+                **self._pool_options()
+            }
+            try:
+                self._async_engine = create_async_engine(url, **pool_options)
+            except Exception as e:
+                error_msg = f"Failed to create async database engine: {str(e)}"
+                logger.error(error_msg)
+                raise RuntimeError(error_msg) from e
+            self._async_session_local = async_sessionmaker(
+                bind=self._async_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+        return self._async_engine
+
+    @property
+    def AsyncSessionLocal(self) -> async_sessionmaker:
+        """Session maker bound to the async engine."""
+        if self._async_session_local is None:
+            _ = self.async_engine
+        return self._async_session_local
+
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
         """Context manager for database sessions."""
@@ -90,7 +150,7 @@ class DatabaseManager:
         finally:
             session.close()
 
-    async def get_db(self) -> AsyncGenerator[Session, None]:
+    def get_db(self) -> Generator[Session, None, None]:
         """FastAPI dependency for database sessions."""
         db = self.SessionLocal()
         try:
@@ -98,12 +158,80 @@ class DatabaseManager:
         finally:
             db.close()
 
+    async def get_async_db(self) -> AsyncGenerator[AsyncSession, None]:
+        """FastAPI dependency for async database sessions."""
+        async with self.AsyncSessionLocal() as db:
+            yield db
+
+    def prewarm_pool(self) -> int:
+        """
+        Open DB_POOL_PREWARM connections and return them to the pool.
+
+        Returns:
+            int: Number of connections opened
+        """
+        connections = []
+        try:
+            for _ in range(min(settings.DB_POOL_PREWARM, settings.DB_POOL_SIZE)):
+                connections.append(self.engine.connect())
+        except SQLAlchemyError as e:
+            logger.error(f"Pool pre-warm failed: {str(e)}")
+        finally:
+            for connection in connections:
+                connection.close()
+        return len(connections)
+
+    async def prewarm_async_pool(self) -> int:
+        """Async counterpart of `prewarm_pool` for the async engine."""
+        if self.testing:
+            return 0
+        connections = []
+        try:
+            for _ in range(min(settings.DB_POOL_PREWARM, settings.DB_POOL_SIZE)):
+                connections.append(await self.async_engine.connect())
+        except (SQLAlchemyError, OSError) as e:
+            logger.error(f"Async pool pre-warm failed: {str(e)}")
+        finally:
+            for connection in connections:
+                await connection.close()
+        return len(connections)
+
+    def pool_stats(self) -> dict:
+        """Live state and checkout stats of every connection pool."""
+        return {
+            "sync": pool_stats(self.engine.pool),
+            "async": pool_stats(self._async_engine.pool) if self._async_engine is not None else None,
+            "replicas": [pool_stats(engine.pool) for engine in self.replica_engines],
+        }
+
+    async def dispose_async_engine(self) -> None:
+        """Close the async engine's connections, if it was ever created."""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_local = None
+
+    def get_read_db(self, written_at: Optional[float] = None) -> Generator[Session, None, None]:
+        """
+        Session for read-only work, on a replica unless the caller wrote at `written_at`, recently.
+        """
+        db = self.replicas.session(written_at)
+        try:
+            yield db
+        finally:
+            db.close()
+
     def init_db(self) -> None:
-        """Initialize database schema."""
+        """Initialize database schema and apply pending migrations."""
+        from app.migrations import run_migrations  # Migrations import the models, which import this module
+
         try:
             Base.metadata.create_all(bind=self.engine)
             tables = list(Base.metadata.tables.keys())
             logger.info(f"Database initialized with tables: {tables}")
+            applied = run_migrations(self.engine)
+            if applied:
+                logger.info(f"Applied migrations: {applied}")
         except SQLAlchemyError as e:
             error_msg = f"Failed to initialize database: {str(e)}"
             logger.error(error_msg)
@@ -137,6 +265,8 @@ class DatabaseManager:
         """Cleanup database resources."""
         if hasattr(self, 'engine'):
             self.engine.dispose()
+            for replica_engine in self.replica_engines:
+                replica_engine.dispose()
             delattr(self, 'engine')  # Remove engine attribute
             delattr(self, 'SessionLocal')  # Remove session maker
             self._initialized = False  # Allow re-initialization
@@ -0,0 +1,112 @@
+import logging
+import threading
+import uuid
+from typing import Optional
+
+from sortedcontainers import SortedList
+from sqlalchemy.orm import Session
+
+from app.models.User import User
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardManager:
+    """
+    In-process ranked leaderboard.
+
+    Users are kept in a SortedList keyed on (-points, id), so top-K pages,
+    rank lookups and windows around a rank each take O(log n). The board is
+    rebuilt from the database on startup and kept current by the label
+    submission path. Each worker process holds its own copy.
+    """
+    _instance: Optional['LeaderboardManager'] = None
+
+    def __new__(cls) -> 'LeaderboardManager':
+        """Implement singleton pattern so every module shares one board."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._ranking = SortedList()
+            cls._instance._users = {}
+            cls._instance.ready = False
+        return cls._instance
+
+    @staticmethod
+    def _key(user_id: uuid.UUID, points: int) -> tuple:
+        return -points, str(user_id)
+
+    def rebuild(self, db: Session) -> None:
+        """Reload the whole board from the users table."""
+        rows = db.query(User.id, User.name, User.points, User.labeled_count).all()
+        users = {
+            row.id: {"id": row.id, "name": row.name, "points": row.points or 0,
+                     "labeled_count": row.labeled_count or 0}
+            for row in rows
+        }
+        ranking = SortedList(self._key(user_id, user["points"]) for user_id, user in users.items())
+        with self._lock:
+            self._users = users
+            self._ranking = ranking
+            self.ready = True
+        logger.info(f"Leaderboard rebuilt with {len(users)} users")
+
+    def update(self, user_id: uuid.UUID, name: Optional[str] = None, points: Optional[int] = None,
+               labeled_count: Optional[int] = None) -> None:
+        """Insert a user or update the fields that are given."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                if name is None:
+                    return  # Unknown user without a name, the next rebuild picks it up
+                user = {"id": user_id, "name": name, "points": points or 0, "labeled_count": labeled_count or 0}
+                self._users[user_id] = user
+                self._ranking.add(self._key(user_id, user["points"]))
+                return
+            if name is not None:
+                user["name"] = name
+            if labeled_count is not None:
+                user["labeled_count"] = labeled_count
+            if points is not None and points != user["points"]:
+                self._ranking.remove(self._key(user_id, user["points"]))
+                user["points"] = points
+                self._ranking.add(self._key(user_id, points))
+
+    def _entry(self, index: int) -> dict:
+        _, user_id = self._ranking[index]
+        user = self._users[uuid.UUID(user_id)]
+        # Rank as in SQL RANK(): users with equal points share a rank
+        rank = self._ranking.bisect_left((-user["points"], "")) + 1
+        return {**user, "rank": rank}
+
+    def top(self, offset: int = 0, limit: int = 50) -> list[dict]:
+        """Return one page of the board, best first."""
+        with self._lock:
+            end = min(offset + limit, len(self._ranking))
+            return [self._entry(index) for index in range(offset, end)]
+
+    def rank(self, user_id: uuid.UUID) -> Optional[int]:
+        """Return the user's rank, or None if the user is not on the board."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                return None
+            return self._ranking.bisect_left((-user["points"], "")) + 1
+
+    def around(self, user_id: uuid.UUID, radius: int = 5) -> list[dict]:
+        """Return the user and up to `radius` users ranked directly above and below."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                return []
+            index = self._ranking.index(self._key(user_id, user["points"]))
+            start = max(0, index - radius)
+            end = min(index + radius + 1, len(self._ranking))
+            return [self._entry(i) for i in range(start, end)]
+
+    def reset(self) -> None:
+        """Drop every entry and mark the board as not built."""
+        with self._lock:
+            self._users = {}
+            self._ranking = SortedList()
+            self.ready = False
@@ -0,0 +1,157 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pyarrow as pa
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.controller.task_controller import export_done_tasks
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("type", pa.string()),
+    ("title", pa.string()),
+    ("description", pa.string()),
+    ("data", pa.string()),  # JSON
+    ("tags", pa.list_(pa.string())),
+    ("point", pa.int32()),
+    ("required_labels", pa.int32()),
+    ("done_at", pa.timestamp("us", tz="UTC")),
+    ("labels", pa.list_(pa.struct([
+        ("user_id", pa.string()),
+        ("content", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ]))),
+    ("consensus", pa.string()),
+    ("consensus_votes", pa.int32()),
+])
+
+
+def _row(record: dict) -> dict:
+    return {
+        **record,
+        "id": str(record["id"]),
+        "data": json.dumps(record["data"], ensure_ascii=False, separators=(",", ":")),
+        "labels": [{**label, "user_id": str(label["user_id"])} for label in record["labels"]],
+    }
+
+
+def _batches(records: Iterable[dict], size: int) -> Iterator[pa.RecordBatch]:
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield pa.RecordBatch.from_pylist([_row(record) for record in chunk], schema=SCHEMA)
+
+
+class SnapshotManager:
+    """
+    Versioned Arrow IPC snapshots of the labeled dataset on local disk.
+
+    Each build reads only the tasks closed since the watermark of the latest
+    version and writes a new version file: the record batches of the previous
+    version, read zero-copy from a memory map, followed by the new ones. The
+    database therefore only ever sees the delta. A manifest lists the versions
+    on disk, and builds from several worker processes are serialized by a file
+    lock in the snapshot directory.
+    """
+    _instance: Optional['SnapshotManager'] = None
+
+    def __new__(cls) -> 'SnapshotManager':
+        """Implement singleton pattern so every module shares one snapshot store."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.directory = Path(settings.SNAPSHOT_DIR)
+        return cls._instance
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def versions(self) -> list[dict]:
+        """Return the versions on disk, oldest first."""
+        try:
+            return json.loads(self._manifest_path.read_text())["versions"]
+        except FileNotFoundError:
+            return []
+
+    def path(self, version: int) -> Optional[Path]:
+        """Return the file of a version, or None if it is not on disk."""
+        for entry in self.versions():
+            if entry["version"] == version:
+                return self.directory / entry["file"]
+        return None
+
+    def _write_manifest(self, versions: list[dict]) -> None:
+        tmp = self._manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"versions": versions}, indent=2))
+        os.replace(tmp, self._manifest_path)
+
+    def build(self, db: Session) -> Optional[dict]:
+        """
+        Write the next version if tasks were closed since the last one.
+
+        Returns:
+            Optional[dict]: The manifest entry of the new version, or None if
+            there was nothing new or another process is building
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.directory / ".lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            return self._build(db)
+
+    def _build(self, db: Session) -> Optional[dict]:
+        versions = self.versions()
+        latest = versions[-1] if versions else None
+        watermark = datetime.now(timezone.utc) - timedelta(seconds=settings.SNAPSHOT_SETTLE_SECONDS)
+        records = export_done_tasks(
+            db, done_after=datetime.fromisoformat(latest["watermark"]) if latest else None, done_before=watermark
+        )
+        batches = _batches(records, settings.SNAPSHOT_BATCH_ROWS)
+        first = next(batches, None)
+        if first is None:
+            return None
+
+        version = latest["version"] + 1 if latest else 1
+        path = self.directory / f"dataset-{version:08d}.arrow"
+        tmp = path.with_suffix(".tmp")
+        added = 0
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+            if latest:
+                with pa.memory_map(str(self.directory / latest["file"])) as source:
+                    reader = pa.ipc.open_file(source)
+                    for index in range(reader.num_record_batches):
+                        writer.write_batch(reader.get_batch(index))
+            for batch in chain([first], batches):
+                writer.write_batch(batch)
+                added += batch.num_rows
+        os.replace(tmp, path)
+
+        entry = {
+            "version": version,
+            "file": path.name,
+            "watermark": watermark.isoformat(),
+            "rows": (latest["rows"] if latest else 0) + added,
+            "added": added,
+            "size": path.stat().st_size,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        versions.append(entry)
+        keep = max(1, settings.SNAPSHOT_RETAIN)
+        retained, dropped = versions[-keep:], versions[:-keep]
+        self._write_manifest(retained)
+        for old in dropped:
+            (self.directory / old["file"]).unlink(missing_ok=True)
+        logger.info(f"Wrote dataset snapshot {version} with {added} new tasks")
+        return entry
@@ -1,7 +1,70 @@
+import os
+
+
 class Settings:
     SECRET_KEY: str = "supersecretkey"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TASK_LEASE_SECONDS: int = 300
+    TASK_LEASE_SWEEP_INTERVAL_SECONDS: int = 60
+    DEFAULT_REQUIRED_LABELS: int = 6
+    MAX_LABEL_BATCH_SIZE: int = 100
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    MAX_BULK_ERRORS: int = 100  # Per-row errors reported by /tasks/bulk, the rest are only counted
+    MAX_BULK_RECORD_CHARS: int = 1024 * 1024  # Longer lines and CSV records, e.g. a never closed quote, are rejected
+    EXPORT_YIELD_PER: int = 1000  # Rows fetched per round trip from the server-side cursor of /datasets/export
+    EXPORT_CHUNK_BYTES: int = 64 * 1024
+    # Columnar dataset snapshots on local disk, 0 turns the background builder off
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+    SNAPSHOT_INTERVAL_SECONDS: int = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", 0))
+    SNAPSHOT_RETAIN: int = int(os.getenv("SNAPSHOT_RETAIN", 3))  # Versions kept on disk
+    SNAPSHOT_BATCH_ROWS: int = 10000
+    # Tasks closed this recently wait for the next build, so transactions still
+    # in flight when a build reads its window cannot slip behind the watermark
+    SNAPSHOT_SETTLE_SECONDS: int = 60
+    # Done tasks move to the archive tables this long after closing, 0 turns the archiver off
+    ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", 0))
+    ARCHIVE_AFTER_SECONDS: int = int(os.getenv("ARCHIVE_AFTER_SECONDS", 24 * 3600))
+    ARCHIVE_BATCH_SIZE: int = 500
+    # Recount the label and report counters of tasks, 0 turns the job off
+    RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("RECONCILE_INTERVAL_SECONDS", 0))
+    RECONCILE_BATCH_SIZE: int = 1000
+    # Tasks reported by more than this many distinct users leave the feed until reviewed, 0 turns it off
+    QUARANTINE_REPORT_THRESHOLD: int = int(os.getenv("QUARANTINE_REPORT_THRESHOLD", 3))
+    # Comma separated ids of the users allowed to review quarantined tasks
+    REVIEWER_USER_IDS: list = [user_id.strip().lower() for user_id in os.getenv("REVIEWER_USER_IDS", "").split(",")
+                               if user_id.strip()]
+    # Connection pool of each engine, per worker process. Size it so that
+    # workers * (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW) stays below Postgres' max_connections
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_POOL_MAX_OVERFLOW: int = int(os.getenv("DB_POOL_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+    # Connections opened at startup so the first requests do not pay for the handshake
+    DB_POOL_PREWARM: int = int(os.getenv("DB_POOL_PREWARM", 0))
+    # Comma separated read replica URLs, read-only routes use them when set
+    REPLICA_DATABASE_URLS: list = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",")
+                                   if url.strip()]
+    # "round_robin" or "least_connections"
+    REPLICA_SELECTION: str = os.getenv("REPLICA_SELECTION", "round_robin")
+    # How long a user's reads stay on the primary after their own write
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    # Hash partitions of task_labels and task_reports on task_id, 0 keeps them plain tables.
+    # Existing tables are converted with `python -m app.migrations.partitioning <table>`
+    TASK_LABEL_PARTITIONS: int = int(os.getenv("TASK_LABEL_PARTITIONS", 0))
+    TASK_REPORT_PARTITIONS: int = int(os.getenv("TASK_REPORT_PARTITIONS", 0))
+    LEADERBOARD_REBUILD_INTERVAL_SECONDS: int = 300
+    # "memory" serves the leaderboard from LeaderboardManager, "sql" queries the users table
+    LEADERBOARD_BACKEND: str = os.getenv("LEADERBOARD_BACKEND", "memory")
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    REVOKED_TOKEN_CACHE_SIZE: int = 100000
+    # bcrypt runs in its own thread pool so it never blocks the event loop
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
 
 
 settings = Settings()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, Integer, bindparam, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ArchivedTask, ArchivedTaskLabel, ArchivedTaskReport, Task, TaskLabel, TaskReport
+from app.utils.archive_helper import column_list
+
+
+def _move(source, target, alias: str, batch_match: str) -> str:
+    """CTE pair that deletes the batch's rows from `source` and inserts them into `target`."""
+    return f"""
+    {alias} AS (
+        DELETE FROM {source.name} USING batch
+        WHERE {batch_match}
+        RETURNING {column_list(source, f"{source.name}.")}
+    ),
+    archived_{alias} AS (
+        INSERT INTO {target.name} ({column_list(target)})
+        SELECT {column_list(target)} FROM {alias}
+        RETURNING id
+    )"""
+
+
+# Moves one batch of done tasks with their labels and reports to the archive
+# tables in a single statement, and drops their tallies and leases, which only
+# matter while a task is open. Batch rows are locked with SKIP LOCKED so a
+# running label submission is never waited on.
+_ARCHIVE_BATCH = text(f"""
+    WITH batch AS (
+        SELECT id FROM tasks
+        WHERE is_done AND done_at < :before
+        ORDER BY done_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    ),
+    leases AS (
+        DELETE FROM task_leases USING batch WHERE task_leases.task_id = batch.id
+    ),
+    tallies AS (
+        DELETE FROM task_vote_tallies USING batch WHERE task_vote_tallies.task_id = batch.id
+    ),{_move(TaskLabel.__table__, ArchivedTaskLabel.__table__, "labels", "task_labels.task_id = batch.id")},{
+    _move(TaskReport.__table__, ArchivedTaskReport.__table__, "reports", "task_reports.task_id = batch.id")},{
+    _move(Task.__table__, ArchivedTask.__table__, "moved", "tasks.id = batch.id")}
+    SELECT count(*) AS archived FROM archived_moved
+""").bindparams(
+    bindparam("before", type_=DateTime(timezone=True)),
+    bindparam("limit", type_=Integer),
+).columns(archived=Integer)
+
+
+def archive_done_tasks(db: Session, older_than: timedelta = timedelta(seconds=settings.ARCHIVE_AFTER_SECONDS),
+                       batch_size: int = settings.ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move tasks that were closed more than `older_than` ago, with their labels
+    and reports, from the hot tables to the archive tables.
+
+    Each batch is moved in its own transaction, so the archiver never holds
+    locks on more than `batch_size` tasks and can be stopped at any point.
+    The hot tables then only hold the open backlog and recently closed tasks.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        older_than (timedelta, optional): How long a task stays in the hot tables after closing
+        batch_size (int, optional): Tasks moved per transaction
+
+    Returns:
+        int: Number of tasks archived
+    """
+    before = datetime.now(timezone.utc) - older_than
+    archived = 0
+    while True:
+        moved = db.execute(_ARCHIVE_BATCH, {"before": before, "limit": batch_size}).scalar_one()
+        db.commit()
+        archived += moved
+        if moved < batch_size:
+            return archived
@@ -0,0 +1,79 @@
+from typing import Optional
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Task, TaskLabel, TaskReport
+from app.utils.cursor_helper import encode_cursor, decode_cursor
+
+# Entity name, model and the columns sent with each change
+_TRACKED = (
+    ("task", Task, (Task.type, Task.title, Task.description, Task.data, Task.tags, Task.point,
+                    Task.required_labels, Task.is_done, Task.done_at, Task.label_count, Task.report_count,
+                    Task.last_labeled_at, Task.reporter_count, Task.is_quarantined, Task.quarantined_at)),
+    ("label", TaskLabel, (TaskLabel.task_id, TaskLabel.user_id, TaskLabel.content, TaskLabel.created_at)),
+    ("report", TaskReport, (TaskReport.task_id, TaskReport.user_id, TaskReport.details)),
+)
+
+
+def get_changes(db: Session, since: Optional[str] = None, limit: int = 100) -> tuple[list[dict], str, bool]:
+    """
+    Get the tasks, labels and reports written since a cursor.
+
+    Every insert and update stamps the row with the next value of a shared
+    sequence and the id of the writing transaction. Sequence values are taken
+    before commit, so a change with a lower number may become visible after
+    one with a higher number. Changes are therefore read in (transaction id,
+    change number) order, and only from transactions older than every one
+    still running, which can no longer be overtaken. Each table is read from
+    its (change_xid, change_seq) index, so the cost follows the number of
+    changes rather than the size of the tables. A row shows up once in its
+    latest state; deletes are not reported.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        since (str, optional): `next_since` of the previous page, None to start from the beginning
+        limit (int, optional): Maximum number of changes to return. Defaults to 100.
+
+    Returns:
+        tuple[list[dict], str, bool]: The changes, the cursor for the next
+        call and whether more changes are available right away
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    values = decode_cursor(since)
+    try:
+        position = (int(values[0]), int(values[1])) if values else (0, 0)
+    except (IndexError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    horizon = db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar_one()
+
+    changes = []
+    for entity, model, columns in _TRACKED:
+        statement = (
+            select(model.id, model.change_xid, model.change_seq, *columns)
+            .where(tuple_(model.change_xid, model.change_seq) > tuple_(*position), model.change_xid < horizon)
+            .order_by(model.change_xid, model.change_seq)
+            .limit(limit + 1)
+        )
+        for row in db.execute(statement):
+            changes.append({
+                "xid": row.change_xid,
+                "seq": row.change_seq,
+                "entity": entity,
+                "id": row.id,
+                "fields": {column.key: getattr(row, column.key) for column in columns},
+            })
+    changes.sort(key=lambda change: (change["xid"], change["seq"]))
+
+    has_more = len(changes) > limit
+    if has_more:
+        changes = changes[:limit]
+        next_since = encode_cursor([changes[-1]["xid"], changes[-1]["seq"]])
+    else:
+        # Everything below the horizon has been read, later changes start above it
+        next_since = encode_cursor(max(position, (horizon, 0)))
+    for change in changes:
+        del change["xid"]
+    return changes, next_since, has_more
@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.RevokedToken import RevokedToken
+from app.utils.JWT_helper import REFRESH_TOKEN_EXPIRE_DAYS, create_access_token, create_refresh_token
+from app.utils.cache_helper import TTLCache
+
+# jti values this process has seen revoked, so replays are refused without a query
+revoked_jti_cache = TTLCache(settings.REVOKED_TOKEN_CACHE_SIZE, REFRESH_TOKEN_EXPIRE_DAYS.total_seconds())
+
+
+def revoke_refresh_token(db: Session, payload: dict) -> bool:
+    """
+    Add a decoded refresh token to the revocation list.
+
+    The insert is keyed on the token's jti, so of two concurrent calls with
+    the same token exactly one succeeds.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        payload (dict): Claims of a decoded refresh token
+
+    Returns:
+        bool: True if the token was revoked by this call, False if it already was
+    """
+    jti = payload["jti"]
+    if revoked_jti_cache.get(jti):
+        return False
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    statement = (
+        insert(RevokedToken)
+        .values(jti=jti, user_id=uuid.UUID(payload["user_id"]), expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        .returning(RevokedToken.jti)
+    )
+    revoked = db.execute(statement).first() is not None
+    db.commit()
+    revoked_jti_cache.set(jti, True, ttl=(expires_at - datetime.now(timezone.utc)).total_seconds())
+    return revoked
+
+
+def rotate_refresh_token(db: Session, payload: dict) -> tuple[str, str]:
+    """
+    Swap a refresh token for a new access token and a new refresh token.
+
+    The presented token is revoked, so each refresh token works once.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        payload (dict): Claims of a decoded refresh token
+
+    Returns:
+        tuple[str, str]: The new access token and refresh token
+
+    Raises:
+        ValueError: If the refresh token was already used or revoked
+    """
+    if not revoke_refresh_token(db, payload):
+        raise ValueError("Refresh token has been revoked")
+    user_id = payload["user_id"]
+    return create_access_token({"user_id": user_id}), create_refresh_token(user_id)
+
+
+def purge_expired_revocations(db: Session) -> int:
+    """
+    Delete revocation entries whose tokens have expired anyway.
+
+    Args:
+        db (Session): SQLAlchemy database session
+
+    Returns:
+        int: Number of entries removed
+    """
+    purged = db.query(RevokedToken).filter(
+        RevokedToken.expires_at <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return purged
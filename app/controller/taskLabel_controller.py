@@ -1,10 +1,23 @@
 import uuid
+from collections import Counter
+from typing import Optional
 
+from sqlalchemy import UUID, ARRAY, Boolean, Integer, String, DateTime, bindparam, text, exists, func, update, and_, \
+    or_, case
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Task, User
+from app.LeaderboardManager import LeaderboardManager
+from app.models import Task, TaskVoteTally, TaskLease, User, UserPointBucket
 from app.models.TaskLabel import TaskLabel
+from app.utils.bucket_helper import current_bucket_start
+from app.utils.cache_helper import refresh_cached_principal
+from app.utils.hash_helper import canonical_content_hash
+from app.utils.uuid_helper import uuid7
+
+leaderboard = LeaderboardManager()
 
 
 def get_label_by_task(db: Session, task_id: uuid.UUID):
@@ -27,9 +40,140 @@ def get_label_by_task(db: Session, task_id: uuid.UUID):
     return label
 
 
-def submit_label(db: Session, user_id: uuid.UUID, task_id: uuid.UUID, content: str):
+# Inserts the label, credits the user and the user's hourly point bucket,
+# bumps the task's vote tally and label counter, closes the task once it has
+# collected `required_labels` labels and releases the user's lease, all in
+# one statement. The users and tasks rows are updated in place, so concurrent
+# submissions serialize on their row locks instead of losing updates, and the
+# closing check counts every earlier label. A user's second label on a task
+# hits the unique (user_id, task_id) index and writes nothing, as in
+# `submit_labels`, also when both labels are submitted at once. The final
+# SELECT reports which of the user and task were found, whether the label
+# was written and whether the task is done.
+_SUBMIT_LABEL = text("""
+    WITH src AS (
+        SELECT u.id AS user_id, t.id AS task_id, t.point AS point
+        FROM users u
+        LEFT JOIN tasks t ON t.id = :task_id
+        WHERE u.id = :user_id
+    ),
+    inserted AS (
+        INSERT INTO task_labels (id, user_id, task_id, content)
+        SELECT CAST(:label_id AS uuid), src.user_id, src.task_id, :content
+        FROM src
+        WHERE src.task_id IS NOT NULL
+        ON CONFLICT (user_id, task_id) DO NOTHING
+        RETURNING id
+    ),
+    credited AS (
+        UPDATE users
+        SET points = users.points + src.point,
+            labeled_count = users.labeled_count + 1
+        FROM src, inserted
+        WHERE users.id = src.user_id
+        RETURNING users.points, users.labeled_count
+    ),
+    bucketed AS (
+        INSERT INTO user_point_buckets (bucket_start, user_id, points, labeled_count)
+        SELECT :bucket_start, src.user_id, src.point, 1
+        FROM src, inserted
+        ON CONFLICT (bucket_start, user_id)
+        DO UPDATE SET points = user_point_buckets.points + EXCLUDED.points,
+                      labeled_count = user_point_buckets.labeled_count + 1
+    ),
+    tallied AS (
+        INSERT INTO task_vote_tallies (task_id, content_hash, votes)
+        SELECT src.task_id, :content_hash, 1
+        FROM src, inserted
+        ON CONFLICT (task_id, content_hash)
+        DO UPDATE SET votes = task_vote_tallies.votes + 1
+    ),
+    counted AS (
+        UPDATE tasks
+        SET label_count = tasks.label_count + 1,
+            last_labeled_at = now(),
+            is_done = tasks.is_done OR tasks.label_count + 1 >= tasks.required_labels,
+            done_at = CASE WHEN NOT tasks.is_done AND tasks.label_count + 1 >= tasks.required_labels
+                           THEN now() ELSE tasks.done_at END
+        FROM src, inserted
+        WHERE tasks.id = src.task_id
+        RETURNING tasks.is_done
+    ),
+    released AS (
+        DELETE FROM task_leases
+        USING inserted
+        WHERE task_leases.task_id = :task_id AND task_leases.user_id = :user_id
+    )
+    SELECT src.task_id, inserted.id AS label_id, credited.points, credited.labeled_count, counted.is_done
+    FROM src
+    LEFT JOIN inserted ON true
+    LEFT JOIN credited ON true
+    LEFT JOIN counted ON true
+""").bindparams(
+    bindparam("label_id", type_=UUID(as_uuid=True)),
+    bindparam("user_id", type_=UUID(as_uuid=True)),
+    bindparam("task_id", type_=UUID(as_uuid=True)),
+    bindparam("bucket_start", type_=DateTime(timezone=True)),
+).columns(task_id=UUID(as_uuid=True), label_id=UUID(as_uuid=True), points=Integer, labeled_count=Integer,
+          is_done=Boolean)
+
+# Picks the leading answer of each task from its vote tally, most votes first
+# and ties going to the lower content hash, and stores it on the tasks that
+# are done. Only the tally rows of the tasks are read, one per distinct answer.
+_SETTLE_CONSENSUS = text("""
+    WITH winner AS (
+        SELECT DISTINCT ON (task_id) task_id, content_hash, votes
+        FROM task_vote_tallies
+        WHERE task_id = ANY(CAST(:task_ids AS uuid[]))
+        ORDER BY task_id, votes DESC, content_hash
+    ),
+    settled AS (
+        UPDATE tasks
+        SET consensus_hash = winner.content_hash, consensus_votes = winner.votes
+        FROM winner
+        WHERE tasks.id = winner.task_id AND tasks.is_done
+          AND (tasks.consensus_hash, tasks.consensus_votes) IS DISTINCT FROM (winner.content_hash, winner.votes)
+    )
+    SELECT task_id, content_hash, votes FROM winner
+""").bindparams(
+    bindparam("task_ids", type_=ARRAY(UUID(as_uuid=True))),
+).columns(task_id=UUID(as_uuid=True), content_hash=String, votes=Integer)
+
+
+def _submit_label_params(user_id: uuid.UUID, task_id: uuid.UUID, content: str) -> dict:
+    return {
+        "label_id": uuid7(),
+        "user_id": user_id,
+        "task_id": task_id,
+        "content": content,
+        "content_hash": canonical_content_hash(content) if content is not None else None,
+        "bucket_start": current_bucket_start(),
+    }
+
+
+def _submit_label_error(row) -> Optional[str]:
+    """Error message for a `_SUBMIT_LABEL` result row that wrote nothing."""
+    if row is None:
+        return "User not found"
+    if row.task_id is None:
+        return "Task not found"
+    if row.label_id is None:
+        return "Task already labeled"
+    return None
+
+
+def _credit_submitter(user_id: uuid.UUID, row) -> None:
+    """Push the submitter's new totals to the in-process leaderboard and principal cache."""
+    leaderboard.update(user_id, points=row.points, labeled_count=row.labeled_count)
+    refresh_cached_principal(user_id, points=row.points, labeled_count=row.labeled_count)
+
+
+def submit_label(db: Session, user_id: uuid.UUID, task_id: uuid.UUID, content: str) -> uuid.UUID:
     """
-    Submit a new label for a task and update user points.
+    Submit a new label for a task, update user points and the task's vote tally,
+    close the task once enough labels are in and release the user's lease on it.
+
+    All of it runs as a single statement in one round trip.
 
     Args:
         db (Session): SQLAlchemy database session
@@ -38,59 +182,220 @@ def submit_label(db: Session, user_id: uuid.UUID, task_id: uuid.UUID, content: s
         content (str): The label content
 
     Returns:
-        TaskLabel: The created label object
+        uuid.UUID: ID of the created label
 
     Raises:
         ValueError: If user or task not found, or on database error
     """
     try:
-        label = TaskLabel(user_id=user_id, task_id=task_id, content=content)
-        db.add(label)
+        row = db.execute(_SUBMIT_LABEL, _submit_label_params(user_id, task_id, content)).first()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise ValueError(f"Database error: {str(e)}")
+
+    error = _submit_label_error(row)
+    if error:
+        db.rollback()
+        raise ValueError(error)
+
+    if row.is_done:
+        calculate_consensus(db, task_id)
+    db.commit()
+    _credit_submitter(user_id, row)
+    return row.label_id
+
+
+async def submit_label_async(db: AsyncSession, user_id: uuid.UUID, task_id: uuid.UUID, content: str) -> uuid.UUID:
+    """
+    Async version of `submit_label` for an AsyncSession.
+    """
+    try:
+        row = (await db.execute(_SUBMIT_LABEL, _submit_label_params(user_id, task_id, content))).first()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise ValueError(f"Database error: {str(e)}")
+
+    error = _submit_label_error(row)
+    if error:
+        await db.rollback()
+        raise ValueError(error)
+
+    if row.is_done:
+        await db.execute(_SETTLE_CONSENSUS, {"task_ids": [task_id]})
+    await db.commit()
+    _credit_submitter(user_id, row)
+    return row.label_id
+
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+def submit_labels(db: Session, user_id: uuid.UUID, items: list[tuple[uuid.UUID, str]]) -> list[dict]:
+    """
+    Submit several labels at once for the same user.
+
+    The batch is validated with a single lookup, all valid labels are written
+    with one multi-row insert and the user is credited with one aggregated
+    update for the labels actually inserted. Tasks the user already labeled,
+    also by a concurrent request, hit the unique (user_id, task_id) index and
+    are skipped. Invalid items are reported individually and do not fail the
+    batch.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        user_id (uuid.UUID): ID of the user submitting the labels
+        items (list[tuple[uuid.UUID, str]]): (task_id, content) pairs
+
+    Returns:
+        list[dict]: One result per item, in order, with `task_id`, `status`
+        and either `label_id` or `detail`
+
+    Raises:
+        ValueError: If the user is not found, or on database error
+    """
+    task_ids = {task_id for task_id, _ in items}
+    labeled_by_user = exists().where(TaskLabel.task_id == Task.id, TaskLabel.user_id == user_id)
+    user_found = exists().where(User.id == user_id)
+    try:
+        found = {
+            row.id: row
+            for row in db.query(Task.id, Task.point, labeled_by_user.label("labeled"), user_found.label("user_found"))
+            .filter(Task.id.in_(task_ids))
+        }
+        if found and not next(iter(found.values())).user_found:
             db.rollback()
             raise ValueError("User not found")
 
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if not task:
+        results = []
+        rows = []
+        seen = set()
+        for task_id, content in items:
+            task = found.get(task_id)
+            if task is None:
+                results.append({"task_id": task_id, "status": "error", "detail": "Task not found"})
+            elif task_id in seen:
+                results.append({"task_id": task_id, "status": "error", "detail": "Duplicate task in batch"})
+            elif task.labeled:
+                results.append({"task_id": task_id, "status": "error", "detail": "Task already labeled"})
+            else:
+                label_id = uuid7()
+                rows.append({"id": label_id, "user_id": user_id, "task_id": task_id, "content": content})
+                results.append({"task_id": task_id, "status": "success", "label_id": label_id})
+            seen.add(task_id)
+
+        if rows:
+            inserted = set(db.execute(
+                insert(TaskLabel).values(rows)
+                .on_conflict_do_nothing(index_elements=[TaskLabel.user_id, TaskLabel.task_id])
+                .returning(TaskLabel.task_id)
+            ).scalars())
+            rows = [row for row in rows if row["task_id"] in inserted]
+            results = [
+                {"task_id": result["task_id"], "status": "error", "detail": "Task already labeled"}
+                if result["status"] == "success" and result["task_id"] not in inserted else result
+                for result in results
+            ]
+        if not rows:
             db.rollback()
-            raise ValueError("Task not found")
+            return results
+
+        votes = Counter((row["task_id"], canonical_content_hash(row["content"])) for row in rows)
+        earned_points = sum(found[row["task_id"]].point for row in rows)
+        credited = db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(points=User.points + earned_points, labeled_count=User.labeled_count + len(rows))
+            .returning(User.points, User.labeled_count)
+        ).first()
+        if credited is None:
+            db.rollback()
+            raise ValueError("User not found")
+
+        bucket = insert(UserPointBucket).values(
+            bucket_start=current_bucket_start(),
+            user_id=user_id,
+            points=earned_points,
+            labeled_count=len(rows),
+        )
+        db.execute(bucket.on_conflict_do_update(
+            index_elements=[UserPointBucket.bucket_start, UserPointBucket.user_id],
+            set_={
+                "points": UserPointBucket.points + bucket.excluded.points,
+                "labeled_count": UserPointBucket.labeled_count + bucket.excluded.labeled_count,
+            }
+        ))
+
+        tally = insert(TaskVoteTally).values([
+            {"task_id": task_id, "content_hash": content_hash, "votes": count}
+            for (task_id, content_hash), count in votes.items()
+        ])
+        db.execute(tally.on_conflict_do_update(
+            index_elements=[TaskVoteTally.task_id, TaskVoteTally.content_hash],
+            set_={"votes": TaskVoteTally.votes + tally.excluded.votes}
+        ))
+
+        labeled_ids = [row["task_id"] for row in rows]
+        closing = and_(Task.is_done == False, Task.label_count + 1 >= Task.required_labels)
+        done_ids = db.execute(
+            update(Task)
+            .where(Task.id.in_(labeled_ids))
+            .values({
+                Task.label_count: Task.label_count + 1,
+                Task.last_labeled_at: func.now(),
+                Task.done_at: case((closing, func.now()), else_=Task.done_at),
+                Task.is_done: or_(Task.is_done, Task.label_count + 1 >= Task.required_labels),
+            })
+            .returning(Task.id, Task.is_done)
+            .execution_options(synchronize_session=False)
+        ).all()
+        done_ids = [task_id for task_id, is_done in done_ids if is_done]
+        if done_ids:
+            db.execute(_SETTLE_CONSENSUS, {"task_ids": done_ids})
+
+        db.query(TaskLease).filter(
+            TaskLease.user_id == user_id,
+            TaskLease.task_id.in_(labeled_ids)
+        ).delete(synchronize_session=False)
 
-        user.points += task.point
-        user.labeled_count += 1
         db.commit()
-        return label
+        _credit_submitter(user_id, credited)
+        return results
     except SQLAlchemyError as e:
         db.rollback()
         raise ValueError(f"Database error: {str(e)}")
 
 
-def calculate_consensus(db: Session, task_id: uuid.UUID):
+async def submit_labels_async(db: AsyncSession, user_id: uuid.UUID,
+                              items: list[tuple[uuid.UUID, str]]) -> list[dict]:
+    """
+    Async version of `submit_labels` for an AsyncSession, run on the session's
+    connection through `run_sync`.
     """
-    Calculate the consensus label for a task based on submitted labels.
-    Marks task as done if consensus is reached with more than 5 labels.
+    return await db.run_sync(submit_labels, user_id, items)
+
+
+def calculate_consensus(db: Session, task_id: uuid.UUID) -> Optional[tuple[str, int]]:
+    """
+    Decide the consensus answer of a task from its vote tally.
+
+    The answer with the most votes wins, ties going to the lower content
+    hash. Once the task is done the result is stored on it as
+    `consensus_hash` and `consensus_votes`, in the caller's transaction.
+    Label submission calls this whenever a label lands on a done task, so
+    closed tasks always carry their consensus.
+
+    Only the tally rows of the task are read, one per distinct answer, so the
+    cost does not grow with the number of labels.
 
     Args:
         db (Session): SQLAlchemy database session
         task_id (uuid.UUID): ID of the task to calculate consensus for
 
     Returns:
-        Task: The updated task object if consensus reached, None otherwise
+        Optional[tuple[str, int]]: Content hash and votes of the leading
+        answer, None if the task has no labels
     """
-    labels = db.query(TaskLabel).filter(TaskLabel.task_id == task_id).all()
-    if labels:
-        content_votes = {}
-        for label in labels:
-            content_votes[label.content] = content_votes.get(label.content, 0) + 1
-        consensus = max(content_votes, key=content_votes.get)
-        # Mark task as done if consensus is reached
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task and len(labels) > 5:
-            task.is_done = True
-            db.commit()
-        return task
-    return None
+    db.flush()
+    row = db.execute(_SETTLE_CONSENSUS, {"task_ids": [task_id]}).first()
+    return (row.content_hash, row.votes) if row else None
+
 
 # def submit_task(db: Session, label: TaskLabel):
 #     """
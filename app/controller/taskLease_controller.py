@@ -0,0 +1,186 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import exists, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.controller.task_controller import task_feed_statement, task_feed_page
+from app.models.Task import Task
+from app.models.TaskLease import TaskLease
+
+
+def _leasable_feed_statement(user_id: uuid.UUID, limit: int, cursor: Optional[str], now: datetime):
+    """Feed page query that skips tasks leased to others and locks the rows it returns."""
+    leased_by_other = exists().where(
+        TaskLease.task_id == Task.id,
+        TaskLease.user_id != user_id,
+        TaskLease.expires_at > now
+    )
+    return (
+        task_feed_statement(user_id, limit, cursor)
+        .where(~leased_by_other)
+        .with_for_update(of=Task, skip_locked=True)
+    )
+
+
+def _lease_upsert_statement(tasks: list[Task], user_id: uuid.UUID, now: datetime, expires_at: datetime):
+    """
+    Insert or take over the leases on `tasks` for the user, returning the ids
+    of the tasks actually leased.
+
+    A live lease of another user is left alone: the feed query's NOT EXISTS
+    reads its snapshot, so a lease committed after the query started is only
+    seen here.
+    """
+    upsert = insert(TaskLease).values([
+        {"task_id": task.id, "user_id": user_id, "expires_at": expires_at, "heartbeat_at": now}
+        for task in tasks
+    ])
+    return upsert.on_conflict_do_update(
+        index_elements=[TaskLease.task_id],
+        set_={
+            "user_id": upsert.excluded.user_id,
+            "expires_at": upsert.excluded.expires_at,
+            "heartbeat_at": upsert.excluded.heartbeat_at,
+        },
+        where=(TaskLease.expires_at <= now) | (TaskLease.user_id == upsert.excluded.user_id)
+    ).returning(TaskLease.task_id)
+
+
+def lease_task_feed(db: Session, user_id: uuid.UUID, limit: int,
+                    cursor: Optional[str] = None) -> tuple[list[Task], Optional[str], Optional[datetime]]:
+    """
+    Get a page of the user's task feed and reserve every returned task for them.
+
+    Tasks leased to other users are skipped, and candidate rows are locked with
+    `SELECT ... FOR UPDATE SKIP LOCKED` so concurrent callers never hand out the
+    same task. Expired leases are taken over.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        user_id (uuid.UUID): ID of the user requesting the feed
+        limit (int): Maximum number of tasks to return
+        cursor (str, optional): Opaque cursor returned with the previous page
+
+    Returns:
+        tuple[list[Task], Optional[str], Optional[datetime]]: The leased tasks,
+        the cursor for the next page and the lease expiry time
+    """
+    now = datetime.now(timezone.utc)
+    statement = _leasable_feed_statement(user_id, limit, cursor, now)
+    tasks, next_cursor = task_feed_page(list(db.execute(statement).scalars().all()), limit)
+    if not tasks:
+        db.commit()
+        return tasks, next_cursor, None
+
+    expires_at = now + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+    leased = set(db.execute(_lease_upsert_statement(tasks, user_id, now, expires_at)).scalars().all())
+    db.commit()
+    tasks = [task for task in tasks if task.id in leased]
+    return tasks, next_cursor, expires_at if tasks else None
+
+
+async def lease_task_feed_async(db: AsyncSession, user_id: uuid.UUID, limit: int,
+                                cursor: Optional[str] = None) -> tuple[list[Task], Optional[str], Optional[datetime]]:
+    """
+    Async version of `lease_task_feed` for an AsyncSession.
+    """
+    now = datetime.now(timezone.utc)
+    statement = _leasable_feed_statement(user_id, limit, cursor, now)
+    tasks, next_cursor = task_feed_page(list((await db.execute(statement)).scalars().all()), limit)
+    if not tasks:
+        await db.commit()
+        return tasks, next_cursor, None
+
+    expires_at = now + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+    leased = set((await db.execute(_lease_upsert_statement(tasks, user_id, now, expires_at))).scalars().all())
+    await db.commit()
+    tasks = [task for task in tasks if task.id in leased]
+    return tasks, next_cursor, expires_at if tasks else None
+
+
+def _heartbeat_statement(user_id: uuid.UUID, task_id: uuid.UUID, now: datetime, expires_at: datetime):
+    """Extend the user's lease on the task if it has not expired yet."""
+    return (
+        update(TaskLease)
+        .where(TaskLease.task_id == task_id, TaskLease.user_id == user_id, TaskLease.expires_at > now)
+        .values(expires_at=expires_at, heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def heartbeat_lease(db: Session, user_id: uuid.UUID, task_id: uuid.UUID) -> datetime:
+    """
+    Extend the user's active lease on a task.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        user_id (uuid.UUID): ID of the lease holder
+        task_id (uuid.UUID): ID of the leased task
+
+    Returns:
+        datetime: The new lease expiry time
+
+    Raises:
+        ValueError: If the user holds no active lease on the task
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+    renewed = db.execute(_heartbeat_statement(user_id, task_id, now, expires_at)).rowcount
+    if not renewed:
+        db.rollback()
+        raise ValueError(f"No active lease on task {task_id}")
+    db.commit()
+    return expires_at
+
+
+async def heartbeat_lease_async(db: AsyncSession, user_id: uuid.UUID, task_id: uuid.UUID) -> datetime:
+    """
+    Async version of `heartbeat_lease` for an AsyncSession.
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+    renewed = (await db.execute(_heartbeat_statement(user_id, task_id, now, expires_at))).rowcount
+    if not renewed:
+        await db.rollback()
+        raise ValueError(f"No active lease on task {task_id}")
+    await db.commit()
+    return expires_at
+
+
+def release_lease(db: Session, user_id: uuid.UUID, task_id: uuid.UUID) -> None:
+    """
+    Drop the user's lease on a task as part of the caller's transaction.
+
+    The caller is responsible for committing.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        user_id (uuid.UUID): ID of the lease holder
+        task_id (uuid.UUID): ID of the leased task
+    """
+    db.query(TaskLease).filter(
+        TaskLease.task_id == task_id,
+        TaskLease.user_id == user_id
+    ).delete(synchronize_session=False)
+
+
+def sweep_expired_leases(db: Session) -> int:
+    """
+    Delete every lease that has expired.
+
+    Args:
+        db (Session): SQLAlchemy database session
+
+    Returns:
+        int: Number of leases removed
+    """
+    swept = db.query(TaskLease).filter(
+        TaskLease.expires_at <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return swept
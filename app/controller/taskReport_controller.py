@@ -1,9 +1,16 @@
 import uuid
+from datetime import datetime
+from typing import Optional
 
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.controller.taskLease_controller import release_lease
 from app.models import User, Task
 from app.models.TaskReport import TaskReport
+from app.utils.cursor_helper import encode_cursor, decode_cursor
 
 
 def list_reported_tasks_by_user(db: Session, user_id: uuid.UUID):
@@ -22,7 +29,14 @@ def list_reported_tasks_by_user(db: Session, user_id: uuid.UUID):
 
 def report_task(db: Session, user_id: uuid.UUID, task_id: uuid.UUID, details: str):
     """
-    Create a new task report.
+    Create a new task report, count it on the task and release the user's lease on the task.
+
+    The task row is locked while the report is counted. A user's first report
+    of the task also counts towards `reporter_count`, and once more than
+    QUARANTINE_REPORT_THRESHOLD distinct users reported the task it is
+    quarantined and leaves the feed until it is reviewed. The check is a
+    lookup on the (user_id, task_id) index and the counter on the task, so
+    it costs the same however often the task was reported.
 
     Args:
         db (Session): SQLAlchemy database session
@@ -33,15 +47,116 @@ def report_task(db: Session, user_id: uuid.UUID, task_id: uuid.UUID, details: st
     Returns:
         TaskReport: The created report object if successful, None otherwise
     """
-    task_report = TaskReport(user_id=user_id, task_id=task_id, details=details)
-    db.add(task_report)
-
     user = db.query(User).filter(User.id == user_id).first()
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
 
     if user and task:
+        reported_before = db.query(exists().where(TaskReport.user_id == user_id,
+                                                  TaskReport.task_id == task_id)).scalar()
+        task_report = TaskReport(user_id=user_id, task_id=task_id, details=details)
+        db.add(task_report)
+        task.report_count += 1
+        if not reported_before:
+            task.reporter_count += 1
+            threshold = settings.QUARANTINE_REPORT_THRESHOLD
+            if threshold and task.reporter_count > threshold and not task.is_quarantined:
+                task.is_quarantined = True
+                task.quarantined_at = func.now()
+        release_lease(db, user_id, task_id)
         db.commit()
         db.refresh(task_report)
         return task_report
     db.rollback()
     return None
+
+
+async def report_task_async(db: AsyncSession, user_id: uuid.UUID, task_id: uuid.UUID, details: str):
+    """
+    Async version of `report_task` for an AsyncSession, run on the session's
+    connection through `run_sync`.
+    """
+    return await db.run_sync(report_task, user_id, task_id, details)
+
+
+def list_quarantined_tasks(db: Session, limit: int = 50,
+                           cursor: Optional[str] = None) -> tuple[list[Task], Optional[str]]:
+    """
+    Get a page of the review queue: quarantined tasks, longest quarantined first.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        limit (int, optional): Maximum number of tasks to return
+        cursor (str, optional): Opaque cursor returned with the previous page
+
+    Returns:
+        tuple[list[Task], Optional[str]]: The page of quarantined tasks and the
+        cursor for the next page, or None if this is the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = db.query(Task).filter(Task.is_quarantined == True)
+    values = decode_cursor(cursor)
+    if values:
+        if len(values) != 2:
+            raise ValueError("Invalid cursor")
+        quarantined_at, after = datetime.fromisoformat(values[0]), uuid.UUID(values[1])
+        query = query.filter(or_(
+            Task.quarantined_at > quarantined_at,
+            and_(Task.quarantined_at == quarantined_at, Task.id > after)
+        ))
+    tasks = query.order_by(Task.quarantined_at, Task.id).limit(limit + 1).all()
+    if len(tasks) <= limit:
+        return tasks, None
+    tasks = tasks[:limit]
+    return tasks, encode_cursor([tasks[-1].quarantined_at.isoformat(), tasks[-1].id])
+
+
+async def list_quarantined_tasks_async(db: AsyncSession, limit: int = 50,
+                                     cursor: Optional[str] = None) -> tuple[list[Task], Optional[str]]:
+    """
+    Async version of `list_quarantined_tasks` for an AsyncSession, run on the
+    session's connection through `run_sync`.
+    """
+    return await db.run_sync(list_quarantined_tasks, limit, cursor)
+
+
+def release_quarantined_task(db: Session, task_id: uuid.UUID) -> Optional[Task]:
+    """
+    Return a reviewed task to the feed.
+
+    `reporter_count` starts over, so the task is quarantined again only if
+    as many new users report it. Users who reported it before keep it out of
+    their own feed.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        task_id (uuid.UUID): ID of the quarantined task
+
+    Returns:
+        Task: The released task, None if it does not exist
+
+    Raises:
+        ValueError: If the task is not quarantined
+    """
+    task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
+    if task is None:
+        db.rollback()
+        return None
+    if not task.is_quarantined:
+        db.rollback()
+        raise ValueError("Task is not quarantined")
+    task.is_quarantined = False
+    task.quarantined_at = None
+    task.reporter_count = 0
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+async def release_quarantined_task_async(db: AsyncSession, task_id: uuid.UUID) -> Optional[Task]:
+    """
+    Async version of `release_quarantined_task` for an AsyncSession, run on
+    the session's connection through `run_sync`.
+    """
+    return await db.run_sync(release_quarantined_task, task_id)
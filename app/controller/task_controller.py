@@ -1,57 +1,219 @@
 import uuid
-from typing import List, Type
+from datetime import datetime, timezone
+from typing import Iterator, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, exists, insert, func, union_all, and_, or_, text, bindparam, ARRAY, UUID, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 
-from app.models import TaskLabel, TaskReport
+from app.config import settings
+from app.controller.taskLabel_controller import calculate_consensus
+from app.models import TaskLabel, TaskReport, ArchivedTask, ArchivedTaskLabel
 from app.models.Task import Task
+from app.utils.cursor_helper import encode_cursor, decode_cursor
+from app.utils.hash_helper import canonical_content_hash
 
 
 def list_done_tasks(db: Session):
     """
-    List all tasks that have been marked as completed.
+    List all tasks that have been marked as completed, archived ones included.
 
     Args:
         db (Session): SQLAlchemy database session
 
     Returns:
-        list[Task]: List of completed Task objects
+        list[Task | ArchivedTask]: List of completed task objects
     """
-    return db.query(Task).filter(Task.is_done == True).all()
+    return db.query(Task).filter(Task.is_done == True).all() + db.query(ArchivedTask).all()
 
 
-def get_task_feed(user_id: uuid, db: Session):
+def _export_record(row, labels: list[dict]) -> dict:
+    answers = {}  # Content hash -> contents of the labels with that answer, in submission order
+    for label in labels:
+        answers.setdefault(canonical_content_hash(label["content"]), []).append(label["content"])
+    consensus_hash, consensus_votes = row.consensus_hash, row.consensus_votes
+    if consensus_hash is None and answers:
+        # Never settled, e.g. archived before consensus was stored: tally the labels the same way
+        consensus_hash = min(answers, key=lambda content_hash: (-len(answers[content_hash]), content_hash))
+        consensus_votes = len(answers[consensus_hash])
+    consensus = answers[consensus_hash][0] if consensus_hash in answers else None
+    return {
+        "id": row.id,
+        "type": row.type,
+        "title": row.title,
+        "description": row.description,
+        "data": row.data,
+        "tags": row.tags,
+        "point": row.point,
+        "required_labels": row.required_labels,
+        "done_at": row.done_at,
+        "labels": labels,
+        "consensus": consensus,
+        "consensus_votes": consensus_votes or 0,
+    }
+
+
+def _export_statement(task, label, type: Optional[str], tag: Optional[str], created_after: Optional[datetime],
+                      created_before: Optional[datetime], done_after: Optional[datetime],
+                      done_before: Optional[datetime]):
+    """Done tasks of one task table joined to the labels of the matching label table."""
+    statement = (
+        select(task.id, task.type, task.title, task.description, task.data, task.tags, task.point,
+               task.required_labels, task.done_at, task.consensus_hash, task.consensus_votes,
+               label.id.label("label_id"), label.user_id, label.content, label.created_at)
+        .outerjoin(label, label.task_id == task.id)
+        .where(task.is_done == True)
+    )
+    if type is not None:
+        statement = statement.where(task.type == type)
+    if tag is not None:
+        statement = statement.where(task.tags.contains([tag]))
+    if created_after is not None:
+        statement = statement.where(task.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(task.created_at < created_before)
+    if done_after is not None:
+        statement = statement.where(task.done_at > done_after)
+    if done_before is not None:
+        statement = statement.where(task.done_at <= done_before)
+    return statement
+
+
+def export_done_tasks(db: Session, type: Optional[str] = None, tag: Optional[str] = None,
+                      created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                      done_after: Optional[datetime] = None, done_before: Optional[datetime] = None,
+                      yield_per: int = settings.EXPORT_YIELD_PER) -> Iterator[dict]:
+    """
+    Stream the done tasks together with their labels and consensus answer.
+
+    Tasks are joined to their labels in one query over the hot and archive
+    tables, ordered by task and label id, read through a server-side cursor
+    `yield_per` rows at a time and folded back into one record per task as
+    the rows arrive, so memory use is bounded by the largest task rather than
+    the size of the export. Being one statement, it sees every task exactly
+    once even while the archiver is moving tasks. The consensus is the answer
+    `calculate_consensus` stored when the task closed, given as the content of
+    its first label; tasks without one are tallied the same way, by canonical
+    content hash with ties going to the lower hash.
+
+    Args:
+        db (Session): SQLAlchemy database session, held open while the records are consumed
+        type (str, optional): Only export tasks of this type
+        tag (str, optional): Only export tasks carrying this tag
+        created_after (datetime, optional): Only export tasks created at or after this time
+        created_before (datetime, optional): Only export tasks created before this time
+        done_after (datetime, optional): Only export tasks closed after this time
+        done_before (datetime, optional): Only export tasks closed at or before this time
+        yield_per (int, optional): Rows fetched per round trip
+
+    Yields:
+        dict: One record per task with its fields, `labels`, `consensus` and `consensus_votes`
+    """
+    filters = dict(type=type, tag=tag, created_after=created_after, created_before=created_before,
+                   done_after=done_after, done_before=done_before)
+    rows = union_all(
+        _export_statement(Task, TaskLabel, **filters),
+        _export_statement(ArchivedTask, ArchivedTaskLabel, **filters),
+    ).subquery()
+    statement = select(rows).order_by(rows.c.id, rows.c.label_id).execution_options(yield_per=yield_per)
+
+    current, labels = None, []
+    for row in db.execute(statement):
+        if current is not None and row.id != current.id:
+            yield _export_record(current, labels)
+            labels = []
+        current = row
+        if row.content is not None:
+            labels.append({"user_id": row.user_id, "content": row.content, "created_at": row.created_at})
+    if current is not None:
+        yield _export_record(current, labels)
+
+
+def task_feed_statement(user_id: uuid.UUID, limit: int, cursor: Optional[str] = None):
+    """
+    Build the keyset-paginated feed query for a user.
+
+    Tasks the user already labeled or reported are excluded with NOT EXISTS
+    anti-joins, and the page is cut in SQL by ordering on
+    (`Task.label_count` descending, `Task.id`) and seeking past the cursor,
+    which the feed index over open, unquarantined tasks serves directly. Tasks closest to their
+    required labels come first, so work goes into finishing tasks, and ties
+    are served oldest first since ids are time-ordered (`uuid7`). A task
+    whose counter moves while the user pages may shift past the cursor. One
+    extra row is fetched to tell whether more tasks follow.
+    """
+    labeled = exists().where(TaskLabel.task_id == Task.id, TaskLabel.user_id == user_id)
+    reported = exists().where(TaskReport.task_id == Task.id, TaskReport.user_id == user_id)
+    statement = select(Task).where(Task.is_done == False, Task.is_quarantined == False, ~labeled, ~reported)
+
+    values = decode_cursor(cursor)
+    if values:
+        if len(values) != 2:
+            raise ValueError("Invalid cursor")
+        label_count, task_id = int(values[0]), uuid.UUID(values[1])
+        statement = statement.where(or_(
+            Task.label_count < label_count,
+            and_(Task.label_count == label_count, Task.id > task_id)
+        ))
+    return statement.order_by(Task.label_count.desc(), Task.id).limit(limit + 1)
+
+
+def task_feed_page(tasks: list, limit: int) -> tuple[list[Task], Optional[str]]:
+    """
+    Trim the extra look-ahead row and build the cursor for the next page.
     """
-    Get a feed of tasks that haven't been labeled or reported by the user.
+    if len(tasks) <= limit:
+        return tasks, None
+    tasks = tasks[:limit]
+    return tasks, encode_cursor([tasks[-1].label_count, tasks[-1].id])
+
+
+def get_task_feed(user_id: uuid.UUID, db: Session, limit: int = 20,
+                  cursor: Optional[str] = None) -> tuple[list[Task], Optional[str]]:
+    """
+    Get a page of tasks that haven't been labeled or reported by the user.
     
     Args:
-        user_id (uuid): ID of the user requesting the feed
+        user_id (uuid.UUID): ID of the user requesting the feed
         db (Session): SQLAlchemy database session
+        limit (int, optional): Maximum number of tasks to return. Defaults to 20.
+        cursor (str, optional): Opaque cursor returned with the previous page
 
     Returns:
-        list[Task]: List of available tasks for the user
-        
+        tuple[list[Task], Optional[str]]: The page of available tasks and the
+        cursor for the next page, or None if this is the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+
     Note:
         Only returns tasks that:
         - Are not completed
+        - Are not quarantined
         - Haven't been labeled by the user
         - Haven't been reported by the user
     """
-    try:
-        # Fetch tasks that are not completed and not labeled or reported by the user
-        tasks = db.query(Task).filter(
-            Task.is_done == False,
-            ~Task.id.in_(db.query(TaskLabel.task_id).filter(TaskLabel.user_id == user_id)),
-            ~Task.id.in_(db.query(TaskReport.task_id).filter(TaskReport.user_id == user_id))
-        ).all()
-        return tasks
-    except Exception as e:
-        print(f"Error fetching task feed: {e}")
-        return []
+    tasks = db.execute(task_feed_statement(user_id, limit, cursor)).scalars().all()
+    return task_feed_page(list(tasks), limit)
+
+
+def _new_task(type: str, data: dict, point: int, title: str, description: str, is_done: bool,
+              tags: Optional[list], required_labels: Optional[int]) -> Task:
+    return Task(
+        type=type,
+        data=data,
+        point=point,
+        title=title,
+        description=description,
+        is_done=is_done,
+        done_at=func.now() if is_done else None,
+        tags=tags or [],
+        required_labels=required_labels or settings.DEFAULT_REQUIRED_LABELS
+    )
 
 
 def add_task(db: Session, type: str, data: dict, point: int, title: str, description: str, is_done: bool = False,
-             tags: list = None):
+             tags: list = None, required_labels: int = None):
     """
     Create a new task in the database.
 
@@ -64,25 +226,60 @@ def add_task(db: Session, type: str, data: dict, point: int, title: str, descrip
         description (str): Description of the task
         is_done (bool, optional): Whether task is completed. Defaults to False.
         tags (list, optional): List of tags for the task. Defaults to None.
+        required_labels (int, optional): Labels needed to close the task.
+            Defaults to settings.DEFAULT_REQUIRED_LABELS.
 
     Returns:
         Task: The created task object
     """
-    task = Task(
-        type=type,
-        data=data,
-        point=point,
-        title=title,
-        description=description,
-        is_done=is_done,
-        tags=tags or []
-    )
+    task = _new_task(type, data, point, title, description, is_done, tags, required_labels)
     db.add(task)
     db.commit()
     db.refresh(task)
     return task
 
 
+async def add_task_async(db: AsyncSession, type: str, data: dict, point: int, title: str, description: str,
+                         is_done: bool = False, tags: list = None, required_labels: int = None):
+    """
+    Async version of `add_task` for an AsyncSession.
+    """
+    task = _new_task(type, data, point, title, description, is_done, tags, required_labels)
+    db.add(task)
+    await db.commit()
+    await db.refresh(task)
+    return task
+
+
+def add_tasks(db: Session, rows: list[dict]) -> int:
+    """
+    Create many tasks with multi-row inserts and a single commit.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        rows (list[dict]): Task column values, e.g. from TaskCreate.model_dump()
+
+    Returns:
+        int: Number of tasks created
+    """
+    if not rows:
+        return 0
+    now = datetime.now(timezone.utc)
+    db.execute(insert(Task), [
+        {**row, "tags": row.get("tags") or [], "done_at": now if row.get("is_done") else None}
+        for row in rows
+    ])
+    db.commit()
+    return len(rows)
+
+
+async def add_tasks_async(db: AsyncSession, rows: list[dict]) -> int:
+    """
+    Async version of `add_tasks` for an AsyncSession.
+    """
+    return await db.run_sync(add_tasks, rows)
+
+
 def mark_task_done(db: Session, task_id: uuid.UUID):
     """
     Mark a specific task as completed.
@@ -100,12 +297,63 @@ def mark_task_done(db: Session, task_id: uuid.UUID):
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise ValueError(f"Task with ID {task_id} not found.")
-    task.is_done = True
+    if not task.is_done:
+        task.is_done = True
+        task.done_at = func.now()
+        calculate_consensus(db, task_id)
     db.commit()
     db.refresh(task)
     return task
 
 
+# Recounts the labels and reports of the given tasks from the label and
+# report tables, and writes back the counters that drifted
+_RECONCILE_COUNTERS = text("""
+    UPDATE tasks t
+    SET label_count = c.label_count, report_count = c.report_count, last_labeled_at = c.last_labeled_at
+    FROM (
+        SELECT b.id,
+               (SELECT count(*) FROM task_labels l WHERE l.task_id = b.id) AS label_count,
+               (SELECT count(*) FROM task_reports r WHERE r.task_id = b.id) AS report_count,
+               (SELECT max(l.created_at) FROM task_labels l WHERE l.task_id = b.id) AS last_labeled_at
+        FROM unnest(CAST(:ids AS uuid[])) AS b(id)
+    ) c
+    WHERE t.id = c.id
+      AND (t.label_count, t.report_count, t.last_labeled_at)
+          IS DISTINCT FROM (c.label_count, c.report_count, c.last_labeled_at)
+""").bindparams(bindparam("ids", type_=ARRAY(UUID(as_uuid=True))))
+
+
+def reconcile_task_counters(db: Session, batch_size: int = settings.RECONCILE_BATCH_SIZE) -> int:
+    """
+    Repair `label_count`, `report_count` and `last_labeled_at` of every task.
+
+    Tasks are walked in id order, `batch_size` at a time. Each batch is
+    locked before it is counted, so a label submitted meanwhile either is
+    counted or waits and increments the repaired value; it is never lost.
+
+    Args:
+        db (Session): SQLAlchemy database session
+        batch_size (int, optional): Tasks recounted per transaction
+
+    Returns:
+        int: Number of tasks whose counters were repaired
+    """
+    repaired = 0
+    after = None
+    while True:
+        statement = select(Task.id).order_by(Task.id).limit(batch_size).with_for_update()
+        if after is not None:
+            statement = statement.where(Task.id > after)
+        ids = db.execute(statement).scalars().all()
+        if not ids:
+            db.commit()
+            return repaired
+        repaired += db.execute(_RECONCILE_COUNTERS, {"ids": ids}).rowcount
+        db.commit()
+        after = ids[-1]
+
+
 # def update_task_status(db: Session, task_id: str, new_status: str):
 #     """
 #     Update the status of a task.
@@ -126,27 +374,58 @@ def mark_task_done(db: Session, task_id: uuid.UUID):
 #     db.commit()
 #     db.refresh(task)
 #     return task
-def get_user_labeled_tasks(db: Session, user_id: uuid.UUID) -> list[Type[Task]]:
+
+
+# Task columns returned with each of a user's labels
+_LABELED_TASK_COLUMNS = ("id", "type", "data", "point", "title", "description", "tags", "is_done", "required_labels")
+
+
+def get_user_labeled_tasks(db: Session, user_id: uuid.UUID, limit: int = 50,
+                           cursor: Optional[str] = None) -> tuple[list[tuple[Row, str]], Optional[str]]:
     """
-    Get all tasks that have been labeled by a specific user.
+    Get a page of the tasks labeled by a specific user together with the user's own label.
+
+    One query reads the user's labels from the hot and archive label tables,
+    each joined to the task in the matching task table, and pages by seeking
+    past the last label of the previous page. Label ids are time-ordered, so
+    pages follow submission order. Hot labels are unique per user and task;
+    archived labels from before that are listed once per task, with the
+    user's first label, which the (user_id, task_id) index serves.
 
     Args:
         db (Session): SQLAlchemy database session
         user_id (uuid.UUID): ID of the user whose labeled tasks to retrieve
+        limit (int, optional): Maximum number of tasks to return. Defaults to 50.
+        cursor (str, optional): Opaque cursor returned with the previous page
 
     Returns:
-        List[Task]: List of Task objects that the user has labeled
+        tuple[list[tuple[Row, str]], Optional[str]]: (task, label content) pairs,
+        the task as a row of its columns, and the cursor for the next page, or
+        None if this is the last page
 
     Raises:
-        ValueError: If user with given ID is not found
-    """
-    # Query tasks through the TaskLabel relationship
-    labeled_tasks = (
-        db.query(Task)
-        .join(TaskLabel)
-        .filter(TaskLabel.user_id == user_id)
-        .distinct()
-        .all()
-    )
+        ValueError: If the cursor is malformed
+    """
+    values = decode_cursor(cursor)
+    branches = []
+    for task, label in ((Task, TaskLabel), (ArchivedTask, ArchivedTaskLabel)):
+        branch = (
+            select(label.id.label("label_id"), label.content, *(getattr(task, name) for name in _LABELED_TASK_COLUMNS))
+            .join(task, task.id == label.task_id)
+            .where(label.user_id == user_id)
+        )
+        if label is ArchivedTaskLabel:
+            earlier = aliased(label)
+            branch = branch.where(~exists().where(earlier.user_id == user_id, earlier.task_id == label.task_id,
+                                                  earlier.id < label.id))
+        if values:
+            branch = branch.where(label.id > uuid.UUID(values[0]))
+        branches.append(branch)
+    labels = union_all(*branches).subquery()
+    rows = db.execute(select(labels).order_by(labels.c.label_id).limit(limit + 1)).all()
 
-    return labeled_tasks
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].label_id])
+    return [(row, row.content) for row in rows], next_cursor
@@ -1,27 +1,42 @@
 import uuid
+from datetime import datetime, timedelta
+from typing import Optional
 
+from sqlalchemy import UUID, bindparam, func, select, text
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.LeaderboardManager import LeaderboardManager
 from app.exceptions.UserAlreadyExistsError import UserAlreadyExistsError
 from app.models.User import User
-from app.utils.JWT_helper import create_access_token
+from app.models.UserPointBucket import UserPointBucket
+from app.utils.JWT_helper import create_access_token, create_refresh_token
+from app.utils.bucket_helper import current_bucket_start
+from app.utils.cache_helper import principal_cache
 from app.utils.hash_helper import check_password_hash, generate_password_hash
 
+leaderboard = LeaderboardManager()
 
-def create_user(db: Session, name: str, password: str, points: int = 0) -> User:
+
+def create_user(db: Session, name: str, password: str, points: int = 0,
+                password_hash: Optional[str] = None) -> User:
     """
     Create a new user in the database.
 
+    `password_hash` lets callers that already hashed the password off the
+    event loop skip hashing it here again.
+
     Raises:
         UserAlreadyExistsError: If a user with the same username already exists.
     """
-    hashed_password = generate_password_hash(password)
+    hashed_password = password_hash or generate_password_hash(password)
     user = User(name=name, password=hashed_password, points=points)
     try:
         db.add(user)
         db.commit()
         db.refresh(user)
+        leaderboard.update(user.id, name=user.name, points=user.points, labeled_count=user.labeled_count)
         return user
     except IntegrityError as e:
         db.rollback()
@@ -30,14 +45,63 @@ def create_user(db: Session, name: str, password: str, points: int = 0) -> User:
         raise e  # Reraise other IntegrityErrors
 
 
+async def create_user_async(db: AsyncSession, name: str, password_hash: str, points: int = 0) -> User:
+    """
+    Async version of `create_user` for an AsyncSession. The password has to be
+    hashed already, e.g. on `password_hash_pool`, as bcrypt would block the event loop.
+
+    Raises:
+        UserAlreadyExistsError: If a user with the same username already exists.
+    """
+    user = User(name=name, password=password_hash, points=points)
+    try:
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        leaderboard.update(user.id, name=user.name, points=user.points, labeled_count=user.labeled_count)
+        return user
+    except IntegrityError as e:
+        await db.rollback()
+        if "unique constraint" in str(e):
+            raise UserAlreadyExistsError(name)
+        raise e  # Reraise other IntegrityErrors
+
+
+def get_user_by_name(db: Session, name: str) -> Optional[User]:
+    """
+    Fetch a user by name.
+    """
+    return db.query(User).filter(User.name == name).first()
+
+
+async def get_user_by_name_async(db: AsyncSession, name: str) -> Optional[User]:
+    """
+    Async version of `get_user_by_name` for an AsyncSession.
+    """
+    return (await db.execute(select(User).where(User.name == name))).scalars().first()
+
+
+def issue_access_token(user: User) -> str:
+    """
+    Create a JWT access token for an authenticated user.
+    """
+    return create_access_token({"user_id": str(user.id)})
+
+
+def issue_refresh_token(user: User) -> str:
+    """
+    Create a refresh token for an authenticated user.
+    """
+    return create_refresh_token(str(user.id))
+
+
 def login_user(db: Session, name: str, password: str) -> tuple[User, str]:
     """
     Authenticate a user and return the user object along with a JWT token.
     """
-    user = db.query(User).filter(User.name == name).first()
+    user = get_user_by_name(db, name)
     if user and check_password_hash(user.password, password):
-        token = create_access_token({"user_id": str(user.id)})
-        return user, token
+        return user, issue_access_token(user)
     raise Exception("Invalid credentials")
 
 
@@ -57,19 +121,169 @@ def change_information(db: Session, user_id: uuid.UUID, new_name: str = None) ->
     if user and new_name:
         user.name = new_name
         db.commit()
+        leaderboard.update(user_id, name=new_name)
+        principal_cache.pop(user_id)
     return user  # Return the updated user or None if not found
 
 
-def get_leaderboard(db: Session):
-    return db.query(User).order_by(User.points.desc()).all()
+def get_leaderboard(db: Session, offset: int = 0, limit: int = 50):
+    """
+    Fetch one page of users ordered by points, each with its RANK().
+
+    The window is evaluated while walking the points index, so the cost
+    is bounded by offset + limit rather than by the number of users.
+    """
+    statement = (
+        select(
+            User.id,
+            User.name,
+            User.points,
+            User.labeled_count,
+            func.rank().over(order_by=User.points.desc()).label("rank"),
+        )
+        .order_by(User.points.desc(), User.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return db.execute(statement).all()
+
+
+# The user's neighbors are found by seeking the points index from the user's
+# own (points, id) position in both directions. Only the user's rank is
+# counted, as one plus the users with strictly more points, which matches
+# RANK(). The neighbors' ranks follow from it and their RANK() within the
+# neighborhood. Users tied with the top neighbor but ranked above the
+# neighborhood are counted as well when a neighbor has fewer points than
+# the top one, since they sit between that tie group and the rows below it.
+_LEADERBOARD_POSITION = text("""
+    WITH me AS (
+        SELECT u.id, u.points, (SELECT COUNT(*) FROM users h WHERE h.points > u.points) + 1 AS rank
+        FROM users u
+        WHERE u.id = :user_id
+    ),
+    above AS (
+        SELECT u.id, u.name, u.points, u.labeled_count
+        FROM users u, me
+        WHERE u.points > me.points OR (u.points = me.points AND u.id < me.id)
+        ORDER BY u.points ASC, u.id DESC
+        LIMIT :radius
+    ),
+    below AS (
+        SELECT u.id, u.name, u.points, u.labeled_count
+        FROM users u, me
+        WHERE u.points < me.points OR (u.points = me.points AND u.id > me.id)
+        ORDER BY u.points DESC, u.id ASC
+        LIMIT :radius
+    ),
+    neighborhood AS (
+        SELECT * FROM above
+        UNION ALL
+        SELECT u.id, u.name, u.points, u.labeled_count FROM users u JOIN me ON u.id = me.id
+        UNION ALL
+        SELECT * FROM below
+    ),
+    ranked AS (
+        SELECT n.*, RANK() OVER (ORDER BY n.points DESC) AS local_rank
+        FROM neighborhood n
+    ),
+    top AS (
+        SELECT points, id FROM neighborhood ORDER BY points DESC, id LIMIT 1
+    ),
+    cut AS (
+        SELECT COUNT(*) AS ties
+        FROM users u, top
+        WHERE u.points = top.points AND u.id < top.id
+          AND EXISTS (SELECT 1 FROM neighborhood WHERE points < (SELECT points FROM top))
+    )
+    SELECT r.id, r.name, r.points, r.labeled_count,
+           me.rank + r.local_rank - m.local_rank
+               + CASE WHEN r.points < top.points THEN cut.ties ELSE 0 END
+               - CASE WHEN m.points < top.points THEN cut.ties ELSE 0 END AS rank
+    FROM ranked r, ranked m, me, top, cut
+    WHERE m.id = me.id
+    ORDER BY r.points DESC, r.id
+""").bindparams(bindparam("user_id", type_=UUID(as_uuid=True))).columns(id=UUID(as_uuid=True))
 
 
-def change_password(db: Session, user_id: uuid.UUID, new_password: str) -> User:
+def get_leaderboard_position(db: Session, user_id: uuid.UUID, radius: int = 5):
     """
-    Update user password.
+    Fetch the user's rank and the users ranked directly above and below.
+
+    Returns:
+        tuple[int, list]: The user's rank and the neighborhood rows including
+        the user, or (None, []) if the user does not exist
+    """
+    rows = db.execute(_LEADERBOARD_POSITION, {"user_id": user_id, "radius": radius}).all()
+    for row in rows:
+        if row.id == user_id:
+            return row.rank, rows
+    return None, []
+
+
+def leaderboard_window_start(window: str) -> datetime:
+    """
+    Start of the current day, week (Monday) or month, in UTC.
+
+    Raises:
+        ValueError: If the window is not one of day, week or month
+    """
+    today = current_bucket_start().replace(hour=0)
+    if window == "day":
+        return today
+    if window == "week":
+        return today - timedelta(days=today.weekday())
+    if window == "month":
+        return today.replace(day=1)
+    raise ValueError(f"Unknown leaderboard window '{window}'")
+
+
+def get_windowed_leaderboard(db: Session, window: str, offset: int = 0, limit: int = 50):
+    """
+    Fetch one page of users ordered by the points they earned in the current
+    day, week or month, each with its RANK().
+
+    Only the hourly buckets inside the window are summed, so the cost depends
+    on the window size and not on the label history.
+    """
+    earned = func.sum(UserPointBucket.points)
+    statement = (
+        select(
+            User.id,
+            User.name,
+            earned.label("points"),
+            func.sum(UserPointBucket.labeled_count).label("labeled_count"),
+            func.rank().over(order_by=earned.desc()).label("rank"),
+        )
+        .join(User, User.id == UserPointBucket.user_id)
+        .where(UserPointBucket.bucket_start >= leaderboard_window_start(window))
+        .group_by(User.id, User.name)
+        .order_by(earned.desc(), User.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return db.execute(statement).all()
+
+
+def change_password(db: Session, user_id: uuid.UUID, new_password: str,
+                    password_hash: Optional[str] = None) -> User:
+    """
+    Update user password. `password_hash` is the already computed hash of `new_password`, if any.
     """
     user = db.query(User).filter(User.id == user_id).first()
     if user:
-        user.password = generate_password_hash(new_password)
+        user.password = password_hash or generate_password_hash(new_password)
         db.commit()
+        principal_cache.pop(user_id)
+    return user  # Return the updated user or None if not found
+
+
+async def change_password_async(db: AsyncSession, user_id: uuid.UUID, password_hash: str) -> User:
+    """
+    Async version of `change_password` for an AsyncSession, taking the already computed hash.
+    """
+    user = (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+    if user:
+        user.password = password_hash
+        await db.commit()
+        principal_cache.pop(user_id)
     return user  # Return the updated user or None if not found
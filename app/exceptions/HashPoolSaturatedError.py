@@ -0,0 +1,16 @@
+class HashPoolSaturatedError(Exception):
+    """
+    Exception raised when the password hashing pool has too many pending jobs.
+
+    Attributes:
+        pending (int): Number of jobs waiting or running when the job was rejected
+        message (str): Explanation of the error
+    """
+
+    def __init__(self, pending: int):
+        self.pending = pending
+        self.message = f"Password hashing is saturated ({pending} jobs pending), retry later."
+        super().__init__(self.message)
+
+    def __str__(self):
+        return self.message
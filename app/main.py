@@ -1,15 +1,147 @@
-from fastapi import FastAPI, Request
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
 
 from app.DatabaseManager import DatabaseManager
-from app.routers import users_router, tasks_router
+from app.LeaderboardManager import LeaderboardManager
+from app.SnapshotManager import SnapshotManager
+from app.config import settings
+from app.controller.archivedTask_controller import archive_done_tasks
+from app.controller.revokedToken_controller import purge_expired_revocations
+from app.controller.taskLease_controller import sweep_expired_leases
+from app.controller.task_controller import reconcile_task_counters
+from app.routers import users_router, tasks_router, datasets_router, changes_router
+from app.utils.hash_helper import password_hash_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _sweep_leases() -> int:
+    with db_manager.get_session() as session:
+        return sweep_expired_leases(session)
+
+
+def _purge_revocations() -> int:
+    with db_manager.get_session() as session:
+        return purge_expired_revocations(session)
+
+
+async def sweep_leases_periodically():
+    """Background loop that deletes expired task leases and revoked refresh tokens past their expiry."""
+    while True:
+        await asyncio.sleep(settings.TASK_LEASE_SWEEP_INTERVAL_SECONDS)
+        try:
+            swept = await run_in_threadpool(_sweep_leases)
+            if swept:
+                logger.info(f"Swept {swept} expired task leases")
+        except Exception as e:
+            logger.error(f"Lease sweep failed: {str(e)}")
+        try:
+            purged = await run_in_threadpool(_purge_revocations)
+            if purged:
+                logger.info(f"Purged {purged} expired token revocations")
+        except Exception as e:
+            logger.error(f"Token revocation purge failed: {str(e)}")
+
+
+def _rebuild_leaderboard() -> None:
+    # On the primary: a lagging replica would undo the updates applied since the last rebuild
+    with db_manager.get_session() as session:
+        LeaderboardManager().rebuild(session)
+
+
+async def rebuild_leaderboard_periodically():
+    """Background loop that reloads the in-memory leaderboard from the database."""
+    while True:
+        try:
+            await run_in_threadpool(_rebuild_leaderboard)
+        except Exception as e:
+            logger.error(f"Leaderboard rebuild failed: {str(e)}")
+        await asyncio.sleep(settings.LEADERBOARD_REBUILD_INTERVAL_SECONDS)
+
+
+def _build_snapshot():
+    # On the primary: a lagging replica could still miss tasks closed before the watermark
+    with db_manager.get_session() as session:
+        return SnapshotManager().build(session)
+
+
+async def build_snapshots_periodically():
+    """Background loop that appends newly closed tasks to the columnar dataset snapshots."""
+    while True:
+        try:
+            await run_in_threadpool(_build_snapshot)
+        except Exception as e:
+            logger.error(f"Dataset snapshot build failed: {str(e)}")
+        await asyncio.sleep(settings.SNAPSHOT_INTERVAL_SECONDS)
+
+
+def _archive_tasks() -> int:
+    with db_manager.get_session() as session:
+        return archive_done_tasks(session)
+
+
+async def archive_tasks_periodically():
+    """Background loop that moves long-closed tasks out of the hot tables."""
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            archived = await run_in_threadpool(_archive_tasks)
+            if archived:
+                logger.info(f"Archived {archived} done tasks")
+        except Exception as e:
+            logger.error(f"Task archiving failed: {str(e)}")
+
+
+def _reconcile_counters() -> int:
+    with db_manager.get_session() as session:
+        return reconcile_task_counters(session)
+
+
+async def reconcile_counters_periodically():
+    """Background loop that repairs drifted label and report counters on tasks."""
+    while True:
+        await asyncio.sleep(settings.RECONCILE_INTERVAL_SECONDS)
+        try:
+            repaired = await run_in_threadpool(_reconcile_counters)
+            if repaired:
+                logger.warning(f"Repaired the counters of {repaired} tasks")
+        except Exception as e:
+            logger.error(f"Counter reconciliation failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_POOL_PREWARM:
+        warmed = await run_in_threadpool(db_manager.prewarm_pool)
+        warmed_async = await db_manager.prewarm_async_pool()
+        logger.info(f"Pre-warmed {warmed} sync and {warmed_async} async database connections")
+    background_tasks = [asyncio.create_task(sweep_leases_periodically())]
+    if settings.LEADERBOARD_BACKEND == "memory":
+        background_tasks.append(asyncio.create_task(rebuild_leaderboard_periodically()))
+    if settings.SNAPSHOT_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(build_snapshots_periodically()))
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(archive_tasks_periodically()))
+    if settings.RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(reconcile_counters_periodically()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    password_hash_pool.shutdown()
+    await db_manager.dispose_async_engine()
+
 
 limiter = Limiter(key_func=get_remote_address)
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -33,6 +165,8 @@ db_manager = DatabaseManager()
 db_manager.init_db()
 app.include_router(users_router.router, prefix="/api/v1", tags=["users"])
 app.include_router(tasks_router.router, prefix="/api/v1", tags=["tasks"])
+app.include_router(datasets_router.router, prefix="/api/v1", tags=["datasets"])
+app.include_router(changes_router.router, prefix="/api/v1", tags=["changes"])
 
 
 
@@ -40,3 +174,15 @@ app.include_router(tasks_router.router, prefix="/api/v1", tags=["tasks"])
 async def health_check():
     """Health check endpoint for container orchestration"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+
+
+@app.get("/health/db")
+async def database_pool_stats(current_user=Depends(users_router.get_current_reviewer)):
+    """Connection pool usage, checkout wait histogram and timeouts of this worker, for reviewers only"""
+    return db_manager.pool_stats()
+
+
+@app.get("/health/password-hashing")
+async def password_hashing_stats(current_user=Depends(users_router.get_current_reviewer)):
+    """Queue depth and timings of the password hashing pool, for reviewers only"""
+    return password_hash_pool.stats()
@@ -0,0 +1,104 @@
+"""
+Versioned schema migrations.
+
+`Base.metadata.create_all` creates missing tables but never changes existing
+ones, so new columns and indexes on existing tables ship as migrations. Each
+migration module defines VERSION, DESCRIPTION and CONCURRENT, either a
+STATEMENTS list or a `statements(connection)` function, and may list the
+INDEXES it builds. Statements are idempotent so they also run cleanly on
+databases that `create_all` just created.
+"""
+import logging
+from types import ModuleType
+
+from sqlalchemy import Engine, select, text
+
+from app.migrations import v0001_catch_up_columns, v0002_access_path_indexes, v0003_task_done_at, \
+    v0004_change_tracking, v0005_task_counters, v0006_task_quarantine, v0007_task_consensus, \
+    v0008_archived_label_lookup, v0009_task_created_at, v0010_quarantine_reported_tasks, \
+    v0011_unique_task_labels
+from app.models.SchemaMigration import SchemaMigration
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS: list[ModuleType] = [
+    v0001_catch_up_columns,
+    v0002_access_path_indexes,
+    v0003_task_done_at,
+    v0004_change_tracking,
+    v0005_task_counters,
+    v0006_task_quarantine,
+    v0007_task_consensus,
+    v0008_archived_label_lookup,
+    v0009_task_created_at,
+    v0010_quarantine_reported_tasks,
+    v0011_unique_task_labels,
+]
+
+# Serializes workers that start at the same time
+_ADVISORY_LOCK_KEY = 727_001
+
+
+def _drop_invalid_indexes(connection, names: list[str]) -> None:
+    """Drop indexes left invalid by an interrupted concurrent build, so they are rebuilt."""
+    invalid = connection.execute(text("""
+        SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid AND c.relkind = 'i' AND c.relname = ANY(:names)
+    """), {"names": names}).scalars().all()
+    for name in invalid:
+        logger.warning(f"Dropping invalid index {name}")
+        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def _statements(connection, migration: ModuleType) -> list[str]:
+    if hasattr(migration, "statements"):
+        return migration.statements(connection)
+    return migration.STATEMENTS
+
+
+def _apply(engine: Engine, migration: ModuleType) -> None:
+    record = SchemaMigration.__table__.insert().values(version=migration.VERSION,
+                                                       description=migration.DESCRIPTION)
+    if not migration.CONCURRENT:
+        with engine.begin() as connection:
+            for statement in _statements(connection, migration):
+                connection.execute(text(statement))
+            connection.execute(record)
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        _drop_invalid_indexes(connection, list(getattr(migration, "INDEXES", [])))
+        for statement in _statements(connection, migration):
+            connection.execute(text(statement))
+    with engine.begin() as connection:
+        connection.execute(record)
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """
+    Apply every migration newer than the ones recorded in schema_migrations.
+
+    Args:
+        engine (Engine): Engine of the database to migrate
+
+    Returns:
+        list[int]: Versions applied by this call
+    """
+    applied = []
+    with engine.connect() as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        try:
+            done = set(lock_connection.execute(select(SchemaMigration.version)).scalars())
+            lock_connection.commit()
+            for migration in MIGRATIONS:
+                if migration.VERSION in done:
+                    continue
+                logger.info(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+                _apply(engine, migration)
+                applied.append(migration.VERSION)
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            lock_connection.commit()
+    return applied
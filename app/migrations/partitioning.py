@@ -0,0 +1,71 @@
+"""
+Offline conversion of an existing table into the hash-partitioned layout.
+
+Run it after setting TASK_LABEL_PARTITIONS or TASK_REPORT_PARTITIONS, with
+writers to the table stopped, e.g.:
+
+    python -m app.migrations.partitioning task_labels
+
+The rows are copied in one transaction, so a failure leaves the old table in place.
+"""
+import logging
+import sys
+
+from sqlalchemy import Engine, Table, text
+
+from app.DatabaseManager import Base, DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def partition_table(engine: Engine, table: Table) -> int:
+    """
+    Replace the plain table behind `table` with its partitioned definition
+    and copy the rows over.
+
+    Args:
+        engine (Engine): Engine of the database to convert
+        table (Table): Table whose model is configured as partitioned
+
+    Returns:
+        int: Number of rows copied
+
+    Raises:
+        ValueError: If the model is not partitioned or the table already is
+    """
+    if not table.dialect_options["postgresql"].get("partition_by"):
+        raise ValueError(f"{table.name} is not configured for partitioning")
+    old_name = f"{table.name}_unpartitioned"
+    columns = ", ".join(column.name for column in table.columns)
+
+    with engine.begin() as connection:
+        relkind = connection.execute(text("SELECT relkind FROM pg_class WHERE relname = :name"),
+                                     {"name": table.name}).scalar()
+        if relkind == "p":
+            raise ValueError(f"{table.name} is already partitioned")
+
+        connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {old_name}"))
+        # Free the constraint and index names for the new table
+        constraints = connection.execute(text(
+            "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:name AS regclass) AND contype IN ('p', 'u')"
+        ), {"name": old_name}).scalars().all()
+        for constraint in constraints:
+            connection.execute(text(f'ALTER TABLE {old_name} RENAME CONSTRAINT "{constraint}" '
+                                    f'TO "{constraint}_unpartitioned"'))
+        for index in table.indexes:
+            connection.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+
+        table.create(connection)
+        copied = connection.execute(text(
+            f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}"
+        )).rowcount
+        connection.execute(text(f"DROP TABLE {old_name}"))
+    logger.info(f"Partitioned {table.name}, copied {copied} rows")
+    return copied
+
+
+if __name__ == "__main__":
+    import app.models  # noqa: F401, registers the tables
+
+    for name in sys.argv[1:]:
+        partition_table(DatabaseManager().engine, Base.metadata.tables[name])
@@ -0,0 +1,15 @@
+"""
+Columns and indexes added to existing tables before migrations existed.
+
+`create_all` never alters a table that is already there, so databases created
+before these changes are missing them.
+"""
+VERSION = 1
+DESCRIPTION = "Add tasks.required_labels, task_labels.created_at and the leaderboard index"
+CONCURRENT = False
+
+STATEMENTS = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS required_labels INTEGER NOT NULL DEFAULT 6",
+    "ALTER TABLE task_labels ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    "CREATE INDEX IF NOT EXISTS ix_users_points_id ON users (points DESC, id)",
+]
@@ -0,0 +1,31 @@
+"""
+Indexes for the feed, label and report access paths.
+
+The feed's NOT EXISTS checks probe labels and reports by (user_id, task_id),
+and the feed itself walks open tasks in id order. Without these indexes each
+of them is a sequential scan. Built concurrently so writes keep flowing.
+"""
+from sqlalchemy import text
+
+VERSION = 2
+DESCRIPTION = "Add (user_id, task_id) indexes on labels and reports and a partial index on open tasks"
+CONCURRENT = True
+
+# Index name -> (table, definition)
+INDEXES = {
+    "ix_task_labels_user_id_task_id": ("task_labels", "(user_id, task_id)"),
+    "ix_task_reports_user_id_task_id": ("task_reports", "(user_id, task_id)"),
+    "ix_tasks_open": ("tasks", "(id) WHERE is_done = false"),
+}
+
+
+def statements(connection) -> list[str]:
+    """
+    Partitioned tables cannot build an index concurrently. Theirs is built
+    directly, which only locks the partitions while each one is indexed.
+    """
+    partitioned = set(connection.execute(text("SELECT relname FROM pg_class WHERE relkind = 'p'")).scalars())
+    return [
+        f"CREATE INDEX {'' if table in partitioned else 'CONCURRENTLY '}IF NOT EXISTS {name} ON {table} {definition}"
+        for name, (table, definition) in INDEXES.items()
+    ]
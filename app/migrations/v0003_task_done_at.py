@@ -0,0 +1,22 @@
+"""
+Closing time of tasks, the watermark of incremental dataset snapshots.
+
+Tasks closed before the column existed get the migration time, so the first
+snapshot after the upgrade picks them up.
+"""
+VERSION = 3
+DESCRIPTION = "Add tasks.done_at and a partial index on done tasks by closing time"
+CONCURRENT = True
+
+INDEXES = {
+    "ix_tasks_done_at": ("tasks", "(done_at, id) WHERE is_done = true"),
+}
+
+STATEMENTS = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS done_at TIMESTAMPTZ",
+    "UPDATE tasks SET done_at = now() WHERE is_done AND done_at IS NULL",
+    *(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}"
+        for name, (table, definition) in INDEXES.items()
+    ),
+]
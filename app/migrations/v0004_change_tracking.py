@@ -0,0 +1,23 @@
+"""
+Change numbers on tasks, labels and reports for the change feed.
+
+Adding a column with a volatile default rewrites the table, so existing rows
+are numbered in one pass under an exclusive lock. Run it in a quiet period on
+large databases.
+"""
+from app.utils.change_helper import CHANGE_SEQ, CURRENT_XID, track_changes_statements
+
+VERSION = 4
+DESCRIPTION = "Add change_seq and change_xid with update triggers to tasks, task_labels and task_reports"
+CONCURRENT = False
+
+TABLES = ("tasks", "task_labels", "task_reports")
+
+STATEMENTS = [f"CREATE SEQUENCE IF NOT EXISTS {CHANGE_SEQ}"]
+for _table in TABLES:
+    STATEMENTS += [
+        f"ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('{CHANGE_SEQ}')",
+        f"ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT {CURRENT_XID}",
+        f"CREATE INDEX IF NOT EXISTS ix_{_table}_change_xid_seq ON {_table} (change_xid, change_seq)",
+        *track_changes_statements(_table),
+    ]
@@ -0,0 +1,58 @@
+"""
+Label and report counters on tasks, and the indexes that rank and repair them.
+
+The columns have constant defaults, so adding them does not rewrite the
+table. Existing rows are counted once, the id-ordered feed index of
+migration 2 gives way to one ranked by label_count, and labels and reports
+get a task_id index for counting and archiving.
+"""
+from sqlalchemy import text
+
+VERSION = 5
+DESCRIPTION = "Add label_count, report_count and last_labeled_at to tasks and rank the feed by label_count"
+CONCURRENT = True
+
+# Index name -> (table, definition)
+INDEXES = {
+    "ix_tasks_open_by_label_count": ("tasks", "(label_count DESC, id) WHERE is_done = false"),
+    "ix_task_labels_task_id": ("task_labels", "(task_id)"),
+    "ix_task_reports_task_id": ("task_reports", "(task_id)"),
+}
+
+_COUNTER_COLUMNS = (
+    "label_count INTEGER NOT NULL DEFAULT 0",
+    "report_count INTEGER NOT NULL DEFAULT 0",
+    "last_labeled_at TIMESTAMPTZ",
+)
+
+# (tasks table, labels table, reports table)
+_TABLES = (
+    ("tasks", "task_labels", "task_reports"),
+    ("archived_tasks", "archived_task_labels", "archived_task_reports"),
+)
+
+
+def statements(connection) -> list[str]:
+    """
+    Partitioned tables cannot build an index concurrently, see migration 2.
+    """
+    partitioned = set(connection.execute(text("SELECT relname FROM pg_class WHERE relkind = 'p'")).scalars())
+    result = [
+        f"ALTER TABLE {tasks} ADD COLUMN IF NOT EXISTS {column}"
+        for tasks, _, _ in _TABLES
+        for column in _COUNTER_COLUMNS
+    ]
+    for tasks, labels, reports in _TABLES:
+        result += [
+            f"UPDATE {tasks} t SET label_count = l.n, last_labeled_at = l.last_labeled_at "
+            f"FROM (SELECT task_id, count(*) AS n, max(created_at) AS last_labeled_at FROM {labels} "
+            f"GROUP BY task_id) l WHERE t.id = l.task_id",
+            f"UPDATE {tasks} t SET report_count = r.n "
+            f"FROM (SELECT task_id, count(*) AS n FROM {reports} GROUP BY task_id) r WHERE t.id = r.task_id",
+        ]
+    result += [
+        f"CREATE INDEX {'' if table in partitioned else 'CONCURRENTLY '}IF NOT EXISTS {name} ON {table} {definition}"
+        for name, (table, definition) in INDEXES.items()
+    ]
+    result.append("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_open")
+    return result
@@ -0,0 +1,49 @@
+"""
+Quarantine of tasks that several users reported, and the feed index that skips them.
+
+The feed index of migration 5 is replaced by one that also leaves out
+quarantined tasks, and quarantined tasks get a small partial index of their
+own for the review queue. Existing reports are counted once; tasks already
+over the threshold are quarantined by their next report.
+"""
+
+VERSION = 6
+DESCRIPTION = "Add reporter_count and quarantine state to tasks and leave quarantined tasks out of the feed index"
+CONCURRENT = True
+
+# Index name -> (table, definition)
+INDEXES = {
+    "ix_tasks_feed": ("tasks", "(label_count DESC, id) WHERE is_done = false AND is_quarantined = false"),
+    "ix_tasks_quarantined": ("tasks", "(quarantined_at, id) WHERE is_quarantined = true"),
+}
+
+_QUARANTINE_COLUMNS = (
+    "reporter_count INTEGER NOT NULL DEFAULT 0",
+    "is_quarantined BOOLEAN NOT NULL DEFAULT false",
+    "quarantined_at TIMESTAMPTZ",
+)
+
+# (tasks table, reports table)
+_TABLES = (
+    ("tasks", "task_reports"),
+    ("archived_tasks", "archived_task_reports"),
+)
+
+STATEMENTS = [
+    *(
+        f"ALTER TABLE {tasks} ADD COLUMN IF NOT EXISTS {column}"
+        for tasks, _ in _TABLES
+        for column in _QUARANTINE_COLUMNS
+    ),
+    *(
+        f"UPDATE {tasks} t SET reporter_count = r.n "
+        f"FROM (SELECT task_id, count(DISTINCT user_id) AS n FROM {reports} GROUP BY task_id) r "
+        f"WHERE t.id = r.task_id"
+        for tasks, reports in _TABLES
+    ),
+    *(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}"
+        for name, (table, definition) in INDEXES.items()
+    ),
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_open_by_label_count",
+]
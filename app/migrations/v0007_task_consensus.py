@@ -0,0 +1,28 @@
+"""
+Consensus answer stored on tasks when they close.
+
+The vote tallies are dropped when a task is archived, so the leading answer
+is kept on the task itself. Done tasks that still have their tallies are
+settled here; archived ones keep an empty consensus, which the export
+derives from their labels instead.
+"""
+VERSION = 7
+DESCRIPTION = "Add consensus_hash and consensus_votes to tasks and settle done tasks from their vote tallies"
+CONCURRENT = False
+
+STATEMENTS = [
+    *(
+        f"ALTER TABLE {tasks} ADD COLUMN IF NOT EXISTS {column}"
+        for tasks in ("tasks", "archived_tasks")
+        for column in ("consensus_hash VARCHAR(64)", "consensus_votes INTEGER")
+    ),
+    """
+    UPDATE tasks SET consensus_hash = winner.content_hash, consensus_votes = winner.votes
+    FROM (
+        SELECT DISTINCT ON (task_id) task_id, content_hash, votes
+        FROM task_vote_tallies
+        ORDER BY task_id, votes DESC, content_hash
+    ) winner
+    WHERE tasks.id = winner.task_id AND tasks.is_done AND tasks.consensus_hash IS NULL
+    """,
+]
@@ -0,0 +1,19 @@
+"""
+Index for finding a user's label of an archived task.
+
+`/tasks/labeled` lists each task once, with the user's first label, and
+probes for earlier labels of the same task by (user_id, task_id), as it does
+on the hot label table.
+"""
+VERSION = 8
+DESCRIPTION = "Add a (user_id, task_id) index on archived_task_labels"
+CONCURRENT = True
+
+INDEXES = {
+    "ix_archived_task_labels_user_id_task_id": ("archived_task_labels", "(user_id, task_id)"),
+}
+
+STATEMENTS = [
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}"
+    for name, (table, definition) in INDEXES.items()
+]
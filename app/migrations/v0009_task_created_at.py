@@ -0,0 +1,41 @@
+"""
+Creation time of tasks, for the creation range of dataset exports.
+
+Task ids are only time-ordered since `uuid7`, so the range cannot be read
+off the primary key for older, random ids. Tasks with a `uuid7` id get the
+time encoded in it, older ones the time of their first label, failing that
+their closing time, failing that the migration time.
+"""
+VERSION = 9
+DESCRIPTION = "Add created_at to tasks and archived_tasks, backfilled from uuid7 ids and labels"
+CONCURRENT = True
+
+INDEXES = {
+    "ix_tasks_created_at": ("tasks", "(created_at, id) WHERE is_done = true"),
+    "ix_archived_tasks_created_at": ("archived_tasks", "(created_at, id)"),
+}
+
+# Unix milliseconds in the first 48 bits of a version 7 id
+_UUID7_TIME = "to_timestamp(('x' || lpad(replace(left(id::text, 13), '-', ''), 16, '0'))::bit(64)::bigint / 1000.0)"
+
+STATEMENTS = [
+    *(f"ALTER TABLE {tasks} ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ" for tasks in ("tasks", "archived_tasks")),
+    "ALTER TABLE tasks ALTER COLUMN created_at SET DEFAULT now()",
+    *(
+        f"""
+        UPDATE {tasks} SET created_at = COALESCE(
+            CASE WHEN substr(id::text, 15, 1) = '7' THEN {_UUID7_TIME} END,
+            (SELECT min(labels.created_at) FROM {labels} labels WHERE labels.task_id = {tasks}.id),
+            done_at,
+            now()
+        )
+        WHERE created_at IS NULL
+        """
+        for tasks, labels in (("tasks", "task_labels"), ("archived_tasks", "archived_task_labels"))
+    ),
+    *(f"ALTER TABLE {tasks} ALTER COLUMN created_at SET NOT NULL" for tasks in ("tasks", "archived_tasks")),
+    *(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}"
+        for name, (table, definition) in INDEXES.items()
+    ),
+]
@@ -0,0 +1,23 @@
+"""
+Quarantine of tasks reported by too many users before quarantine existed.
+
+Migration 6 counted the distinct reporters of every task but left tasks
+already over QUARANTINE_REPORT_THRESHOLD in the feed until their next report.
+They are quarantined here, with the threshold configured when the migration
+runs. A threshold of 0 turns quarantine off, and nothing is changed.
+"""
+from app.config import settings
+
+VERSION = 10
+DESCRIPTION = "Quarantine tasks whose reporter_count is already over QUARANTINE_REPORT_THRESHOLD"
+CONCURRENT = False
+
+
+def statements(connection) -> list[str]:
+    threshold = int(settings.QUARANTINE_REPORT_THRESHOLD)
+    if threshold <= 0:
+        return []
+    return [
+        f"UPDATE tasks SET is_quarantined = true, quarantined_at = now() "
+        f"WHERE reporter_count > {threshold} AND NOT is_quarantined"
+    ]
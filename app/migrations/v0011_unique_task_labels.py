@@ -0,0 +1,58 @@
+"""
+One label per user and task, enforced by a unique index.
+
+Label submission checked for an earlier label of the user with an unlocked
+read, so two concurrent submissions could both pass it and both be credited.
+The later duplicates are removed first, taking their credit back from the
+task's label_count and the user's points and labeled_count; the vote tally
+and the hourly point bucket keep counting them. The unique index replaces
+the plain (user_id, task_id) index of migration 2. It includes the partition
+key, so it is allowed on a partitioned task_labels too.
+"""
+from sqlalchemy import text
+
+VERSION = 11
+DESCRIPTION = "Remove duplicate labels and make task_labels (user_id, task_id) unique"
+CONCURRENT = True
+
+# Index name -> (table, definition)
+INDEXES = {
+    "ux_task_labels_user_id_task_id": ("task_labels", "(user_id, task_id)"),
+}
+
+_REMOVE_DUPLICATES = """
+    WITH removed AS (
+        DELETE FROM task_labels l
+        USING task_labels k
+        WHERE k.user_id = l.user_id AND k.task_id = l.task_id AND (k.created_at, k.id) < (l.created_at, l.id)
+        RETURNING l.user_id, l.task_id
+    ),
+    uncounted AS (
+        UPDATE tasks SET label_count = tasks.label_count - r.n
+        FROM (SELECT task_id, count(*) AS n FROM removed GROUP BY task_id) r
+        WHERE tasks.id = r.task_id
+    )
+    UPDATE users SET points = users.points - r.points, labeled_count = users.labeled_count - r.n
+    FROM (
+        SELECT removed.user_id, count(*) AS n, sum(tasks.point) AS points
+        FROM removed JOIN tasks ON tasks.id = removed.task_id
+        GROUP BY removed.user_id
+    ) r
+    WHERE users.id = r.user_id
+"""
+
+
+def statements(connection) -> list[str]:
+    """
+    Partitioned tables cannot build an index concurrently, see migration 2.
+    """
+    partitioned = set(connection.execute(text("SELECT relname FROM pg_class WHERE relkind = 'p'")).scalars())
+    return [
+        _REMOVE_DUPLICATES,
+        *(
+            f"CREATE UNIQUE INDEX {'' if table in partitioned else 'CONCURRENTLY '}IF NOT EXISTS {name} "
+            f"ON {table} {definition}"
+            for name, (table, definition) in INDEXES.items()
+        ),
+        "DROP INDEX IF EXISTS ix_task_labels_user_id_task_id",
+    ]
@@ -0,0 +1,16 @@
+from sqlalchemy import Index
+
+from app.DatabaseManager import Base
+from app.models.Task import Task
+from app.utils.archive_helper import archive_table
+
+
+class ArchivedTask(Base):
+    """
+    Done task moved out of `tasks` by the archiver, with the same columns.
+    """
+    __table__ = archive_table(
+        Task.__table__, "archived_tasks", Base.metadata,
+        Index("ix_archived_tasks_done_at", "done_at", "id"),  # Incremental snapshot reads
+        Index("ix_archived_tasks_created_at", "created_at", "id"),  # Export creation range
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Index
+
+from app.DatabaseManager import Base
+from app.models.TaskLabel import TaskLabel
+from app.utils.archive_helper import archive_table
+
+
+class ArchivedTaskLabel(Base):
+    """
+    Label of an archived task, with the same columns as `task_labels`.
+    """
+    __table__ = archive_table(
+        TaskLabel.__table__, "archived_task_labels", Base.metadata,
+        Index("ix_archived_task_labels_task_id", "task_id", "id"),  # Labels of a task, for exports
+        Index("ix_archived_task_labels_user_id_id", "user_id", "id"),  # A user's labeled tasks
+        Index("ix_archived_task_labels_user_id_task_id", "user_id", "task_id"),  # A user's first label of a task
+    )
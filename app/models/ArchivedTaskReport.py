@@ -0,0 +1,15 @@
+from sqlalchemy import Index
+
+from app.DatabaseManager import Base
+from app.models.TaskReport import TaskReport
+from app.utils.archive_helper import archive_table
+
+
+class ArchivedTaskReport(Base):
+    """
+    Report on an archived task, with the same columns as `task_reports`.
+    """
+    __table__ = archive_table(
+        TaskReport.__table__, "archived_task_reports", Base.metadata,
+        Index("ix_archived_task_reports_task_id", "task_id"),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, UUID, DateTime, String
+
+from app.DatabaseManager import Base
+
+
+class RevokedToken(Base):
+    """
+    Refresh token that can no longer be used, either rotated or logged out.
+
+    Attributes:
+        jti (str): Unique id of the refresh token
+        user_id (UUID): Owner of the token
+        expires_at (datetime): Original expiry of the token, the row can be purged after it
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from app.DatabaseManager import Base
+
+
+class SchemaMigration(Base):
+    """
+    Record of a schema migration applied by `app.migrations.run_migrations`.
+
+    Attributes:
+        version (int): Migration number
+        description (str): What the migration does
+        applied_at (datetime): When it was applied
+    """
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,16 +1,17 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String, UUID, ARRAY, Boolean
+from sqlalchemy import and_, Column, Integer, String, UUID, ARRAY, Boolean, Index, DateTime, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.DatabaseManager import Base
+from app.config import settings
+from app.utils.change_helper import change_seq_column, change_xid_column, track_changes
+from app.utils.uuid_helper import uuid7
 
 
 class Task(Base):
     __tablename__ = "tasks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     type = Column(String, nullable=False)
     data = Column(JSONB, nullable=False)  # Using JSONB for better PostgreSQL performance
     point = Column(Integer, nullable=False)
@@ -18,6 +19,36 @@ class Task(Base):
     description = Column(String(1000), nullable=False)
     tags = Column(ARRAY(String))
     is_done = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    done_at = Column(DateTime(timezone=True))  # When the task was closed, the watermark of dataset snapshots
+    required_labels = Column(Integer, nullable=False, default=settings.DEFAULT_REQUIRED_LABELS,
+                             server_default=str(settings.DEFAULT_REQUIRED_LABELS))  # Labels needed to close the task
+    # Kept current by label submission and reporting, repaired by `reconcile_task_counters`
+    label_count = Column(Integer, nullable=False, default=0, server_default="0")
+    report_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_labeled_at = Column(DateTime(timezone=True))
+    # Leading answer of the vote tally, stored by `calculate_consensus` once the task is done
+    consensus_hash = Column(String(64))
+    consensus_votes = Column(Integer)
+    # Distinct users who reported the task since it was last reviewed, see `report_task`
+    reporter_count = Column(Integer, nullable=False, default=0, server_default="0")
+    is_quarantined = Column(Boolean, nullable=False, default=False, server_default="false")
+    quarantined_at = Column(DateTime(timezone=True))
+    change_seq = change_seq_column()
+    change_xid = change_xid_column()
 
     labels = relationship("TaskLabel", back_populates="task")  # List of labels belonging to a task
     reports = relationship("TaskReport", back_populates="task", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Feed scan over open tasks, closest to completion first
+        Index("ix_tasks_feed", label_count.desc(), id,
+              postgresql_where=and_(is_done == False, is_quarantined == False)),
+        Index("ix_tasks_quarantined", quarantined_at, id, postgresql_where=(is_quarantined == True)),  # Review queue
+        Index("ix_tasks_done_at", done_at, id, postgresql_where=(is_done == True)),  # Incremental snapshot reads
+        Index("ix_tasks_created_at", created_at, id, postgresql_where=(is_done == True)),  # Export creation range
+        Index("ix_tasks_change_xid_seq", change_xid, change_seq),  # Change feed
+    )
+
+
+track_changes(Task.__table__)
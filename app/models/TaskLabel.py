@@ -1,18 +1,41 @@
-import uuid
-
-from sqlalchemy import Column, ForeignKey, UUID, String
+from sqlalchemy import Column, ForeignKey, UUID, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from app.DatabaseManager import Base
+from app.config import settings
+from app.utils.change_helper import change_seq_column, change_xid_column, track_changes
+from app.utils.partition_helper import hash_partition_options, add_hash_partitions
+from app.utils.uuid_helper import uuid7
 
 
 class TaskLabel(Base):
+    """
+    With TASK_LABEL_PARTITIONS set the table is hash-partitioned on task_id.
+    Postgres then needs task_id in the primary key, but the ORM keeps
+    identifying labels by id alone.
+    """
     __tablename__ = "task_labels"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False,
+                     primary_key=bool(settings.TASK_LABEL_PARTITIONS))
     content = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    change_seq = change_seq_column()
+    change_xid = change_xid_column()
 
     user = relationship("User", back_populates="labels")
     task = relationship("Task", back_populates="labels")
+
+    __table_args__ = (
+        Index("ux_task_labels_user_id_task_id", user_id, task_id, unique=True),  # One label per user and task
+        Index("ix_task_labels_change_xid_seq", change_xid, change_seq),  # Change feed
+        Index("ix_task_labels_task_id", task_id),  # Labels of a task, for counting and archiving
+        hash_partition_options("task_id", settings.TASK_LABEL_PARTITIONS),
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+add_hash_partitions(TaskLabel.__table__, settings.TASK_LABEL_PARTITIONS)
+track_changes(TaskLabel.__table__)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, UUID, DateTime
+from sqlalchemy.orm import relationship
+
+from app.DatabaseManager import Base
+
+
+class TaskLease(Base):
+    """
+    Short-lived reservation of a task for a single labeler.
+
+    Attributes:
+        task_id (UUID): The leased task, at most one active lease per task
+        user_id (UUID): The user holding the lease
+        expires_at (datetime): When the lease lapses unless renewed
+        heartbeat_at (datetime): Last time the holder renewed the lease
+    """
+    __tablename__ = "task_leases"
+
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False)
+
+    task = relationship("Task")
@@ -1,18 +1,41 @@
-import uuid
-
-from sqlalchemy import UUID, Column, ForeignKey, Text
+from sqlalchemy import UUID, Column, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.DatabaseManager import Base
+from app.config import settings
+from app.utils.change_helper import change_seq_column, change_xid_column, track_changes
+from app.utils.partition_helper import hash_partition_options, add_hash_partitions
+from app.utils.uuid_helper import uuid7
 
 
 class TaskReport(Base):
+    """
+    With TASK_REPORT_PARTITIONS set the table is hash-partitioned on task_id,
+    see TaskLabel.
+    """
     __tablename__ = "task_reports"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    # A partitioned table cannot have a unique constraint without the partition key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7,
+                unique=not settings.TASK_REPORT_PARTITIONS, nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False,
+                     primary_key=bool(settings.TASK_REPORT_PARTITIONS))
     details = Column(Text, nullable=False)
+    change_seq = change_seq_column()
+    change_xid = change_xid_column()
 
     user = relationship("User", back_populates="reports")
     task = relationship("Task", back_populates="reports")
+
+    __table_args__ = (
+        Index("ix_task_reports_user_id_task_id", user_id, task_id),  # "Already reported by this user" checks
+        Index("ix_task_reports_change_xid_seq", change_xid, change_seq),  # Change feed
+        Index("ix_task_reports_task_id", task_id),  # Reports of a task, for counting and archiving
+        hash_partition_options("task_id", settings.TASK_REPORT_PARTITIONS),
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+add_hash_partitions(TaskReport.__table__, settings.TASK_REPORT_PARTITIONS)
+track_changes(TaskReport.__table__)
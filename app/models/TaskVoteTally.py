@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, UUID, String, Integer
+
+from app.DatabaseManager import Base
+
+
+class TaskVoteTally(Base):
+    """
+    Running vote count per distinct label content of a task.
+
+    Attributes:
+        task_id (UUID): The labeled task
+        content_hash (str): SHA-256 of the canonical label content
+        votes (int): Number of labels submitted with this content
+    """
+    __tablename__ = "task_vote_tallies"
+
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    votes = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,8 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String, UUID
+from sqlalchemy import Column, Integer, String, UUID, Index
 from sqlalchemy.orm import relationship
 
 from app.DatabaseManager import Base
+from app.utils.uuid_helper import uuid7
 
 
 class User(Base):
@@ -21,7 +20,7 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, nullable=False)
     name = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     points = Column(Integer, default=0)
@@ -29,3 +28,7 @@ class User(Base):
 
     labels = relationship("TaskLabel", back_populates="user")  # List of labels belonging to a user
     reports = relationship("TaskReport", back_populates="user")  # List of reports created by the user
+
+    __table_args__ = (
+        Index("ix_users_points_id", points.desc(), id),  # Leaderboard ordering and rank counts
+    )
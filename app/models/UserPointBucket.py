@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, UUID, Integer, DateTime
+
+from app.DatabaseManager import Base
+
+
+class UserPointBucket(Base):
+    """
+    Points and labels a user earned within one hour.
+
+    Windowed leaderboards sum these buckets instead of scanning labels.
+
+    Attributes:
+        bucket_start (datetime): Start of the hour, in UTC
+        user_id (UUID): The user who earned the points
+        points (int): Points earned during the hour
+        labeled_count (int): Labels submitted during the hour
+    """
+    __tablename__ = "user_point_buckets"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    points = Column(Integer, nullable=False, default=0)
+    labeled_count = Column(Integer, nullable=False, default=0)
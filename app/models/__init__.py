@@ -3,3 +3,11 @@ from app.models.Task import Task
 from app.models.TaskLabel import TaskLabel
 from app.models.TaskReport import TaskReport
 from app.models.User import User
+from app.models.TaskLease import TaskLease
+from app.models.TaskVoteTally import TaskVoteTally
+from app.models.UserPointBucket import UserPointBucket
+from app.models.RevokedToken import RevokedToken
+from app.models.SchemaMigration import SchemaMigration
+from app.models.ArchivedTask import ArchivedTask
+from app.models.ArchivedTaskLabel import ArchivedTaskLabel
+from app.models.ArchivedTaskReport import ArchivedTaskReport
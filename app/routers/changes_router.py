@@ -0,0 +1,38 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.controller.change_controller import get_changes
+from app.routers.users_router import get_current_user, get_read_db
+from app.schemas.change import ChangePage
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangePage)
+def get_changes_route(since: Optional[str] = None, limit: int = Query(100, gt=0, le=1000),
+                      current_user=Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """
+    Get the tasks, labels and reports that changed since the last call.
+
+    Start without `since` and pass the returned `next_since` on every
+    following call. Each changed row comes once, in its current state.
+
+    Args:
+        since (str, optional): `next_since` of the previous page
+        limit (int): Maximum number of changes to return (1-1000)
+        current_user: Current authenticated user
+        db (Session): Database session dependency
+
+    Returns:
+        ChangePage: The changes, the next cursor and whether more are available
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        changes, next_since, has_more = get_changes(db, since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ChangePage(changes=changes, next_since=next_since, has_more=has_more)
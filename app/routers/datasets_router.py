@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse, FileResponse
+
+from app.DatabaseManager import DatabaseManager
+from app.SnapshotManager import SnapshotManager
+from app.config import settings
+from app.controller.task_controller import export_done_tasks
+from app.routers.users_router import get_current_user, last_write
+from app.utils.export_helper import iter_ndjson, iter_csv, iter_chunks
+
+# Initialize the database manager
+db_manager = DatabaseManager()
+
+router = APIRouter(prefix="/datasets", tags=["datasets"])
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _export_stream(written_at, format: str, **filters):
+    # A session of its own, held for as long as the response streams
+    db = db_manager.replicas.session(written_at)
+    try:
+        records = export_done_tasks(db, **filters)
+        lines = iter_csv(records) if format == "csv" else iter_ndjson(records)
+        yield from iter_chunks(lines, settings.EXPORT_CHUNK_BYTES)
+    finally:
+        db.close()
+
+
+@router.get("/export")
+async def export_dataset(request: Request, format: Literal["ndjson", "csv"] = "ndjson",
+                         type: Optional[str] = None, tag: Optional[str] = None, created_after: Optional[datetime] = None,
+                         created_before: Optional[datetime] = None, done_after: Optional[datetime] = None,
+                         done_before: Optional[datetime] = None, current_user=Depends(get_current_user)):
+    """
+    Stream the labeled dataset: every done task with its labels and consensus.
+
+    Rows come from a server-side cursor and are written out in chunks as they
+    are read. The generator is synchronous, so the response iterates it in the
+    threadpool and a long export never holds up the event loop.
+
+    Args:
+        request (Request): The request, for the client's read-your-writes cookie
+        format (str): `ndjson` (default) or `csv`
+        type (str, optional): Only export tasks of this type
+        tag (str, optional): Only export tasks carrying this tag
+        created_after (datetime, optional): Only export tasks created at or after this time
+        created_before (datetime, optional): Only export tasks created before this time
+        done_after (datetime, optional): Only export tasks closed after this time
+        done_before (datetime, optional): Only export tasks closed at or before this time
+        current_user: Current authenticated user
+
+    Returns:
+        StreamingResponse: The export, one task per line
+    """
+    stream = _export_stream(last_write(request), format, type=type, tag=tag,
+                            created_after=created_after, created_before=created_before,
+                            done_after=done_after, done_before=done_before)
+    return StreamingResponse(
+        stream,
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="dataset.{format}"'}
+    )
+
+
+@router.get("/snapshots", response_model=list[dict])
+async def list_snapshots(current_user=Depends(get_current_user)):
+    """
+    List the columnar dataset snapshots on this server, oldest first.
+
+    Returns:
+        list[dict]: Per version its number, watermark, total and added rows and file size
+    """
+    return [
+        {key: entry[key] for key in ("version", "watermark", "rows", "added", "size", "created_at")}
+        for entry in SnapshotManager().versions()
+    ]
+
+
+@router.get("/snapshots/{version}")
+async def download_snapshot(version: int, current_user=Depends(get_current_user)):
+    """
+    Download a dataset snapshot as an Arrow IPC file.
+
+    The file is sent straight from disk in chunks, and Range requests are
+    honoured so clients can resume or fetch parts of it.
+
+    Args:
+        version (int): Snapshot version from `/datasets/snapshots`
+        current_user: Current authenticated user
+
+    Returns:
+        FileResponse: The snapshot file
+
+    Raises:
+        HTTPException: If the version is not on disk
+    """
+    path = SnapshotManager().path(version)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail=f"Snapshot {version} not found")
+    return FileResponse(path, media_type="application/vnd.apache.arrow.file", filename=path.name)
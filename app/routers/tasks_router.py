@@ -1,17 +1,28 @@
-from typing import List
+import json
+from typing import Literal, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.DatabaseManager import DatabaseManager
-from app.controller.taskLabel_controller import submit_label, get_label_by_task
-from app.controller.taskReport_controller import report_task
-from app.controller.task_controller import add_task, get_task_feed, get_user_labeled_tasks
-from app.routers.users_router import get_current_user
-from app.schemas.task import TaskCreate, TaskResponse, LabeledTask
-from app.schemas.taskLabel import LabelCreate
+from app.config import settings
+from app.controller.taskLabel_controller import submit_label_async, submit_labels_async
+from app.controller.taskLease_controller import lease_task_feed_async, heartbeat_lease_async
+from app.controller.taskReport_controller import report_task_async, list_quarantined_tasks_async, \
+    release_quarantined_task_async
+from app.controller.task_controller import add_task_async, add_tasks_async, get_user_labeled_tasks
+from app.routers.users_router import get_current_user, get_current_reviewer, get_read_db, record_write
+from app.schemas.task import TaskCreate, TaskResponse, LabeledTask, TaskFeedResponse, LabeledTaskPage, \
+    TaskBulkResponse, TaskBulkError, TaskBulkAbort, QuarantinedTask, QuarantinedTaskPage
+from app.schemas.taskLabel import LabelCreate, LabelBatchCreate, LabelBatchResponse
 from app.schemas.taskReport import CreateTaskReport
+from app.utils.bulk_helper import iter_lines, iter_records
 
 # Initialize the database manager
 db_manager = DatabaseManager()
@@ -21,13 +32,13 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
 
 @router.post("/new", response_model=TaskResponse, status_code=201)
-async def create_task(task: TaskCreate, db: Session = Depends(db_manager.get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(db_manager.get_async_db)):
     """
     Create a new task in the system.
 
     Args:
         task (TaskCreate): Task creation data including type, data, points, title, description and tags
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         TaskResponse: Response containing task ID and status
@@ -36,7 +47,7 @@ async def create_task(task: TaskCreate, db: Session = Depends(db_manager.get_db)
         HTTPException: If task creation fails
     """
     try:
-        created_task = add_task(
+        created_task = await add_task_async(
             db,
             type=task.type,
             data=task.data,
@@ -44,7 +55,8 @@ async def create_task(task: TaskCreate, db: Session = Depends(db_manager.get_db)
             title=task.title,
             description=task.description,
             tags=task.tags,
-            is_done=task.is_done
+            is_done=task.is_done,
+            required_labels=task.required_labels
         )
         return TaskResponse(id=created_task.id,
                             type=created_task.type,
@@ -53,53 +65,152 @@ async def create_task(task: TaskCreate, db: Session = Depends(db_manager.get_db)
                             title=created_task.title,
                             description=created_task.description,
                             tags=created_task.tags,
-                            is_done=created_task.is_done)
+                            is_done=created_task.is_done,
+                            required_labels=created_task.required_labels)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/feed", response_model=List[TaskResponse])
-async def fetch_task_feed(limit: int = Query(..., gt=0), current_user=Depends(get_current_user),
-                          db: Session = Depends(db_manager.get_db)):
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_create_tasks(request: Request, format: Optional[Literal["ndjson", "csv"]] = None,
+                            db: AsyncSession = Depends(db_manager.get_async_db)):
+    """
+    Create tasks from a streamed NDJSON or CSV upload.
+
+    The body is read incrementally, each row is validated against TaskCreate
+    and valid rows are inserted in chunks of BULK_INSERT_CHUNK_SIZE, each
+    committed on its own, so memory use does not grow with the upload. CSV
+    uploads start with a header row and hold `data` and `tags` as JSON.
+
+    If a chunk cannot be written the upload stops there with a 503, whose
+    body counts the rows inserted before it and gives the chunk's line range,
+    so the client can resume from `aborted.first_line`.
+
+    Args:
+        request (Request): The upload, NDJSON unless the content type is text/csv
+        format (str, optional): "ndjson" or "csv", overrides the content type
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        TaskBulkResponse: Inserted and failed counts with the first row errors
+    """
+    format = format or ("csv" if request.headers.get("content-type", "").startswith("text/csv") else "ndjson")
+    inserted, failed, errors = 0, 0, []
+    chunk, first_line, last_line = [], 0, 0
+
+    try:
+        lines = iter_lines(request.stream(), settings.MAX_BULK_RECORD_CHARS)
+        records = iter_records(lines, format, settings.MAX_BULK_RECORD_CHARS)
+        async for line, row in records:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                chunk.append(TaskCreate.model_validate(row).model_dump())
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < settings.MAX_BULK_ERRORS:
+                    detail = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                    errors.append(TaskBulkError(line=line, detail=detail))
+                continue
+            except ValueError as e:
+                failed += 1
+                if len(errors) < settings.MAX_BULK_ERRORS:
+                    errors.append(TaskBulkError(line=line, detail=str(e)))
+                continue
+            first_line, last_line = first_line or line, line
+            if len(chunk) >= settings.BULK_INSERT_CHUNK_SIZE:
+                inserted += await add_tasks_async(db, chunk)
+                chunk, first_line = [], 0
+        inserted += await add_tasks_async(db, chunk)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        aborted = TaskBulkAbort(first_line=first_line, last_line=last_line,
+                                detail=f"Database error: {str(getattr(e, 'orig', None) or e)}")
+        body = TaskBulkResponse(inserted=inserted, failed=failed, errors=errors, aborted=aborted)
+        return JSONResponse(status_code=503, content=body.model_dump())
+    return TaskBulkResponse(inserted=inserted, failed=failed, errors=errors)
+
+
+@router.get("/feed", response_model=TaskFeedResponse)
+async def fetch_task_feed(limit: int = Query(..., gt=0, le=100), cursor: Optional[str] = None,
+                          current_user=Depends(get_current_user),
+                          db: AsyncSession = Depends(db_manager.get_async_db)):
     """
     Get a paginated feed of available tasks for the current user.
+
+    Every returned task is leased to the user until `lease_expires_at`, so
+    concurrent labelers are handed different tasks. Leases are kept alive
+    with the heartbeat endpoint and released on submit or report.
     
     Args:
         limit (int): Maximum number of tasks to return
+        cursor (str, optional): Cursor returned as `next_cursor` by the previous page
         current_user (User): Current authenticated user
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
-        List[TaskCreate]: List of available tasks
+        TaskFeedResponse: Page of available tasks with the cursor for the next page
 
     Raises:
         HTTPException: If fetching tasks fails
     """
     try:
-        tasks = get_task_feed(current_user.id, db)
-        return [TaskResponse(
-            id=task.id,
-            type=task.type,
-            data=task.data,
-            point=task.point,
-            title=task.title,
-            description=task.description,
-            tags=task.tags,
-        ) for task in tasks][-limit:]
+        tasks, next_cursor, lease_expires_at = await lease_task_feed_async(db, current_user.id, limit=limit,
+                                                                           cursor=cursor)
+        return TaskFeedResponse(
+            tasks=[TaskResponse(
+                id=task.id,
+                type=task.type,
+                data=task.data,
+                point=task.point,
+                title=task.title,
+                description=task.description,
+                tags=task.tags,
+                required_labels=task.required_labels,
+            ) for task in tasks],
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            lease_expires_at=lease_expires_at,
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{task_id}/heartbeat", response_model=dict)
+async def renew_task_lease(task_id: UUID, current_user=Depends(get_current_user),
+                           db: AsyncSession = Depends(db_manager.get_async_db)):
+    """
+    Extend the current user's lease on a task they are still labeling.
+
+    Args:
+        task_id (UUID): ID of the leased task
+        current_user (User): Current authenticated user
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        dict: Success status with the new lease expiry time
+
+    Raises:
+        HTTPException: If the user holds no active lease on the task
+    """
+    try:
+        expires_at = await heartbeat_lease_async(db, user_id=current_user.id, task_id=task_id)
+        return {"status": "success", "lease_expires_at": expires_at.isoformat()}
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 @router.post("/submit", response_model=dict)
-async def submit_existing_task(label: LabelCreate, current_user=Depends(get_current_user),
-                               db: Session = Depends(db_manager.get_db)):
+async def submit_existing_task(label: LabelCreate, response: Response, current_user=Depends(get_current_user),
+                               db: AsyncSession = Depends(db_manager.get_async_db)):
     """
     Submit a label for an existing task.
 
     Args:
         label (LabelCreate): Label data including task_id and content
+        response (Response): Response the read-your-writes cookie is set on
         current_user (User): Current authenticated user
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         dict: Success message with submission ID
@@ -108,14 +219,15 @@ async def submit_existing_task(label: LabelCreate, current_user=Depends(get_curr
         HTTPException: If submission fails or user is not authorized
     """
     try:
-        submission_result = submit_label(
+        label_id = await submit_label_async(
             db,
             task_id=label.task_id,
             user_id=current_user.id,
-            content=str(label.content)
+            content=json.dumps(label.content, sort_keys=True)
         )
+        record_write(response)
 
-        if not submission_result:
+        if not label_id:
             raise HTTPException(
                 status_code=400,
                 detail="Failed to submit label"
@@ -123,7 +235,7 @@ async def submit_existing_task(label: LabelCreate, current_user=Depends(get_curr
 
         return {
             "status": "success",
-            "message": f"Task successfully submitted {submission_result.id}"
+            "message": f"Task successfully submitted {label_id}"
         }
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
@@ -136,16 +248,50 @@ async def submit_existing_task(label: LabelCreate, current_user=Depends(get_curr
         )
 
 
+@router.post("/submit/batch", response_model=LabelBatchResponse)
+async def submit_label_batch(batch: LabelBatchCreate, response: Response, current_user=Depends(get_current_user),
+                             db: AsyncSession = Depends(db_manager.get_async_db)):
+    """
+    Submit several labels in one request, e.g. when a client syncs offline work.
+
+    Args:
+        batch (LabelBatchCreate): Up to MAX_LABEL_BATCH_SIZE labels
+        response (Response): Response the read-your-writes cookie is set on
+        current_user (User): Current authenticated user
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        LabelBatchResponse: Per-item results with submitted and failed counts
+
+    Raises:
+        HTTPException: If the batch cannot be written at all
+    """
+    try:
+        results = await submit_labels_async(
+            db,
+            user_id=current_user.id,
+            items=[(item.task_id, json.dumps(item.content, sort_keys=True)) for item in batch.items]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    record_write(response)
+
+    submitted = sum(1 for result in results if result["status"] == "success")
+    return LabelBatchResponse(submitted=submitted, failed=len(results) - submitted, results=results)
+
+
 @router.post("/report", response_model=dict)
-async def report_existing_task(task_report: CreateTaskReport, current_user=Depends(get_current_user),
-                               db: Session = Depends(db_manager.get_db)):
+async def report_existing_task(task_report: CreateTaskReport, response: Response,
+                               current_user=Depends(get_current_user),
+                               db: AsyncSession = Depends(db_manager.get_async_db)):
     """
     Report an issue with an existing task.
 
     Args:
         task_report (CreateTaskReport): Report data including task_id and details
+        response (Response): Response the read-your-writes cookie is set on
         current_user (User): Current authenticated user
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         dict: Success message with report ID
@@ -154,13 +300,70 @@ async def report_existing_task(task_report: CreateTaskReport, current_user=Depen
         HTTPException: If report submission fails
     """
     try:
-        report_result = report_task(db, task_id=task_report.task_id, user_id=current_user.id,
-                                    details=task_report.detail)
+        report_result = await report_task_async(db, task_id=task_report.task_id, user_id=current_user.id,
+                                                details=task_report.detail)
+        record_write(response)
         return {"status": "success", "message": f"Task report successfully created {report_result.id}"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Report failed: {str(e)}")
 
 
+@router.get("/quarantined", response_model=QuarantinedTaskPage)
+async def list_quarantined_tasks_route(limit: int = Query(50, gt=0, le=100), cursor: Optional[str] = None,
+                                       current_user=Depends(get_current_reviewer),
+                                       db: AsyncSession = Depends(db_manager.get_async_db)):
+    """
+    Get a page of the review queue: tasks quarantined because several users reported them.
+
+    Args:
+        limit (int): Maximum number of tasks to return
+        cursor (str, optional): Cursor returned as `next_cursor` by the previous page
+        current_user (User): Current authenticated reviewer
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        QuarantinedTaskPage: Quarantined tasks, longest quarantined first
+
+    Raises:
+        HTTPException: If the user is not a reviewer or the cursor is malformed
+    """
+    try:
+        tasks, next_cursor = await list_quarantined_tasks_async(db, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return QuarantinedTaskPage(
+        tasks=[QuarantinedTask.model_validate(task) for task in tasks],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+
+
+@router.post("/{task_id}/release", response_model=dict)
+async def release_quarantined_task_route(task_id: UUID, current_user=Depends(get_current_reviewer),
+                                         db: AsyncSession = Depends(db_manager.get_async_db)):
+    """
+    Return a reviewed task from quarantine to the feed.
+
+    Args:
+        task_id (UUID): ID of the quarantined task
+        current_user (User): Current authenticated reviewer
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        dict: Success status
+
+    Raises:
+        HTTPException: If the user is not a reviewer, the task does not exist or is not quarantined
+    """
+    try:
+        task = await release_quarantined_task_async(db, task_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {"status": "success", "message": f"Task {task_id} released from quarantine"}
+
+
 # @router.put("/update/{task_id}/status", response_model=TaskResponse)
 # def modify_task_status(task_id: str, new_status: str, db: Session = Depends(db_manager.get_db)):
 #     try:
@@ -172,38 +375,48 @@ async def report_existing_task(task_report: CreateTaskReport, current_user=Depen
 #     except Exception as e:
 #         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/labeled", response_model=List[LabeledTask])
-async def get_user_labeled_tasks_route(
+@router.get("/labeled", response_model=LabeledTaskPage)
+def get_user_labeled_tasks_route(
+        limit: int = Query(50, gt=0, le=100),
+        cursor: Optional[str] = None,
         current_user=Depends(get_current_user),
-        db: Session = Depends(db_manager.get_db)
+        db: Session = Depends(get_read_db)
 ):
     """
-    Get all tasks that have been labeled by the current user.
+    Get a page of the tasks that have been labeled by the current user.
+    Served from a read replica unless the user submitted moments ago.
 
     Args:
+        limit (int): Maximum number of tasks to return
+        cursor (str, optional): Cursor returned as `next_cursor` by the previous page
         current_user (User): Current authenticated user
         db (Session): Database session dependency
 
     Returns:
-        List[LabeledTask]: List of tasks labeled by the user with their labels
+        LabeledTaskPage: Tasks labeled by the user with the user's own labels
 
     Raises:
         HTTPException: If fetching labeled tasks fails
     """
     try:
-        labeled_tasks = get_user_labeled_tasks(db, current_user.id)
-        return [
-            LabeledTask(
-                id=task.id,
-                type=task.type,
-                data=task.data,
-                point=task.point,
-                title=task.title,
-                description=task.description,
-                tags=task.tags,
-                is_done=task.is_done,
-                label=get_label_by_task(db, task.id).content) for task in labeled_tasks
-        ]
+        labeled_tasks, next_cursor = get_user_labeled_tasks(db, current_user.id, limit=limit, cursor=cursor)
+        return LabeledTaskPage(
+            tasks=[
+                LabeledTask(
+                    id=task.id,
+                    type=task.type,
+                    data=task.data,
+                    point=task.point,
+                    title=task.title,
+                    description=task.description,
+                    tags=task.tags,
+                    is_done=task.is_done,
+                    required_labels=task.required_labels,
+                    label=content) for task, content in labeled_tasks
+            ],
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=400,
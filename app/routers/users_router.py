@@ -1,72 +1,223 @@
+import math
+import time
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.DatabaseManager import DatabaseManager
+from app.LeaderboardManager import LeaderboardManager
+from app.config import settings
+from app.controller.revokedToken_controller import revoke_refresh_token, rotate_refresh_token
+from app.exceptions.HashPoolSaturatedError import HashPoolSaturatedError
 from app.controller.user_controller import (
-    create_user,
-    login_user,
+    create_user_async,
+    get_user_by_name_async,
+    issue_access_token,
+    issue_refresh_token,
     get_information,
     change_information,
-    change_password, get_leaderboard)
-from app.schemas.user import UserCreate, UserUpdate, UserLogin, UserChangePassword
-from app.utils.JWT_helper import decode_access_token
+    change_password_async,
+    get_leaderboard,
+    get_leaderboard_position,
+    get_windowed_leaderboard)
+from app.schemas.user import UserCreate, UserUpdate, UserLogin, UserChangePassword, LeaderboardEntry, \
+    LeaderboardPosition, UserResponse, TokenRefresh
+from app.utils.JWT_helper import decode_access_token, decode_refresh_token
+from app.utils.cache_helper import token_claims_cache, principal_cache
+from app.utils.hash_helper import password_hash_pool
 
 # Initialize the database manager
 db_manager = DatabaseManager()
+leaderboard = LeaderboardManager()
 
 router = APIRouter(prefix="/users")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
+# Carries the client's last write time, so the read-your-writes pin holds on every worker
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(db_manager.get_db)):
-    payload = decode_access_token(token)
-    user = get_information(db, user_id=uuid.UUID(payload["user_id"]))
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+
+def record_write(response: Response) -> None:
+    """
+    Keep the client's reads on the primary for the read-your-writes window.
+    The write time is sent back as a cookie, and as a header for clients
+    without a cookie jar to echo on their next request.
+    """
+    written_at = f"{time.time():.3f}"
+    response.set_cookie(LAST_WRITE_COOKIE, written_at, max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+                        httponly=True, samesite="lax")
+    response.headers[LAST_WRITE_HEADER] = written_at
+
+
+def last_write(request: Request) -> Optional[float]:
+    """The write time the client sent back, if any."""
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
+    """
+    Resolve the bearer token to the user principal.
+
+    Decoded claims and principals are cached, so repeat requests skip both the
+    signature check and the user lookup. A cached token never outlives its `exp`.
+    Cache misses are looked up on a read replica.
+    """
+    payload = token_claims_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        token_claims_cache.set(token, payload, ttl=payload.get("exp", 0) - time.time())
+    user_id = uuid.UUID(payload["user_id"])
+    user = principal_cache.get(user_id)
+    if user is None:
+        db = db_manager.replicas.session(last_write(request))
+        try:
+            user = get_information(db, user_id=user_id)
+            if not user:
+                raise HTTPException(status_code=404, detail="User not found")
+            user = UserResponse.model_validate(user)
+        finally:
+            db.close()
+        principal_cache.set(user_id, user)
     return user
 
 
+def get_current_reviewer(current_user=Depends(get_current_user)):
+    """
+    Resolve the bearer token to a user listed in REVIEWER_USER_IDS.
+    """
+    if str(current_user.id) not in settings.REVIEWER_USER_IDS:
+        raise HTTPException(status_code=403, detail="Reviewer access required")
+    return current_user
+
+
+def get_read_db(request: Request):
+    """
+    FastAPI dependency for read-only routes. Sessions come from a read replica
+    unless the client wrote within the read-your-writes window.
+    """
+    yield from db_manager.get_read_db(last_write(request))
+
+
+def _ensure_leaderboard() -> None:
+    """
+    Load the in-process leaderboard on first use. It is read from the primary,
+    as totals from a lagging replica would undo the updates applied since.
+    """
+    if not leaderboard.ready:
+        with db_manager.get_session() as session:
+            leaderboard.rebuild(session)
+
+
+def hash_pool_saturated(e: HashPoolSaturatedError) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
 @router.post("/signup", response_model=dict, status_code=201)
-async def create_user_route(user: UserCreate, db: Session = Depends(db_manager.get_db)):
+async def create_user_route(user: UserCreate, response: Response,
+                            db: AsyncSession = Depends(db_manager.get_async_db)):
+    try:
+        password_hash = await password_hash_pool.hash(user.password)
+    except HashPoolSaturatedError as e:
+        raise hash_pool_saturated(e)
     try:
-        created_user = create_user(db, name=user.name, password=user.password, points=user.points)
+        created_user = await create_user_async(db, name=user.name, password_hash=password_hash,
+                                               points=user.points)
+        record_write(response)
         return {"id": str(created_user.id), "name": created_user.name}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/login", response_model=dict)
-async def login_user_route(user: UserLogin = Body(...), db: Session = Depends(db_manager.get_db)):
+async def login_user_route(user: UserLogin = Body(...), db: AsyncSession = Depends(db_manager.get_async_db)):
     try:
-        _, token = login_user(db, name=user.name, password=user.password)
-        return {"access_token": token}
-    except Exception as e:
+        found_user = await get_user_by_name_async(db, name=user.name)
+        verified = found_user is not None and await password_hash_pool.verify(found_user.password, user.password)
+    except HashPoolSaturatedError as e:
+        raise hash_pool_saturated(e)
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=503, detail="Login is temporarily unavailable", headers={"Retry-After": "1"})
+    if not verified:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"access_token": issue_access_token(found_user), "refresh_token": issue_refresh_token(found_user)}
+
+
+@router.post("/token/refresh", response_model=dict)
+def refresh_token_route(body: TokenRefresh, db: Session = Depends(db_manager.get_db)):
+    """
+    Swap a refresh token for a new access token and a new refresh token.
+    The presented refresh token is revoked and cannot be used again.
+    """
+    payload = decode_refresh_token(body.refresh_token)
+    try:
+        access_token, refresh_token = rotate_refresh_token(db, payload)
+    except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    return {"access_token": access_token, "refresh_token": refresh_token}
+
+
+@router.post("/token/revoke", response_model=dict)
+def revoke_token_route(body: TokenRefresh, db: Session = Depends(db_manager.get_db)):
+    """
+    Revoke a refresh token, e.g. on logout.
+    """
+    revoke_refresh_token(db, decode_refresh_token(body.refresh_token))
+    return {"result": "Token revoked"}
 
 
-@router.get("/leaderboard", response_model=list)
-async def get_leader_board(current_user: dict = Depends(get_current_user),
-                           db: Session = Depends(db_manager.get_db)):
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+def get_leader_board(offset: int = Query(0, ge=0), limit: int = Query(50, gt=0, le=100),
+                     window: Optional[Literal["day", "week", "month"]] = None,
+                     current_user: dict = Depends(get_current_user),
+                     db: Session = Depends(get_read_db)):
     """
-    Retrieve a list of users sorted by points in descending order.
+    Retrieve a page of users sorted by points in descending order.
+    With `window`, only points earned in the current day, week or month count.
     """
     try:
-        users = get_leaderboard(db)
-        return [
-            {"id": user.id,
-             "name": user.name,
-             "points": user.points,
-             "labeled_count": user.labeled_count} for user in users
-        ]
+        if window:
+            return [row._asdict() for row in get_windowed_leaderboard(db, window, offset=offset, limit=limit)]
+        if settings.LEADERBOARD_BACKEND == "sql":
+            return [row._asdict() for row in get_leaderboard(db, offset=offset, limit=limit)]
+        _ensure_leaderboard()
+        return leaderboard.top(offset=offset, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to fetch leaderboard: {str(e)}")
 
 
+@router.get("/leaderboard/me", response_model=LeaderboardPosition)
+def get_my_leader_board_position(radius: int = Query(5, ge=0, le=50),
+                                 current_user=Depends(get_current_user),
+                                 db: Session = Depends(get_read_db)):
+    """
+    Retrieve the current user's rank and the users ranked around them.
+    """
+    if settings.LEADERBOARD_BACKEND == "sql":
+        rank, rows = get_leaderboard_position(db, current_user.id, radius=radius)
+        neighbors = [row._asdict() for row in rows]
+    else:
+        _ensure_leaderboard()
+        rank = leaderboard.rank(current_user.id)
+        neighbors = leaderboard.around(current_user.id, radius=radius)
+    if rank is None:
+        raise HTTPException(status_code=404, detail="User not found on leaderboard")
+    return {"rank": rank, "neighbors": neighbors}
+
+
 @router.get("/user/", response_model=dict)
-async def get_user_information(current_user=Depends(get_current_user), db: Session = Depends(db_manager.get_db)):
+def get_user_information(current_user=Depends(get_current_user)):
     user = current_user
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -74,18 +225,25 @@ async def get_user_information(current_user=Depends(get_current_user), db: Sessi
 
 
 @router.put("/user/", response_model=dict)
-def update_user_information(user_update: UserUpdate, current_user=Depends(get_current_user),
+def update_user_information(user_update: UserUpdate, response: Response, current_user=Depends(get_current_user),
                             db: Session = Depends(db_manager.get_db)):
     user = change_information(db, user_id=current_user.id, new_name=user_update.new_name)
+    record_write(response)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return {'id': user.id, 'name': user.name, 'points': user.points, 'label_count': user.labeled_count}
 
 
 @router.put("/user/password", response_model=dict)
-async def update_user_password(user_password: UserChangePassword, current_user=Depends(get_current_user),
-                               db: Session = Depends(db_manager.get_db)):
-    user = change_password(db, user_id=current_user.id, new_password=user_password.new_password)
+async def update_user_password(user_password: UserChangePassword, response: Response,
+                               current_user=Depends(get_current_user),
+                               db: AsyncSession = Depends(db_manager.get_async_db)):
+    try:
+        password_hash = await password_hash_pool.hash(user_password.new_password)
+    except HashPoolSaturatedError as e:
+        raise hash_pool_saturated(e)
+    user = await change_password_async(db, user_id=current_user.id, password_hash=password_hash)
+    record_write(response)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return {'id': user.id, 'result': "Password updated"}
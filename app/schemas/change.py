@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class Change(BaseModel):
+    """
+    Current state of a task, label or report that changed.
+
+    Attributes:
+        seq: Change number of the row
+        entity: Kind of row, "task", "label" or "report"
+        id: ID of the row
+        fields: The row's columns
+    """
+    seq: int
+    entity: Literal["task", "label", "report"]
+    id: UUID
+    fields: Dict[str, Any]
+
+
+class ChangePage(BaseModel):
+    """
+    Schema for a page of the change feed.
+
+    Attributes:
+        changes: Changed rows in the order they became visible
+        next_since: Cursor to pass as `since` for the following page
+        has_more: Whether more changes are available right away
+    """
+    changes: List[Change]
+    next_since: str
+    has_more: bool = Field(
+        default=False,
+        description="Indicates if there are more changes available"
+    )
@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import Optional, List, Dict
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
+from app.config import settings
+
 
 class TaskCreate(BaseModel):
     """
@@ -16,6 +19,7 @@ class TaskCreate(BaseModel):
         point: Points for task (0-1000)
         is_done: Task completion status
         tags: Optional list of tags (max 10 tags)
+        required_labels: Number of labels needed to close the task (1-100)
     """
     model_config = ConfigDict(
         json_schema_extra={
@@ -37,6 +41,7 @@ class TaskCreate(BaseModel):
     description: str = Field("", max_length=1000)
     tags: Optional[List[str]] = []
     is_done: bool = False
+    required_labels: int = Field(settings.DEFAULT_REQUIRED_LABELS, ge=1, le=100)
 
     @field_validator('point')
     @classmethod
@@ -68,6 +73,7 @@ class TaskResponse(BaseModel):
             point: Points for task (0-1000)
             is_done: Task completion status
             tags: Optional list of tags (max 10 tags)
+            required_labels: Number of labels needed to close the task (1-100)
         """
     model_config = ConfigDict(
         json_schema_extra={
@@ -90,6 +96,7 @@ class TaskResponse(BaseModel):
     description: str = Field("", max_length=1000)
     tags: Optional[List[str]] = []
     is_done: bool = False
+    required_labels: int = Field(settings.DEFAULT_REQUIRED_LABELS, ge=1, le=100)
 
     @field_validator('point')
     @classmethod
@@ -135,13 +142,15 @@ class TaskFeedResponse(BaseModel):
     
     Attributes:
         tasks: List of tasks in the feed
-        total: Total number of tasks
+        next_cursor: Opaque cursor for fetching the next page
         has_more: Whether there are more tasks available
+        lease_expires_at: When the leases on the returned tasks lapse
     """
     model_config = ConfigDict(from_attributes=True)
 
     tasks: List[TaskResponse]
-    total: int
+    next_cursor: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
     has_more: bool = Field(
         default=False,
         description="Indicates if there are more tasks available"
@@ -167,3 +176,90 @@ class LabeledTask(TaskResponse):
     model_config = ConfigDict(from_attributes=True)
 
     label: str
+
+
+class LabeledTaskPage(BaseModel):
+    """
+    Schema for a paginated list of the tasks a user labeled.
+
+    Attributes:
+        tasks: Labeled tasks with the user's own label
+        next_cursor: Opaque cursor for fetching the next page
+        has_more: Whether there are more labeled tasks available
+    """
+    tasks: List[LabeledTask]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class QuarantinedTask(TaskResponse):
+    """
+    Schema for a task in the review queue.
+    Inherits all fields from TaskResponse and adds its report state.
+
+    Attributes:
+        report_count: Number of reports on the task
+        reporter_count: Distinct users who reported it since it was last reviewed
+        quarantined_at: When the task was quarantined
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    report_count: int
+    reporter_count: int
+    quarantined_at: datetime
+
+
+class QuarantinedTaskPage(BaseModel):
+    """
+    Schema for a paginated review queue.
+
+    Attributes:
+        tasks: Quarantined tasks, longest quarantined first
+        next_cursor: Opaque cursor for fetching the next page
+        has_more: Whether there are more quarantined tasks
+    """
+    tasks: List[QuarantinedTask]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class TaskBulkError(BaseModel):
+    """
+    Schema for a row rejected by bulk task ingestion.
+
+    Attributes:
+        line: Line of the upload the row starts on
+        detail: Why the row was rejected
+    """
+    line: int
+    detail: str
+
+
+class TaskBulkAbort(BaseModel):
+    """
+    Schema for the chunk a bulk ingestion stopped at.
+
+    Attributes:
+        first_line: Line of the upload the chunk's first row starts on
+        last_line: Line of the upload the chunk's last row starts on
+        detail: Why the chunk could not be written
+    """
+    first_line: int
+    last_line: int
+    detail: str
+
+
+class TaskBulkResponse(BaseModel):
+    """
+    Schema for the result of bulk task ingestion.
+
+    Attributes:
+        inserted: Number of tasks created
+        failed: Number of rows rejected
+        errors: The first rejected rows, at most MAX_BULK_ERRORS of them
+        aborted: The chunk whose insert failed, if the upload was cut short
+    """
+    inserted: int
+    failed: int
+    errors: List[TaskBulkError]
+    aborted: Optional[TaskBulkAbort] = None
@@ -1,7 +1,9 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.config import settings
+
 
 # Label Schema
 class LabelBase(BaseModel):
@@ -24,3 +26,25 @@ class LabelCreate(BaseModel):
 
 class LabelResponse(LabelBase):
     pass
+
+
+class LabelBatchCreate(BaseModel):
+    items: List[LabelCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.MAX_LABEL_BATCH_SIZE,
+        description="Labels to submit together"
+    )
+
+
+class LabelBatchItemResult(BaseModel):
+    task_id: UUID
+    status: str
+    label_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+
+class LabelBatchResponse(BaseModel):
+    submitted: int
+    failed: int
+    results: List[LabelBatchItemResult]
@@ -1,3 +1,4 @@
+from typing import List
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
@@ -63,3 +64,20 @@ class UserChangePassword(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
+
+class LeaderboardEntry(BaseModel):
+    id: UUID
+    name: str
+    points: int
+    labeled_count: int
+    rank: int
+
+
+class LeaderboardPosition(BaseModel):
+    rank: int
+    neighbors: List[LeaderboardEntry]
@@ -1,4 +1,5 @@
 import os
+import uuid
 from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
@@ -9,6 +10,7 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = timedelta(minutes=15)
+REFRESH_TOKEN_EXPIRE_DAYS = timedelta(days=30)
 
 
 def create_access_token(data: dict, expires_delta=ACCESS_TOKEN_EXPIRE_MINUTES):
@@ -21,20 +23,18 @@ def create_access_token(data: dict, expires_delta=ACCESS_TOKEN_EXPIRE_MINUTES):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def create_refresh_token(user_id: str):
+def create_refresh_token(user_id: str, expires_delta=REFRESH_TOKEN_EXPIRE_DAYS):
     """
-    Generates a refresh token with a 5-min expiration.
+    Generates a long-lived refresh token. Each one carries a unique `jti`
+    so it can be revoked on its own.
     """
-    return create_access_token({"user_id": user_id}, expires_delta=timedelta(minutes=5))
+    return create_access_token({"user_id": user_id, "type": "refresh", "jti": uuid.uuid4().hex},
+                               expires_delta=expires_delta)
 
 
-def decode_access_token(token: str):
-    """
-    Decodes and validates a JWT token.
-    """
+def _decode_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=401,
@@ -45,3 +45,29 @@ def decode_access_token(token: str):
             status_code=401,
             detail="Invalid token"
         )
+
+
+def decode_access_token(token: str):
+    """
+    Decodes and validates a JWT token. Refresh tokens are rejected.
+    """
+    payload = _decode_token(token)
+    if payload.get("type") == "refresh":
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token"
+        )
+    return payload
+
+
+def decode_refresh_token(token: str):
+    """
+    Decodes and validates a refresh token.
+    """
+    payload = _decode_token(token)
+    if payload.get("type") != "refresh" or "jti" not in payload or "user_id" not in payload:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid refresh token"
+        )
+    return payload
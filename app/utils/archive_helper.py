@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Index, MetaData, Table
+
+
+def archive_table(table: Table, name: str, metadata: MetaData, *indexes: Index) -> Table:
+    """
+    Copy of `table`'s columns under `name`, keyed on `id` alone.
+
+    Archived rows are moved over as they are, so the copy has no defaults,
+    foreign keys or partitioning. A migration that adds a column to `table`
+    has to add it to the archive table as well.
+    """
+    columns = [
+        Column(column.name, column.type, primary_key=column.name == "id", nullable=column.nullable)
+        for column in table.columns
+    ]
+    return Table(name, metadata, *columns, *indexes)
+
+
+def column_list(table: Table, prefix: str = "") -> str:
+    """Comma separated column names of `table`, each optionally qualified with `prefix`."""
+    return ", ".join(f"{prefix}{column.name}" for column in table.columns)
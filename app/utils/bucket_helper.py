@@ -0,0 +1,8 @@
+from datetime import datetime, timezone
+
+
+def current_bucket_start() -> datetime:
+    """
+    Start of the current hourly point bucket, in UTC.
+    """
+    return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
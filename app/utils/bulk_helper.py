@@ -0,0 +1,107 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, Union
+
+
+async def iter_lines(chunks: AsyncIterator[bytes],
+                     max_line_chars: int = 1024 * 1024) -> AsyncIterator[Union[str, ValueError]]:
+    """
+    Splits a stream of UTF-8 byte chunks into lines without reading it whole.
+
+    A line longer than `max_line_chars` is yielded as a ValueError in its
+    place, and the rest of it is dropped unread up to the next newline.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    too_long = ValueError(f"Line is longer than {max_line_chars} characters")
+    buffer, skipping = "", False
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if skipping:
+                skipping = False  # The end of the line already reported
+                continue
+            yield too_long if len(line) > max_line_chars else line.rstrip("\r")
+        if len(buffer) > max_line_chars:
+            if not skipping:
+                yield too_long
+            buffer, skipping = "", True
+    buffer += decoder.decode(b"", final=True)
+    if buffer and not skipping:
+        yield too_long if len(buffer) > max_line_chars else buffer.rstrip("\r")
+
+
+def _parse_ndjson(text: str) -> dict:
+    row = json.loads(text)
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+    return row
+
+
+# CSV cells that hold JSON rather than plain text
+_JSON_COLUMNS = ("data", "tags")
+
+
+def _parse_csv(header: list[str], text: str) -> dict:
+    values = next(csv.reader(io.StringIO(text)))
+    if len(values) != len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+    row = {}
+    for column, value in zip(header, values):
+        if value == "":
+            continue  # Empty cells fall back to the schema defaults
+        row[column] = json.loads(value) if column in _JSON_COLUMNS else value
+    return row
+
+
+async def iter_records(lines: AsyncIterator[Union[str, ValueError]], format: str,
+                       max_record_chars: int = 1024 * 1024) -> AsyncIterator[tuple[int, Union[dict, Exception]]]:
+    """
+    Parses NDJSON or CSV lines into row dicts.
+
+    Yields (line number, row) pairs, with the parse error in place of the row
+    when a record is malformed. CSV input starts with a header line, and a
+    record whose quoted cells span several lines is numbered by its first line.
+    A CSV record longer than `max_record_chars` fails and parsing resumes with
+    the next line, so an unclosed quote cannot buffer the rest of the upload.
+    Errors of `iter_lines` fail the record the line belongs to.
+    """
+    header = None
+    pending, pending_line = "", 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if isinstance(line, ValueError):
+            yield (pending_line if pending else line_number), line
+            pending = ""
+            continue
+        if format == "ndjson":
+            if line.strip():
+                try:
+                    yield line_number, _parse_ndjson(line)
+                except ValueError as e:
+                    yield line_number, e
+            continue
+
+        if not pending:
+            pending_line = line_number
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            if len(pending) > max_record_chars:
+                pending = ""
+                yield pending_line, ValueError(f"Record is longer than {max_record_chars} characters")
+            continue  # Inside a quoted cell, the record goes on in the next line
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        if header is None:
+            header = [column.strip() for column in next(csv.reader(io.StringIO(record)))]
+            continue
+        try:
+            yield pending_line, _parse_csv(header, record)
+        except (ValueError, csv.Error) as e:
+            yield pending_line, e
+    if pending:
+        yield pending_line, ValueError("Unterminated quoted cell")
@@ -0,0 +1,50 @@
+from sqlalchemy import BigInteger, Column, DDL, FetchedValue, Table, event, text
+
+# One sequence shared by every tracked table, so change numbers are unique across them
+CHANGE_SEQ = "change_seq"
+
+# Id of the writing transaction, which tells readers when a change can no longer be overtaken
+CURRENT_XID = "(pg_current_xact_id()::text::bigint)"
+
+_TRACK_CHANGE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION track_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := nextval('{CHANGE_SEQ}');
+    NEW.change_xid := {CURRENT_XID};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def change_seq_column() -> Column:
+    """Change number of a row, drawn from CHANGE_SEQ on insert and on every update."""
+    return Column(BigInteger, nullable=False, server_default=text(f"nextval('{CHANGE_SEQ}')"),
+                  server_onupdate=FetchedValue())
+
+
+def change_xid_column() -> Column:
+    """Id of the transaction that last wrote a row."""
+    return Column(BigInteger, nullable=False, server_default=text(CURRENT_XID), server_onupdate=FetchedValue())
+
+
+def track_changes_statements(table: str) -> list[str]:
+    """
+    Statements that make updates of `table` renumber the row. Inserts are
+    covered by the column defaults.
+    """
+    return [
+        _TRACK_CHANGE_FUNCTION,
+        f"DROP TRIGGER IF EXISTS {table}_track_change ON {table}",
+        f"CREATE TRIGGER {table}_track_change BEFORE UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION track_change()",
+    ]
+
+
+def track_changes(table: Table) -> None:
+    """
+    Create the change sequence before `table` and its update trigger after it.
+    """
+    event.listen(table, "before_create", DDL(f"CREATE SEQUENCE IF NOT EXISTS {CHANGE_SEQ}"))
+    for statement in track_changes_statements(table.name):
+        event.listen(table, "after_create", DDL(statement))
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator
+
+# Columns of a CSV export, the ones in _JSON_COLUMNS hold JSON as in /tasks/bulk uploads
+CSV_COLUMNS = ("id", "type", "title", "description", "data", "tags", "point", "required_labels",
+               "done_at", "labels", "consensus", "consensus_votes")
+_JSON_COLUMNS = ("data", "tags", "labels")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _cell(record: dict, column: str) -> str:
+    value = record[column]
+    if column in _JSON_COLUMNS:
+        return _dumps(value)
+    return "" if value is None else str(value)
+
+
+def iter_ndjson(records: Iterable[dict]) -> Iterator[str]:
+    """
+    Formats records as NDJSON lines.
+    """
+    for record in records:
+        yield _dumps(record) + "\n"
+
+
+def iter_csv(records: Iterable[dict]) -> Iterator[str]:
+    """
+    Formats records as CSV lines, starting with a header line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for record in records:
+        writer.writerow([_cell(record, column) for column in CSV_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # Header of an empty export
+
+
+def iter_chunks(lines: Iterable[str], size: int) -> Iterator[bytes]:
+    """
+    Joins lines into UTF-8 chunks of about `size` bytes, so the response is
+    written in a few large pieces rather than one small piece per record.
+    """
+    pending, pending_size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= size:
+            yield b"".join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield b"".join(pending)
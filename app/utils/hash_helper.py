@@ -1,5 +1,16 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
 from passlib.context import CryptContext
 
+from app.config import settings
+from app.exceptions.HashPoolSaturatedError import HashPoolSaturatedError
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -9,3 +20,100 @@ def generate_password_hash(password: str) -> str:
 
 def check_password_hash(hashed_password: str, plain_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHashPool:
+    """
+    Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so hashes run in parallel up to the number of
+    workers while the event loop stays free. Jobs beyond `max_pending` are
+    rejected with HashPoolSaturatedError instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _run(self, func: Callable, queued_at: float, *args):
+        started_at = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.monotonic()
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._wait_seconds += started_at - queued_at
+                self._max_wait_seconds = max(self._max_wait_seconds, started_at - queued_at)
+                self._run_seconds += finished_at - started_at
+
+    async def _submit(self, func: Callable, *args):
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HashPoolSaturatedError(self._pending)
+            self._pending += 1
+        try:
+            future = executor.submit(self._run, func, time.monotonic(), *args)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(generate_password_hash, password)
+
+    async def verify(self, hashed_password: str, plain_password: str) -> bool:
+        return await self._submit(check_password_hash, hashed_password, plain_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+                "avg_run_ms": round(self._run_seconds / completed * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def canonical_content_hash(content: str) -> str:
+    """
+    Hashes label content so that equivalent JSON answers get the same digest
+    regardless of key order or whitespace.
+    """
+    try:
+        canonical = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        canonical = content.strip()
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -0,0 +1,22 @@
+from sqlalchemy import DDL, Table, event
+
+
+def hash_partition_options(column: str, partitions: int) -> dict:
+    """
+    Table options that hash-partition a table on `column`, or none when
+    `partitions` is 0.
+    """
+    if not partitions:
+        return {}
+    return {"postgresql_partition_by": f"HASH ({column})"}
+
+
+def add_hash_partitions(table: Table, partitions: int) -> None:
+    """
+    Create the `partitions` child tables right after the parent table is created.
+    """
+    for remainder in range(partitions):
+        event.listen(table, "after_create", DDL(
+            f"CREATE TABLE IF NOT EXISTS {table.name}_p{remainder} PARTITION OF {table.name} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        ))
@@ -0,0 +1,101 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds in milliseconds of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolWaitStats:
+    """
+    Counters and a wait time histogram for connection checkouts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_seconds * 1000)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = (self.checkouts + self.timeouts) or 1
+            labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "wait_histogram": dict(zip(labels, self.buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout, including waits on a full pool and the ones that
+    end in a pool timeout. The stats survive `recreate()` on engine dispose.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+    @property
+    def wait_stats(self) -> PoolWaitStats:
+        if not hasattr(self, "_wait_stats"):
+            self._wait_stats = PoolWaitStats()
+        return self._wait_stats
+
+    def recreate(self):
+        pool = super().recreate()
+        pool._wait_stats = self.wait_stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool: Pool) -> dict:
+    """
+    Live state of a pool plus its checkout stats when it is instrumented.
+    """
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    stats = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    if isinstance(pool, _InstrumentedPoolMixin):
+        stats.update(pool.wait_stats.snapshot())
+    return stats
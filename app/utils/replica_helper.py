@@ -0,0 +1,48 @@
+import itertools
+import threading
+import time
+from typing import Optional, Sequence
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions for read-only work, spread over the read replicas.
+
+    Replicas are picked round-robin or by the fewest checked-out connections.
+    Reads made within `pin_seconds` of the caller's last write go to the
+    primary so they see that write despite replication lag. The write time
+    comes from the caller, e.g. the client, rather than this process, so the
+    pin holds whichever worker serves the read. Without replicas every
+    session comes from the primary.
+    """
+
+    def __init__(self, primary: sessionmaker, replicas: Sequence[Engine], strategy: str = "round_robin",
+                 pin_seconds: float = 5):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self._sessions = [sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in self.replicas]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.pin_seconds = pin_seconds
+
+    def is_pinned(self, written_at: Optional[float]) -> bool:
+        """Whether a write at epoch time `written_at` is still inside the read-your-writes window."""
+        return written_at is not None and 0 <= time.time() - written_at < self.pin_seconds
+
+    def _pick(self) -> int:
+        if self.strategy == "least_connections":
+            return min(range(len(self.replicas)), key=lambda index: self.replicas[index].pool.checkedout())
+        with self._lock:
+            return next(self._next) % len(self.replicas)
+
+    def session(self, written_at: Optional[float] = None) -> Session:
+        """Open a session for reads by a caller whose last write was at `written_at`."""
+        if not self.replicas or self.is_pinned(written_at):
+            return self.primary()
+        return self._sessions[self._pick()]()
@@ -24,7 +24,7 @@ class TestTaskLabelingFlow:
             headers=auth_headers
         )
         assert feed_response.status_code == 200
-        assert len(feed_response.json()) == 1
+        assert len(feed_response.json()["tasks"]) == 1
 
         # Get current user ID
         user_response = test_client.get("/api/v1/users/user/", headers=auth_headers)
@@ -57,5 +57,5 @@ class TestTaskLabelingFlow:
             headers=auth_headers
         )
         assert new_feed_response.status_code == 200
-        feed_tasks = new_feed_response.json()
-        assert not any(task["task_id"] == task_id for task in feed_tasks)
+        feed_tasks = new_feed_response.json()["tasks"]
+        assert not any(task["id"] == task_id for task in feed_tasks)
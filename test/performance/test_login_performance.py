@@ -0,0 +1,58 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.hash_helper import PasswordHashPool, generate_password_hash
+
+PASSWORD = "SecureP@ssw0rd!"
+
+
+def _verify_throughput(workers: int, logins: int) -> float:
+    """Return verifications per second for a pool with the given number of workers."""
+    pool = PasswordHashPool(workers=workers, max_pending=logins)
+    hashed = generate_password_hash(PASSWORD)
+
+    async def storm():
+        return await asyncio.gather(*(pool.verify(hashed, PASSWORD) for _ in range(logins)))
+
+    start_time = time.perf_counter()
+    try:
+        results = asyncio.run(storm())
+    finally:
+        pool.shutdown()
+    assert all(results)
+    return logins / (time.perf_counter() - start_time)
+
+
+@pytest.mark.performance
+class TestLoginPerformance:
+    def test_login_throughput_scales_with_cores(self):
+        cores = os.cpu_count() or 1
+        if cores < 2:
+            pytest.skip("Needs at least two cores")
+        single = _verify_throughput(workers=1, logins=16)
+        parallel = _verify_throughput(workers=cores, logins=16 * cores)
+        print(f"\nbcrypt verify/s: 1 worker={single:.1f}, {cores} workers={parallel:.1f}")
+        assert parallel > single * 1.5
+
+    def test_feed_latency_during_login_storm(self, test_client, auth_headers):
+        def login():
+            return test_client.post("/api/v1/users/login", json={"name": "test_user", "password": PASSWORD})
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            logins = [executor.submit(login) for _ in range(64)]
+            latencies = []
+            for _ in range(10):
+                start_time = time.perf_counter()
+                response = test_client.get("/api/v1/tasks/feed", params={"limit": 10}, headers=auth_headers)
+                latencies.append(time.perf_counter() - start_time)
+                assert response.status_code == 200
+            results = [future.result() for future in logins]
+
+        assert all(r.status_code in (200, 503) for r in results)
+        latencies.sort()
+        print(f"\nfeed latency under login storm: p50={latencies[5] * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+        assert latencies[-1] < 1.0
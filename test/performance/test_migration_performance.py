@@ -0,0 +1,86 @@
+import json
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.DatabaseManager import DatabaseManager
+from app.controller.task_controller import task_feed_statement
+from app.migrations import run_migrations, v0002_access_path_indexes, v0005_task_counters, \
+    v0006_task_quarantine
+
+TASKS = 200_000
+LABELS_PER_USER = 20_000
+USERS = 20
+# Migrations that build the indexes of the feed's access paths
+FEED_MIGRATIONS = (v0002_access_path_indexes, v0005_task_counters, v0006_task_quarantine)
+
+
+def _explain(connection, statement) -> dict:
+    compiled = statement.compile(dialect=postgresql.dialect())
+    start_time = time.perf_counter()
+    plan = connection.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + str(compiled),
+                                      compiled.params).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    return {"plan": plan[0]["Plan"], "elapsed": time.perf_counter() - start_time}
+
+
+def _node_types(plan: dict) -> set:
+    types = {plan["Node Type"]}
+    for child in plan.get("Plans", []):
+        types |= _node_types(child)
+    return types
+
+
+@pytest.mark.performance
+class TestMigrationPerformance:
+    def test_access_path_indexes_change_feed_plan(self):
+        """Compare the feed plan on a synthetic dataset before and after the index migrations."""
+        db_manager = DatabaseManager(testing=True)
+        db_manager.drop_db()
+        db_manager.init_db()
+        engine = db_manager.engine
+        user_ids = [uuid.uuid4() for _ in range(USERS)]
+
+        with engine.begin() as connection:
+            for migration in FEED_MIGRATIONS:
+                for name in migration.INDEXES:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                connection.execute(text("DELETE FROM schema_migrations WHERE version = :version"),
+                                   {"version": migration.VERSION})
+            connection.execute(text("""
+                INSERT INTO users (id, name, password, points, labeled_count)
+                SELECT id, 'bench_' || id, 'x', 0, 0 FROM unnest(CAST(:ids AS uuid[])) AS id
+            """), {"ids": [str(user_id) for user_id in user_ids]})
+            connection.execute(text("""
+                INSERT INTO tasks (id, type, data, point, title, description, is_done, required_labels)
+                SELECT gen_random_uuid(), 'bench', '{}'::jsonb, 1, 'Task ' || n, 'Synthetic', n % 4 = 0, 6
+                FROM generate_series(1, :count) AS n
+            """), {"count": TASKS})
+            connection.execute(text("""
+                INSERT INTO task_labels (id, user_id, task_id, content)
+                SELECT gen_random_uuid(), u.id, t.id, 'label'
+                FROM unnest(CAST(:ids AS uuid[])) AS u(id)
+                CROSS JOIN LATERAL (SELECT id FROM tasks ORDER BY id LIMIT :labels) AS t
+            """), {"ids": [str(user_id) for user_id in user_ids], "labels": LABELS_PER_USER})
+            connection.execute(text("ANALYZE"))
+
+        feed = task_feed_statement(user_ids[0], 50, None)
+        with engine.connect() as connection:
+            before = _explain(connection, feed)
+
+        assert run_migrations(engine) == [migration.VERSION for migration in FEED_MIGRATIONS]
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+        with engine.connect() as connection:
+            after = _explain(connection, feed)
+
+        print(f"\nfeed plan before the index migrations ({before['elapsed'] * 1000:.1f}ms): "
+              f"{sorted(_node_types(before['plan']))}")
+        print(f"feed plan after the index migrations ({after['elapsed'] * 1000:.1f}ms): "
+              f"{sorted(_node_types(after['plan']))}")
+        assert "Index Scan" in _node_types(after["plan"]) or "Index Only Scan" in _node_types(after["plan"])
+        assert after["plan"]["Actual Total Time"] < before["plan"]["Actual Total Time"]
+        db_manager.drop_db()
@@ -0,0 +1,40 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.DatabaseManager import DatabaseManager
+from app.utils.uuid_helper import uuid7
+
+ROWS = 200_000
+BATCH = 1_000
+
+
+def _insert_throughput(engine, table: str, generate) -> tuple[float, int]:
+    """Insert ROWS rows keyed by `generate()` and return (rows per second, primary key index bytes)."""
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        connection.execute(text(f"CREATE TABLE {table} (id uuid PRIMARY KEY, payload text NOT NULL)"))
+    start_time = time.perf_counter()
+    for _ in range(ROWS // BATCH):
+        with engine.begin() as connection:
+            connection.execute(text(f"INSERT INTO {table} (id, payload) VALUES (:id, 'label')"),
+                               [{"id": generate()} for _ in range(BATCH)])
+    elapsed = time.perf_counter() - start_time
+    with engine.begin() as connection:
+        index_bytes = connection.execute(text(f"SELECT pg_relation_size('{table}_pkey')")).scalar()
+        connection.execute(text(f"DROP TABLE {table}"))
+    return ROWS / elapsed, index_bytes
+
+
+@pytest.mark.performance
+class TestUuidPerformance:
+    def test_uuid7_insert_throughput(self):
+        engine = DatabaseManager(testing=True).engine
+        v4_rate, v4_index = _insert_throughput(engine, "bench_uuid4", uuid.uuid4)
+        v7_rate, v7_index = _insert_throughput(engine, "bench_uuid7", uuid7)
+        print(f"\nuuid4: {v4_rate:.0f} rows/s, pkey {v4_index / 2 ** 20:.1f} MiB")
+        print(f"uuid7: {v7_rate:.0f} rows/s, pkey {v7_index / 2 ** 20:.1f} MiB")
+        # Appending at the right edge fills leaf pages instead of splitting them
+        assert v7_index < v4_index
@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
 
 from app.DatabaseManager import DatabaseManager, Base
+from app.migrations import MIGRATIONS, run_migrations
 from app.models import User, Task  # Import models to ensure they're registered with Base
 
 class TestDatabaseManager:
@@ -170,6 +171,21 @@ class TestDatabaseManager:
         assert not hasattr(db_manager, 'SessionLocal')
         assert not db_manager._initialized
 
+    def test_migrations_are_recorded_once(self):
+        """Test that init_db records every migration and reruns are no-ops."""
+        db_manager = DatabaseManager(testing=True)
+        db_manager.drop_db()
+        db_manager.init_db()
+
+        with db_manager.engine.connect() as conn:
+            versions = conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars().all()
+            indexes = set(conn.execute(text("SELECT indexname FROM pg_indexes")).scalars())
+        assert versions == [migration.VERSION for migration in MIGRATIONS]
+        assert {"ux_task_labels_user_id_task_id", "ix_task_reports_user_id_task_id",
+                "ix_tasks_feed", "ix_tasks_quarantined"} <= indexes
+        assert not {"ix_tasks_open", "ix_tasks_open_by_label_count"} & indexes
+        assert run_migrations(db_manager.engine) == []
+
     def test_drop_db(self):
         """Test database drop functionality."""
         db_manager = DatabaseManager(testing=True)
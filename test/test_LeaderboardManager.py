@@ -0,0 +1,58 @@
+import uuid
+
+import pytest
+
+from app.LeaderboardManager import LeaderboardManager
+
+
+class TestLeaderboardManager:
+    @pytest.fixture(autouse=True)
+    def board(self):
+        """Give each test an empty board."""
+        board = LeaderboardManager()
+        board.reset()
+        yield board
+        board.reset()
+
+    def _add_users(self, board, points):
+        users = []
+        for i, user_points in enumerate(points):
+            user_id = uuid.uuid4()
+            board.update(user_id, name=f"user{i}", points=user_points, labeled_count=0)
+            users.append(user_id)
+        return users
+
+    def test_singleton_pattern(self):
+        assert LeaderboardManager() is LeaderboardManager()
+
+    def test_top_orders_by_points(self, board):
+        users = self._add_users(board, [10, 30, 20])
+        top = board.top(offset=0, limit=2)
+        assert [entry["id"] for entry in top] == [users[1], users[2]]
+        assert [entry["rank"] for entry in top] == [1, 2]
+        assert [entry["id"] for entry in board.top(offset=2, limit=2)] == [users[0]]
+
+    def test_rank_follows_point_updates(self, board):
+        users = self._add_users(board, [10, 30, 20])
+        assert board.rank(users[0]) == 3
+        board.update(users[0], points=40, labeled_count=1)
+        assert board.rank(users[0]) == 1
+        assert board.rank(users[1]) == 2
+        assert board.rank(uuid.uuid4()) is None
+
+    def test_ties_share_a_rank(self, board):
+        users = self._add_users(board, [50, 20, 20, 5])
+        assert board.rank(users[1]) == board.rank(users[2]) == 2
+        assert board.rank(users[3]) == 4
+
+    def test_around_returns_window(self, board):
+        users = self._add_users(board, [50, 40, 30, 20, 10])
+        window = board.around(users[2], radius=1)
+        assert [entry["id"] for entry in window] == [users[1], users[2], users[3]]
+        edge = board.around(users[0], radius=2)
+        assert [entry["id"] for entry in edge] == users[:3]
+
+    def test_update_renames_user(self, board):
+        users = self._add_users(board, [10])
+        board.update(users[0], name="renamed")
+        assert board.top()[0]["name"] == "renamed"
@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pytest
+
+import app.SnapshotManager as snapshot_module
+from app.SnapshotManager import SnapshotManager
+
+
+def _record(title: str) -> dict:
+    return {
+        "id": uuid.uuid4(), "type": "image", "title": title, "description": "", "data": {"url": "a.jpg"},
+        "tags": ["x"], "point": 5, "required_labels": 1, "done_at": datetime.now(timezone.utc),
+        "labels": [{"user_id": uuid.uuid4(), "content": "cat", "created_at": datetime.now(timezone.utc)}],
+        "consensus": "cat", "consensus_votes": 1,
+    }
+
+
+class TestSnapshotManager:
+    @pytest.fixture(autouse=True)
+    def manager(self, tmp_path, monkeypatch):
+        """Point the store at an empty directory and feed it records instead of the database."""
+        self.pending, self.calls = [], []
+
+        def export_done_tasks(db, done_after=None, done_before=None):
+            self.calls.append(done_after)
+            records, self.pending = self.pending, []
+            return iter(records)
+
+        monkeypatch.setattr(snapshot_module, "export_done_tasks", export_done_tasks)
+        manager = SnapshotManager()
+        directory = manager.directory
+        manager.directory = tmp_path
+        yield manager
+        manager.directory = directory
+
+    def _read(self, manager, version) -> pa.Table:
+        with pa.memory_map(str(manager.path(version))) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def test_singleton_pattern(self):
+        assert SnapshotManager() is SnapshotManager()
+
+    def test_nothing_new_writes_no_version(self, manager):
+        assert manager.build(db=None) is None
+        assert manager.versions() == []
+
+    def test_builds_are_incremental(self, manager):
+        self.pending = [_record("first"), _record("second")]
+        first = manager.build(db=None)
+        assert first["version"] == 1 and first["rows"] == 2
+
+        self.pending = [_record("third")]
+        second = manager.build(db=None)
+        assert second["version"] == 2 and second["added"] == 1 and second["rows"] == 3
+        assert self.calls[0] is None
+        assert self.calls[1].isoformat() == first["watermark"]
+
+        table = self._read(manager, 2)
+        assert table.column("title").to_pylist() == ["first", "second", "third"]
+        assert table.column("labels").to_pylist()[0][0]["content"] == "cat"
+        assert table.schema == snapshot_module.SCHEMA
+
+    def test_old_versions_are_pruned(self, manager, monkeypatch):
+        monkeypatch.setattr(snapshot_module.settings, "SNAPSHOT_RETAIN", 2)
+        for title in ("a", "b", "c"):
+            self.pending = [_record(title)]
+            manager.build(db=None)
+        assert [entry["version"] for entry in manager.versions()] == [2, 3]
+        assert manager.path(1) is None
+        assert sorted(path.name for path in manager.directory.glob("*.arrow")) == [
+            "dataset-00000002.arrow", "dataset-00000003.arrow"
+        ]
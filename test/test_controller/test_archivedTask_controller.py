@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+import pytest
+
+from app.DatabaseManager import DatabaseManager
+from app.controller.archivedTask_controller import archive_done_tasks
+from app.controller.task_controller import add_task, list_done_tasks, export_done_tasks, get_user_labeled_tasks
+from app.controller.taskLabel_controller import submit_label
+from app.controller.taskReport_controller import report_task
+from app.controller.user_controller import create_user
+from app.models import ArchivedTask, ArchivedTaskLabel, ArchivedTaskReport, Task, TaskLabel, TaskVoteTally
+
+# Initialize the DatabaseManager with the test database URL
+db_manager = DatabaseManager()
+
+
+@pytest.fixture(scope="function")
+def test_session():
+    """Set up an empty database using DatabaseManager and yield a session."""
+    db_manager.drop_db()
+    db_manager.init_db()
+    session = db_manager.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def labeled_tasks(test_session):
+    """One task closed by two labels and one report, and one open task."""
+    users = [create_user(test_session, name=f"archive_user_{i}", password="SecureP@ssw0rd!") for i in range(3)]
+    done = add_task(test_session, type="classification", data={"n": 1}, point=1, title="Done",
+                    description="Closed task", required_labels=2)
+    open_task = add_task(test_session, type="classification", data={"n": 2}, point=1, title="Open",
+                         description="Open task", required_labels=2)
+    submit_label(test_session, user_id=users[0].id, task_id=done.id, content="cat")
+    submit_label(test_session, user_id=users[1].id, task_id=done.id, content="cat")
+    report_task(test_session, user_id=users[2].id, task_id=done.id, details="Blurry")
+    return users, done, open_task
+
+
+def test_archive_moves_done_tasks(test_session, labeled_tasks):
+    """Test that done tasks move with their labels and reports, and open ones stay."""
+    users, done, open_task = labeled_tasks
+    assert archive_done_tasks(test_session, older_than=timedelta(0), batch_size=1) == 1
+
+    assert test_session.query(Task.id).all() == [(open_task.id,)]
+    assert test_session.query(TaskLabel).count() == 0
+    assert test_session.query(TaskVoteTally).count() == 0
+    assert test_session.get(ArchivedTask, done.id).title == "Done"
+    assert test_session.query(ArchivedTaskLabel).filter(ArchivedTaskLabel.task_id == done.id).count() == 2
+    assert test_session.query(ArchivedTaskReport).filter(ArchivedTaskReport.task_id == done.id).count() == 1
+
+
+def test_archive_keeps_recently_closed_tasks(test_session, labeled_tasks):
+    """Test that tasks closed within the grace period stay hot."""
+    assert archive_done_tasks(test_session, older_than=timedelta(hours=1)) == 0
+    assert test_session.query(ArchivedTask).count() == 0
+
+
+def test_reads_span_hot_and_archive(test_session, labeled_tasks):
+    """Test that done task listings, exports and labeled task pages include archived tasks."""
+    users, done, open_task = labeled_tasks
+    archive_done_tasks(test_session, older_than=timedelta(0))
+
+    assert [task.id for task in list_done_tasks(test_session)] == [done.id]
+    records = list(export_done_tasks(test_session))
+    assert [record["id"] for record in records] == [done.id]
+    assert records[0]["consensus"] == "cat" and records[0]["consensus_votes"] == 2
+
+    labeled, next_cursor = get_user_labeled_tasks(test_session, users[0].id)
+    assert [(task.id, content) for task, content in labeled] == [(done.id, "cat")]
+    assert next_cursor is None
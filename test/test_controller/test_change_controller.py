@@ -0,0 +1,63 @@
+import pytest
+
+from app.DatabaseManager import DatabaseManager
+from app.controller.change_controller import get_changes
+from app.controller.task_controller import add_task, mark_task_done
+from app.controller.taskLabel_controller import submit_label
+from app.controller.user_controller import create_user
+
+# Initialize the DatabaseManager with the test database URL
+db_manager = DatabaseManager()
+
+
+@pytest.fixture(scope="function")
+def test_session():
+    """Set up an empty database using DatabaseManager and yield a session."""
+    db_manager.drop_db()
+    db_manager.init_db()
+    session = db_manager.SessionLocal()
+    yield session
+    session.close()
+
+
+def _drain(session, since=None, limit=100):
+    changes = []
+    while True:
+        page, since, has_more = get_changes(session, since=since, limit=limit)
+        session.commit()  # Each call reads with a fresh snapshot
+        changes.extend(page)
+        if not has_more:
+            return changes, since
+
+
+def test_changes_since_cursor(test_session):
+    """Test that the feed returns new rows, then only what changed after the cursor."""
+    user = create_user(test_session, name="change_user", password="SecureP@ssw0rd!")
+    tasks = [
+        add_task(test_session, type="classification", data={"n": n}, point=1, title=f"Task {n}",
+                 description="Change feed task", required_labels=1)
+        for n in range(3)
+    ]
+
+    changes, since = _drain(test_session, limit=2)
+    assert [change["id"] for change in changes] == [task.id for task in tasks]
+    assert all(change["entity"] == "task" for change in changes)
+    assert _drain(test_session, since)[0] == []
+
+    submit_label(test_session, user_id=user.id, task_id=tasks[1].id, content="cat")
+    changes, since = _drain(test_session, since)
+    assert {(change["entity"], change["fields"].get("is_done")) for change in changes} == {
+        ("label", None), ("task", True)
+    }
+    assert [change["fields"]["task_id"] for change in changes if change["entity"] == "label"] == [tasks[1].id]
+
+    mark_task_done(test_session, tasks[0].id)
+    changes, _ = _drain(test_session, since)
+    assert [change["id"] for change in changes] == [tasks[0].id]
+    assert changes[0]["seq"] > 0
+
+
+def test_changes_rejects_malformed_cursor(test_session):
+    """Test that a malformed cursor is a ValueError."""
+    with pytest.raises(ValueError):
+        get_changes(test_session, since="not-a-cursor")
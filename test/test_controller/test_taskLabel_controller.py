@@ -1,4 +1,5 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -6,10 +7,14 @@ from app.DatabaseManager import DatabaseManager
 from app.controller.taskLabel_controller import (
     get_label_by_task,
     submit_label,
+    submit_labels,
     calculate_consensus,
 )
 from app.models.Task import Task
+from app.models.TaskLabel import TaskLabel
+from app.models.TaskVoteTally import TaskVoteTally
 from app.models.User import User
+from app.utils.hash_helper import canonical_content_hash
 
 # Initialize the DatabaseManager with the test database URL
 db_manager = DatabaseManager()
@@ -41,23 +46,90 @@ def test_submit_label(test_session):
     test_session.commit()
 
     # Submit a label
-    label = submit_label(
+    label_id = submit_label(
         db=test_session,
         user_id=user.id,
         task_id=task.id,
         content="Label content",
     )
-    assert label is not None
+    assert label_id is not None
+    label = test_session.query(TaskLabel).filter(TaskLabel.id == label_id).first()
     assert label.user_id == user.id
     assert label.task_id == task.id
     assert label.content == "Label content"
 
+    # A second label by the same user is rejected, as in the batch path
+    with pytest.raises(ValueError, match="Task already labeled"):
+        submit_label(db=test_session, user_id=user.id, task_id=task.id, content="Another label")
+
     # Check user points and labeled count
     updated_user = test_session.query(User).filter(User.id == user.id).first()
     assert updated_user.points == 10
     assert updated_user.labeled_count == 1
 
 
+def test_concurrent_submissions_do_not_lose_points(test_session):
+    """Test that concurrent submissions by the same user are all credited."""
+    user = User(name="concurrent_labeler", password="securepass")
+    tasks = [
+        Task(
+            type="classification",
+            data={"example": f"concurrent{i}"},
+            point=3,
+            title=f"Concurrent Task {i}",
+            description="Task for testing concurrent submissions",
+        )
+        for i in range(10)
+    ]
+    test_session.add_all([user, *tasks])
+    test_session.commit()
+
+    def submit(task_id):
+        session = db_manager.SessionLocal()
+        try:
+            return submit_label(session, user_id=user.id, task_id=task_id, content="label")
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        label_ids = list(executor.map(submit, [task.id for task in tasks]))
+
+    assert len(set(label_ids)) == 10
+    test_session.expire_all()
+    updated_user = test_session.query(User).filter(User.id == user.id).first()
+    assert updated_user.points == 30
+    assert updated_user.labeled_count == 10
+
+
+def test_concurrent_duplicate_submissions_credit_once(test_session):
+    """Test that simultaneous labels of one user on one task write and credit a single label."""
+    user = User(name="double_submitter", password="securepass")
+    task = Task(type="classification", data={"example": "race"}, point=7, title="Race Task",
+                description="Labeled twice at once", required_labels=10)
+    test_session.add_all([user, task])
+    test_session.commit()
+
+    def submit(path):
+        session = db_manager.SessionLocal()
+        try:
+            if path == "single":
+                return submit_label(session, user_id=user.id, task_id=task.id, content="label")
+            return submit_labels(session, user_id=user.id, items=[(task.id, "label")])[0].get("label_id")
+        except ValueError:
+            return None
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        label_ids = list(executor.map(submit, ["single", "batch", "single", "batch"]))
+
+    assert len([label_id for label_id in label_ids if label_id]) == 1
+    test_session.expire_all()
+    assert test_session.query(TaskLabel).filter(TaskLabel.task_id == task.id).count() == 1
+    assert test_session.query(Task).filter(Task.id == task.id).one().label_count == 1
+    assert test_session.query(User).filter(User.id == user.id).one().points == 7
+
+
 def test_submit_label_invalid_user_or_task(test_session):
     """Test submitting a label with invalid user or task IDs."""
     invalid_user_id = uuid.uuid4()
@@ -90,13 +162,13 @@ def test_get_label_by_task(test_session):
     test_session.commit()
 
     # Submit a label for the task
-    submitted_label = submit_label(db=test_session, user_id=user.id, task_id=task1.id, content="Label for task1")
+    submitted_label_id = submit_label(db=test_session, user_id=user.id, task_id=task1.id, content="Label for task1")
 
     # Get the label
     label = get_label_by_task(db=test_session, task_id=task1.id)
     assert label is not None
     assert label.content == "Label for task1"
-    assert label.id == submitted_label.id
+    assert label.id == submitted_label_id
 
 
 def test_calculate_consensus(test_session):
@@ -121,9 +193,101 @@ def test_calculate_consensus(test_session):
         submit_label(db=test_session, user_id=user.id, task_id=task.id, content="ConsensusLabel")
 
     # Calculate consensus
-    consensus_task = calculate_consensus(db=test_session, task_id=task.id)
-    assert consensus_task is not None
-    assert consensus_task.is_done is True  # Task should be marked as done
+    consensus = calculate_consensus(db=test_session, task_id=task.id)
+    assert consensus == (canonical_content_hash("ConsensusLabel"), 6)
+    test_session.refresh(task)
+    assert task.is_done is True  # Task should be marked as done
+    assert (task.consensus_hash, task.consensus_votes) == consensus
+
+
+def test_submit_label_updates_vote_tally(test_session):
+    """Test that equivalent answers are tallied together and close the task at its threshold."""
+    task = Task(
+        type="classification",
+        data={"example": "tally_task"},
+        point=1,
+        title="Tally Task",
+        description="Task for testing vote tallies",
+        required_labels=3,
+    )
+    test_session.add(task)
+    test_session.commit()
+
+    contents = ['{"label": "cat", "confidence": 1}', '{"confidence": 1, "label": "cat"}', '{"label": "dog"}']
+    for i, content in enumerate(contents):
+        user = User(name=f"tally_user_{i}", password="password")
+        test_session.add(user)
+        test_session.commit()
+        submit_label(db=test_session, user_id=user.id, task_id=task.id, content=content)
+
+    tallies = {
+        tally.content_hash: tally.votes
+        for tally in test_session.query(TaskVoteTally).filter(TaskVoteTally.task_id == task.id)
+    }
+    assert tallies == {
+        canonical_content_hash(contents[0]): 2,
+        canonical_content_hash(contents[2]): 1,
+    }
+    closed_task = test_session.query(Task).filter(Task.id == task.id).first()
+    assert closed_task.is_done is True
+    assert closed_task.consensus_hash == canonical_content_hash(contents[0])
+    assert closed_task.consensus_votes == 2
+
+
+def test_submit_labels_batch(test_session):
+    """Test submitting a batch of labels with an aggregated points update."""
+    user = User(name="batch_labeler", password="password")
+    tasks = [
+        Task(
+            type="classification",
+            data={"example": f"batch{i}"},
+            point=4,
+            title=f"Batch Task {i}",
+            description="Task for testing batch submission",
+        )
+        for i in range(3)
+    ]
+    test_session.add_all([user, *tasks])
+    test_session.commit()
+    submit_label(db=test_session, user_id=user.id, task_id=tasks[2].id, content="earlier")
+
+    results = submit_labels(test_session, user_id=user.id, items=[
+        (tasks[0].id, "a"),
+        (tasks[1].id, "b"),
+        (tasks[2].id, "c"),
+    ])
+
+    assert [result["status"] for result in results] == ["success", "success", "error"]
+    assert results[2]["detail"] == "Task already labeled"
+    updated_user = test_session.query(User).filter(User.id == user.id).first()
+    assert updated_user.points == 12
+    assert updated_user.labeled_count == 3
+
+
+def test_label_counters_close_tasks(test_session):
+    """Test that single and batch submissions count labels on the task and close it at its threshold."""
+    users = [User(name=f"counter_user_{i}", password="password") for i in range(2)]
+    task = Task(
+        type="classification",
+        data={"example": "counter_task"},
+        point=1,
+        title="Counter Task",
+        description="Task for testing label counters",
+        required_labels=2,
+    )
+    test_session.add_all([*users, task])
+    test_session.commit()
+
+    submit_label(db=test_session, user_id=users[0].id, task_id=task.id, content="a")
+    test_session.refresh(task)
+    assert task.label_count == 1 and task.last_labeled_at is not None
+    assert task.is_done is False
+
+    submit_labels(test_session, user_id=users[1].id, items=[(task.id, "b")])
+    test_session.refresh(task)
+    assert task.label_count == 2
+    assert task.is_done is True and task.done_at is not None
+    assert (task.consensus_hash, task.consensus_votes) == (canonical_content_hash("a"), 1)
 
 
 def test_submit_label_with_exception(test_session):
@@ -189,8 +353,10 @@ def test_calculate_consensus_not_enough_labels(test_session):
         submit_label(db=test_session, user_id=user.id, task_id=task.id, content="Label")
 
     result = calculate_consensus(db=test_session, task_id=task.id)
-    assert result is not None
-    assert result.is_done is False  # Task should not be marked as done
+    assert result == (canonical_content_hash("Label"), 3)
+    test_session.refresh(task)
+    assert task.is_done is False  # Task should not be marked as done
+    assert task.consensus_hash is None  # Only done tasks store their consensus
 
 
 def test_get_label_by_task_not_found(test_session):
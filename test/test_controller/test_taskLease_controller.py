@@ -0,0 +1,185 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.DatabaseManager import DatabaseManager
+from app.controller.taskLabel_controller import submit_label, submit_label_async
+from app.controller.taskLease_controller import (
+    _lease_upsert_statement,
+    lease_task_feed,
+    lease_task_feed_async,
+    heartbeat_lease,
+    heartbeat_lease_async,
+    sweep_expired_leases,
+)
+from app.models.Task import Task
+from app.models.TaskLease import TaskLease
+from app.models.User import User
+
+# Initialize the DatabaseManager with the test database URL
+db_manager = DatabaseManager()
+
+
+@pytest.fixture(scope="function")
+def test_session():
+    """Set up the database using DatabaseManager and yield a session."""
+    db_manager.drop_db()
+    db_manager.init_db()  # Initialize the database and create tables
+    session = db_manager.SessionLocal()
+    yield session
+    session.close()
+    db_manager.drop_db()  # Cleanup the database after tests
+
+
+def _create_tasks(session, count):
+    tasks = [
+        Task(
+            type="classification",
+            data={"example": f"lease{i}"},
+            point=5,
+            title=f"Lease Task {i}",
+            description="Task for testing leases",
+        )
+        for i in range(count)
+    ]
+    session.add_all(tasks)
+    session.commit()
+    return tasks
+
+
+def test_leased_tasks_are_not_handed_to_other_users(test_session):
+    """Test that two labelers receive disjoint pages of the feed."""
+    alice = User(name="lease_alice", password="password")
+    bob = User(name="lease_bob", password="password")
+    test_session.add_all([alice, bob])
+    test_session.commit()
+    _create_tasks(test_session, 4)
+
+    alice_tasks, _, alice_expiry = lease_task_feed(test_session, alice.id, limit=2)
+    bob_tasks, _, _ = lease_task_feed(test_session, bob.id, limit=2)
+
+    assert len(alice_tasks) == 2
+    assert len(bob_tasks) == 2
+    assert alice_expiry is not None
+    assert not {task.id for task in alice_tasks} & {task.id for task in bob_tasks}
+
+
+def test_live_lease_is_not_taken_over(test_session):
+    """Test that a lease upsert racing a committed lease of another user leaves it alone."""
+    alice = User(name="race_alice", password="password")
+    bob = User(name="race_bob", password="password")
+    test_session.add_all([alice, bob])
+    test_session.commit()
+    task = _create_tasks(test_session, 1)[0]
+    alice_tasks, _, _ = lease_task_feed(test_session, alice.id, limit=1)
+    assert [t.id for t in alice_tasks] == [task.id]
+
+    # Bob's feed query ran before Alice's lease committed, so only the upsert sees it
+    now = datetime.now(timezone.utc)
+    leased = test_session.execute(_lease_upsert_statement([task], bob.id, now, now + timedelta(minutes=5)))
+    assert leased.scalars().all() == []
+    test_session.commit()
+    assert test_session.query(TaskLease).filter(TaskLease.task_id == task.id).one().user_id == alice.id
+
+    # Once it expired, Bob takes it over
+    test_session.query(TaskLease).update({"expires_at": TaskLease.heartbeat_at})
+    test_session.commit()
+    leased = test_session.execute(_lease_upsert_statement([task], bob.id, now, now + timedelta(minutes=5)))
+    assert leased.scalars().all() == [task.id]
+    test_session.commit()
+
+
+def test_submit_releases_lease(test_session):
+    """Test that submitting a label releases the user's lease."""
+    user = User(name="lease_submitter", password="password")
+    test_session.add(user)
+    test_session.commit()
+    task = _create_tasks(test_session, 1)[0]
+
+    lease_task_feed(test_session, user.id, limit=1)
+    assert test_session.query(TaskLease).filter(TaskLease.task_id == task.id).count() == 1
+
+    submit_label(test_session, user_id=user.id, task_id=task.id, content="label")
+    assert test_session.query(TaskLease).filter(TaskLease.task_id == task.id).count() == 0
+
+
+def test_heartbeat_extends_lease(test_session):
+    """Test renewing an active lease and rejecting renewal without one."""
+    user = User(name="lease_heartbeat", password="password")
+    test_session.add(user)
+    test_session.commit()
+    task = _create_tasks(test_session, 1)[0]
+
+    _, _, expires_at = lease_task_feed(test_session, user.id, limit=1)
+    renewed_at = heartbeat_lease(test_session, user_id=user.id, task_id=task.id)
+    assert renewed_at >= expires_at
+
+    with pytest.raises(ValueError) as exc_info:
+        heartbeat_lease(test_session, user_id=user.id, task_id=uuid.uuid4())
+    assert "No active lease" in str(exc_info.value)
+
+
+def test_async_heartbeat_extends_lease(test_session):
+    """Test renewing a lease on an AsyncSession."""
+    user = User(name="lease_async_heartbeat", password="password")
+    test_session.add(user)
+    test_session.commit()
+    task = _create_tasks(test_session, 1)[0]
+    _, _, expires_at = lease_task_feed(test_session, user.id, limit=1)
+
+    async def scenario():
+        try:
+            async with db_manager.AsyncSessionLocal() as db:
+                renewed_at = await heartbeat_lease_async(db, user_id=user.id, task_id=task.id)
+                with pytest.raises(ValueError):
+                    await heartbeat_lease_async(db, user_id=user.id, task_id=uuid.uuid4())
+                return renewed_at
+        finally:
+            await db_manager.dispose_async_engine()
+
+    assert asyncio.run(scenario()) >= expires_at
+
+
+def test_sweep_expired_leases(test_session):
+    """Test that expired leases are swept and their tasks become available again."""
+    alice = User(name="sweep_alice", password="password")
+    bob = User(name="sweep_bob", password="password")
+    test_session.add_all([alice, bob])
+    test_session.commit()
+    task = _create_tasks(test_session, 1)[0]
+
+    lease_task_feed(test_session, alice.id, limit=1)
+    test_session.query(TaskLease).update({"expires_at": TaskLease.heartbeat_at})
+    test_session.commit()
+
+    assert sweep_expired_leases(test_session) == 1
+    bob_tasks, _, _ = lease_task_feed(test_session, bob.id, limit=1)
+    assert [t.id for t in bob_tasks] == [task.id]
+
+
+def test_async_feed_and_submit_under_concurrency(test_session):
+    """Test that concurrent async feed requests on one event loop get disjoint leases."""
+    users = [User(name=f"async_labeler_{i}", password="password") for i in range(5)]
+    test_session.add_all(users)
+    test_session.commit()
+    _create_tasks(test_session, 10)
+
+    async def lease_and_submit(user_id):
+        async with db_manager.AsyncSessionLocal() as db:
+            tasks, _, _ = await lease_task_feed_async(db, user_id, limit=2)
+            for task in tasks:
+                await submit_label_async(db, user_id=user_id, task_id=task.id, content="label")
+            return [task.id for task in tasks]
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(lease_and_submit(user.id) for user in users))
+        finally:
+            await db_manager.dispose_async_engine()
+
+    leased = [task_id for page in asyncio.run(scenario()) for task_id in page]
+    assert len(leased) == 10
+    assert len(set(leased)) == 10
+    assert test_session.query(TaskLease).count() == 0
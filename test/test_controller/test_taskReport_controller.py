@@ -3,10 +3,14 @@ import uuid
 import pytest
 
 from app.DatabaseManager import DatabaseManager
+from app.config import settings
 from app.controller.taskReport_controller import (
+    list_quarantined_tasks,
     list_reported_tasks_by_user,
+    release_quarantined_task,
     report_task,
 )
+from app.controller.task_controller import get_task_feed
 from app.models.Task import Task
 from app.models.User import User
 
@@ -50,6 +54,8 @@ def test_report_task(test_session):
     assert task_report.user_id == user.id
     assert task_report.task_id == task.id
     assert task_report.details == "This task has an issue."
+    test_session.refresh(task)
+    assert task.report_count == 1
 
 
 def test_report_task_invalid_user_or_task(test_session):
@@ -99,3 +105,61 @@ def test_list_reported_tasks_by_user(test_session):
     assert len(reported_tasks) == 2
     assert any(report.details == "Issue with task1." for report in reported_tasks)
     assert any(report.details == "Issue with task2." for report in reported_tasks)
+
+
+def test_distinct_reporters_quarantine_task(test_session, monkeypatch):
+    """Test that a task reported by more than the threshold of users leaves the feed until released."""
+    monkeypatch.setattr(settings, "QUARANTINE_REPORT_THRESHOLD", 2)
+    users = [User(name=f"quarantine_reporter_{i}", password="password") for i in range(4)]
+    task = Task(type="image", data={"url": "https://example.com/missing.jpg"}, point=5,
+                title="Broken Task", description="Task with a broken image")
+    test_session.add_all([*users, task])
+    test_session.commit()
+
+    # Reports from the same user count once
+    for _ in range(3):
+        report_task(db=test_session, user_id=users[0].id, task_id=task.id, details="Image does not load")
+    report_task(db=test_session, user_id=users[1].id, task_id=task.id, details="Image does not load")
+    test_session.refresh(task)
+    assert (task.report_count, task.reporter_count, task.is_quarantined) == (4, 2, False)
+
+    report_task(db=test_session, user_id=users[2].id, task_id=task.id, details="Image does not load")
+    test_session.refresh(task)
+    assert task.is_quarantined
+    assert task.quarantined_at is not None
+    feed, _ = get_task_feed(users[3].id, test_session, limit=100)
+    assert task.id not in [t.id for t in feed]
+
+    quarantined, next_cursor = list_quarantined_tasks(test_session, limit=100)
+    assert task.id in [t.id for t in quarantined]
+    assert next_cursor is None
+
+    released = release_quarantined_task(test_session, task.id)
+    assert (released.is_quarantined, released.quarantined_at, released.reporter_count) == (False, None, 0)
+    feed, _ = get_task_feed(users[3].id, test_session, limit=100)
+    assert task.id in [t.id for t in feed]
+
+    with pytest.raises(ValueError, match="not quarantined"):
+        release_quarantined_task(test_session, task.id)
+    assert release_quarantined_task(test_session, uuid.uuid4()) is None
+
+
+def test_list_quarantined_tasks_pages(test_session, monkeypatch):
+    """Test that the review queue pages through quarantined tasks with a cursor."""
+    monkeypatch.setattr(settings, "QUARANTINE_REPORT_THRESHOLD", 1)
+    users = [User(name=f"queue_reporter_{i}", password="password") for i in range(2)]
+    tasks = [Task(type="image", data={"n": i}, point=1, title=f"Queue Task {i}", description="Broken")
+             for i in range(3)]
+    test_session.add_all([*users, *tasks])
+    test_session.commit()
+    for task in tasks:
+        for user in users:
+            report_task(db=test_session, user_id=user.id, task_id=task.id, details="Broken")
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = list_quarantined_tasks(test_session, limit=2, cursor=cursor)
+        seen += [task.id for task in page]
+        if cursor is None:
+            break
+    assert seen == [task.id for task in tasks]
@@ -1,4 +1,8 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.DatabaseManager import DatabaseManager
 from app.controller.task_controller import (
@@ -7,9 +11,14 @@ from app.controller.task_controller import (
     add_task,
     mark_task_done,
     get_user_labeled_tasks,
+    export_done_tasks,
+    reconcile_task_counters,
 )
+from app.controller.taskLabel_controller import submit_label
 from app.controller.user_controller import create_user
 from app.models.Task import Task
+from app.models.TaskLabel import TaskLabel
+from app.utils.hash_helper import canonical_content_hash
 
 # Initialize the DatabaseManager with the test database URL
 db_manager = DatabaseManager()
@@ -74,9 +83,39 @@ def test_get_task_feed(test_session):
     mark_task_done(db=test_session, task_id=task1.id)  # Mark one task as done
 
     # Fetch task feed
-    task_feed = get_task_feed(user_id=user.id, db=test_session)
+    task_feed, next_cursor = get_task_feed(user_id=user.id, db=test_session)
     assert len(task_feed) == 1
     assert task_feed[0].id == task2.id  # Only the unfinished task should be in the feed
+    assert next_cursor is None
+
+
+def test_get_task_feed_pagination(test_session):
+    """Test that the feed pages through open tasks with a cursor."""
+    db_manager.drop_db()
+    db_manager.init_db()
+    user = create_user(test_session, name="task_feed_page_user", password="SecureP@ssw0rd!")
+    created = [
+        add_task(
+            db=test_session,
+            type="classification",
+            data={"example": f"task{i}"},
+            point=5,
+            title=f"Task {i}",
+            description="Paginated test task",
+        )
+        for i in range(5)
+    ]
+
+    first_page, cursor = get_task_feed(user_id=user.id, db=test_session, limit=3)
+    assert len(first_page) == 3
+    assert cursor is not None
+
+    second_page, cursor = get_task_feed(user_id=user.id, db=test_session, limit=3, cursor=cursor)
+    assert len(second_page) == 2
+    assert cursor is None
+
+    returned_ids = {task.id for task in first_page + second_page}
+    assert returned_ids == {task.id for task in created}
 
 
 def test_list_done_tasks(test_session):
@@ -135,6 +174,7 @@ def test_mark_task_done(test_session):
     # Mark the task as done
     updated_task = mark_task_done(db=test_session, task_id=task.id)
     assert updated_task.is_done is True
+    assert updated_task.done_at is not None
 
     # Verify in the database
     fetched_task = test_session.query(Task).filter(Task.id == task.id).first()
@@ -170,14 +210,111 @@ def test_get_user_labeled_tasks(test_session):
     )
 
     # Add labels for the tasks
-    from app.controller.taskLabel_controller import submit_label
     submit_label(test_session, user_id=user.id, task_id=task1.id, content="label1")
     submit_label(test_session, user_id=user.id, task_id=task2.id, content="label2")
 
+    # Another user labels the same task, which must not leak into the first user's labels
+    other_user = create_user(test_session, name="label_test_other", password="SecureP@ssw0rd!")
+    submit_label(test_session, user_id=other_user.id, task_id=task1.id, content="other")
+
+    # A second label of the user on the same task is rejected by the unique index
+    test_session.add(TaskLabel(user_id=user.id, task_id=task1.id, content="duplicate"))
+    with pytest.raises(IntegrityError):
+        test_session.commit()
+    test_session.rollback()
+
     # Get labeled tasks
-    labeled_tasks = get_user_labeled_tasks(test_session, user.id)
+    labeled_tasks, next_cursor = get_user_labeled_tasks(test_session, user.id)
 
     # Verify results
     assert len(labeled_tasks) == 2
-    assert any(task.id == task1.id for task in labeled_tasks)
-    assert any(task.id == task2.id for task in labeled_tasks)
+    assert next_cursor is None
+    assert dict((task.id, content) for task, content in labeled_tasks) == {task1.id: "label1", task2.id: "label2"}
+
+    # Page through one task at a time
+    first_page, cursor = get_user_labeled_tasks(test_session, user.id, limit=1)
+    second_page, cursor_after = get_user_labeled_tasks(test_session, user.id, limit=1, cursor=cursor)
+    assert cursor is not None and cursor_after is None
+    assert {first_page[0][0].id, second_page[0][0].id} == {task1.id, task2.id}
+
+
+def test_export_done_tasks(test_session):
+    """Test streaming done tasks with their labels and consensus, filtered by tag."""
+    db_manager.drop_db()
+    db_manager.init_db()
+
+    users = [create_user(test_session, name=f"export_user_{i}", password="SecureP@ssw0rd!") for i in range(3)]
+    done = add_task(test_session, type="classification", data={"example": "done"}, point=5,
+                    title="Done", description="Labeled to completion", tags=["export"], required_labels=3)
+    other = add_task(test_session, type="classification", data={"example": "other"}, point=5,
+                     title="Other", description="Done without the tag", tags=["skip"], is_done=True)
+    add_task(test_session, type="classification", data={"example": "open"}, point=5,
+             title="Open", description="Not done yet", tags=["export"])
+
+    for user, content in zip(users, ["cat", "dog", "dog"]):
+        submit_label(test_session, user_id=user.id, task_id=done.id, content=content)
+
+    records = list(export_done_tasks(test_session, yield_per=1))
+    assert [record["id"] for record in records] == [done.id, other.id]
+    assert [label["content"] for label in records[0]["labels"]] == ["cat", "dog", "dog"]
+    assert records[0]["consensus"] == "dog" and records[0]["consensus_votes"] == 2
+    assert records[1]["labels"] == [] and records[1]["consensus"] is None
+
+    assert [record["id"] for record in export_done_tasks(test_session, tag="export")] == [done.id]
+
+    # The stored consensus is exported as is, and tallied from the labels when missing
+    test_session.query(Task).filter(Task.id == done.id).update(
+        {Task.consensus_hash: canonical_content_hash("cat"), Task.consensus_votes: 1})
+    test_session.commit()
+    assert next(export_done_tasks(test_session, tag="export"))["consensus"] == "cat"
+    test_session.query(Task).filter(Task.id == done.id).update({Task.consensus_hash: None, Task.consensus_votes: None})
+    test_session.commit()
+    record = next(export_done_tasks(test_session, tag="export"))
+    assert (record["consensus"], record["consensus_votes"]) == ("dog", 2)
+
+    # The creation range reads created_at, so it also holds for ids that are not time-ordered
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    test_session.query(Task).filter(Task.id == other.id).update(
+        {Task.id: uuid.uuid4(), Task.created_at: yesterday - timedelta(days=1)})
+    test_session.commit()
+    assert [record["id"] for record in export_done_tasks(test_session, created_after=yesterday)] == [done.id]
+    assert len(list(export_done_tasks(test_session, created_before=yesterday))) == 1
+
+
+def test_task_feed_ranks_by_label_count(test_session):
+    """Test that the feed serves tasks closest to completion first and pages across counter values."""
+    db_manager.drop_db()
+    db_manager.init_db()
+    user = create_user(test_session, name="feed_ranker", password="SecureP@ssw0rd!")
+    tasks = [
+        add_task(test_session, type="classification", data={"n": n}, point=1, title=f"Task {n}",
+                 description="Ranked feed task")
+        for n in range(3)
+    ]
+    test_session.query(Task).filter(Task.id == tasks[2].id).update({Task.label_count: 2})
+    test_session.commit()
+
+    first_page, cursor = get_task_feed(user.id, test_session, limit=2)
+    second_page, last_cursor = get_task_feed(user.id, test_session, limit=2, cursor=cursor)
+    assert [task.id for task in first_page + second_page] == [tasks[2].id, tasks[0].id, tasks[1].id]
+    assert last_cursor is None
+
+
+def test_reconcile_task_counters(test_session):
+    """Test that drifted counters are recounted from the label and report tables."""
+    db_manager.drop_db()
+    db_manager.init_db()
+    user = create_user(test_session, name="reconcile_user", password="SecureP@ssw0rd!")
+    tasks = [
+        add_task(test_session, type="classification", data={"n": n}, point=1, title=f"Task {n}",
+                 description="Counter drift task")
+        for n in range(3)
+    ]
+    submit_label(test_session, user_id=user.id, task_id=tasks[0].id, content="label")
+    assert reconcile_task_counters(test_session, batch_size=2) == 0
+
+    test_session.query(Task).update({Task.label_count: 5, Task.report_count: 1}, synchronize_session=False)
+    test_session.commit()
+    assert reconcile_task_counters(test_session, batch_size=2) == 3
+    counts = dict(test_session.query(Task.id, Task.label_count).all())
+    assert counts == {tasks[0].id: 1, tasks[1].id: 0, tasks[2].id: 0}
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 
 from app.DatabaseManager import DatabaseManager
@@ -7,9 +9,15 @@ from app.controller.user_controller import (
     get_information,
     change_information,
     change_password,
-    UserAlreadyExistsError, get_leaderboard
+    UserAlreadyExistsError, get_leaderboard,
+    get_leaderboard_position,
+    get_windowed_leaderboard,
+    leaderboard_window_start
 )
+from app.controller.taskLabel_controller import submit_label
+from app.models.Task import Task
 from app.models.User import User
+from app.models.UserPointBucket import UserPointBucket
 from app.utils.hash_helper import check_password_hash
 
 # Initialize the DatabaseManager with the test database URL
@@ -90,3 +98,59 @@ def test_leader_board(db_session):
     leader_board = get_leaderboard(db_session)
     ordered_names = [user.name for user in leader_board]
     assert ordered_names == ["Charlie", "Bob", "Alice"]
+
+
+def test_leader_board_pagination_and_rank(db_session):
+    for name, points in [("Dana", 10), ("Erin", 20), ("Frank", 20), ("Grace", 40)]:
+        create_user(db_session, name=name, password="SecureP@ssw0rd!", points=points)
+
+    page = get_leaderboard(db_session, offset=1, limit=2)
+    assert {row.name for row in page} == {"Erin", "Frank"}
+    assert [row.rank for row in page] == [2, 2]
+
+
+def test_leader_board_position(db_session):
+    users = {
+        name: create_user(db_session, name=name, password="SecureP@ssw0rd!", points=points)
+        for name, points in [("Dana", 10), ("Erin", 20), ("Frank", 30), ("Grace", 40), ("Heidi", 50)]
+    }
+
+    rank, rows = get_leaderboard_position(db_session, users["Frank"].id, radius=1)
+    assert rank == 3
+    assert [row.name for row in rows] == ["Grace", "Frank", "Erin"]
+    assert [row.rank for row in rows] == [2, 3, 4]
+
+    rank, rows = get_leaderboard_position(db_session, users["Heidi"].id, radius=2)
+    assert rank == 1
+    assert [row.name for row in rows] == ["Heidi", "Grace", "Frank"]
+
+
+def test_leader_board_position_with_ties_above_the_neighborhood(db_session):
+    for name, points in [("Ivan", 90), ("Judy", 80), ("Ken", 80), ("Liam", 80), ("Mia", 70)]:
+        create_user(db_session, name=name, password="SecureP@ssw0rd!", points=points)
+
+    ranked = {row.id: row.rank for row in get_leaderboard(db_session, limit=100)}
+    for row in get_leaderboard(db_session, limit=100):
+        rank, rows = get_leaderboard_position(db_session, row.id, radius=1)
+        assert rank == row.rank
+        assert all(neighbor.rank == ranked[neighbor.id] for neighbor in rows)
+
+
+def test_windowed_leader_board(db_session):
+    alice = create_user(db_session, name="Alice", password="SecureP@ssw0rd!")
+    bob = create_user(db_session, name="Bob", password="SecureP@ssw0rd!")
+    task = Task(type="classification", data={"example": "window"}, point=7, title="Window Task",
+                description="Task for testing windowed leaderboards")
+    db_session.add(task)
+    db_session.commit()
+
+    submit_label(db_session, user_id=alice.id, task_id=task.id, content="label")
+    # Bob earned a lot, but before any of the current windows started
+    earliest_start = min(leaderboard_window_start(window) for window in ("day", "week", "month"))
+    db_session.add(UserPointBucket(bucket_start=earliest_start - timedelta(hours=1),
+                                   user_id=bob.id, points=500, labeled_count=50))
+    db_session.commit()
+
+    for window in ("day", "week", "month"):
+        board = get_windowed_leaderboard(db_session, window)
+        assert [(row.name, row.points, row.labeled_count, row.rank) for row in board] == [("Alice", 7, 1, 1)]
@@ -1,7 +1,8 @@
 import pytest
 from fastapi import HTTPException
 
-from app.utils.JWT_helper import create_access_token, decode_access_token
+from app.utils.JWT_helper import create_access_token, decode_access_token, create_refresh_token, \
+    decode_refresh_token
 
 
 def test_create_access_token():
@@ -22,3 +23,19 @@ def test_decode_access_token_invalid():
         decode_access_token("invalidtoken")
     assert excinfo.value.status_code == 401
     assert excinfo.value.detail == "Invalid token"
+
+
+def test_refresh_token_is_not_an_access_token():
+    token = create_refresh_token("user123")
+    with pytest.raises(HTTPException) as excinfo:
+        decode_access_token(token)
+    assert excinfo.value.status_code == 401
+    payload = decode_refresh_token(token)
+    assert payload["user_id"] == "user123"
+    assert payload["jti"] != decode_refresh_token(create_refresh_token("user123"))["jti"]
+
+
+def test_access_token_is_not_a_refresh_token():
+    with pytest.raises(HTTPException) as excinfo:
+        decode_refresh_token(create_access_token({"user_id": "user123"}))
+    assert excinfo.value.detail == "Invalid refresh token"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, UUID
+
+from app.utils.archive_helper import archive_table, column_list
+
+
+def test_archive_table_copies_columns_only():
+    metadata = MetaData()
+    Table("tasks", metadata, Column("id", UUID, primary_key=True))
+    labels = Table("labels", metadata,
+                   Column("id", UUID, primary_key=True),
+                   Column("task_id", UUID, ForeignKey("tasks.id"), primary_key=True),
+                   Column("content", String, nullable=False),
+                   Column("votes", Integer, server_default="0"),
+                   postgresql_partition_by="HASH (task_id)")
+
+    archive = archive_table(labels, "archived_labels", metadata, Index("ix_archived_labels_task_id", "task_id"))
+    assert [column.name for column in archive.columns] == ["id", "task_id", "content", "votes"]
+    assert [column.name for column in archive.primary_key] == ["id"]
+    assert not archive.foreign_keys
+    assert archive.c.votes.server_default is None
+    assert archive.c.content.nullable is False
+    assert archive.dialect_options["postgresql"]["partition_by"] is None
+    assert [index.name for index in archive.indexes] == ["ix_archived_labels_task_id"]
+    assert column_list(archive, "l.") == "l.id, l.task_id, l.content, l.votes"
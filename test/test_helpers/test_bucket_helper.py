@@ -0,0 +1,9 @@
+from datetime import timezone
+
+from app.utils.bucket_helper import current_bucket_start
+
+
+def test_current_bucket_start_is_the_hour_in_utc():
+    start = current_bucket_start()
+    assert start.tzinfo == timezone.utc
+    assert (start.minute, start.second, start.microsecond) == (0, 0, 0)
@@ -0,0 +1,61 @@
+import asyncio
+
+from app.utils.bulk_helper import iter_lines, iter_records
+
+
+def _records(body: bytes, format: str, chunk_size: int = 7, max_chars: int = 1024 * 1024) -> list:
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def collect():
+        lines = iter_lines(chunks(), max_chars)
+        return [record async for record in iter_records(lines, format, max_chars)]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_records():
+    body = '{"type": "image", "point": 1}\n\nnot json\n{"title": "ü"}'.encode()
+    records = _records(body, "ndjson")
+    assert records[0] == (1, {"type": "image", "point": 1})
+    assert records[1][0] == 3 and isinstance(records[1][1], ValueError)
+    assert records[2] == (4, {"title": "ü"})
+
+
+def test_csv_records_with_json_and_multiline_cells():
+    body = (
+        'type,data,point,tags,description\r\n'
+        'image,"{""url"": ""a.jpg""}",5,"[""x""]",\r\n'
+        'audio,"{""url"": ""b.wav""}",3,,"two\nlines"\r\n'
+        'text,{bad,1,,\n'
+    ).encode()
+    records = _records(body, "csv")
+    assert records[0] == (2, {"type": "image", "data": {"url": "a.jpg"}, "point": "5", "tags": ["x"]})
+    assert records[1] == (3, {"type": "audio", "data": {"url": "b.wav"}, "point": "3", "description": "two\nlines"})
+    assert records[2][0] == 5 and isinstance(records[2][1], ValueError)
+
+
+def test_csv_unterminated_quote():
+    records = _records(b'type,title\nimage,"open\n', "csv")
+    assert len(records) == 1 and isinstance(records[0][1], ValueError)
+
+
+def test_csv_record_over_the_size_cap():
+    body = b'type,title\nimage,"open\n' + b'x\n' * 20 + b'text,closed\n'
+    records = _records(body, "csv", max_chars=16)
+    assert records[0][0] == 2 and "longer than 16" in str(records[0][1])
+    assert records[-1] == (23, {"type": "text", "title": "closed"})
+
+
+def test_ndjson_line_over_the_size_cap():
+    body = b'{"title": "' + b"x" * 1000 + b'"}\n{"title": "next"}'
+    records = _records(body, "ndjson", chunk_size=64, max_chars=100)
+    assert records[0][0] == 1 and "longer than 100" in str(records[0][1])
+    assert records[1:] == [(2, {"title": "next"})]
+
+
+def test_csv_single_line_without_newline_over_the_size_cap():
+    records = _records(b'type,title\nimage,"' + b"x" * 1000, "csv", chunk_size=64, max_chars=100)
+    assert len(records) == 1
+    assert records[0][0] == 2 and "longer than 100" in str(records[0][1])
@@ -0,0 +1,59 @@
+import time
+
+from pydantic import BaseModel
+
+from app.utils.cache_helper import TTLCache, principal_cache, refresh_cached_principal
+
+
+def test_get_and_set():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.get("missing") is None
+
+
+def test_entries_expire():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+
+def test_non_positive_ttl_is_not_cached():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value", ttl=-5)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_pop_and_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_refresh_cached_principal():
+    class Principal(BaseModel):
+        points: int
+
+    principal_cache.set("user", Principal(points=1))
+    refresh_cached_principal("user", points=5)
+    assert principal_cache.get("user").points == 5
+    # Users that are not cached stay uncached
+    refresh_cached_principal("other", points=5)
+    assert principal_cache.get("other") is None
+    principal_cache.clear()
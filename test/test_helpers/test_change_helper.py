@@ -0,0 +1,35 @@
+from sqlalchemy import Column, MetaData, Table, UUID, create_mock_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.utils.change_helper import change_seq_column, change_xid_column, track_changes
+
+
+def _table():
+    seq, xid = change_seq_column(), change_xid_column()
+    table = Table("labels", MetaData(),
+                  Column("id", UUID, primary_key=True),
+                  Column("change_seq", seq.type, server_default=seq.server_default),
+                  Column("change_xid", xid.type, server_default=xid.server_default))
+    track_changes(table)
+    return table
+
+
+def _ddl(table):
+    statements = []
+    engine = create_mock_engine("postgresql://", lambda sql, *args, **kwargs: statements.append(
+        str(sql.compile(dialect=postgresql.dialect()))))
+    table.metadata.create_all(engine, checkfirst=False)
+    return statements
+
+
+def test_tracked_table_ddl():
+    table = _table()
+    create = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    assert "DEFAULT nextval('change_seq')" in create
+    assert "DEFAULT (pg_current_xact_id()::text::bigint)" in create
+
+    statements = _ddl(table)
+    assert statements[0] == "CREATE SEQUENCE IF NOT EXISTS change_seq"
+    assert statements[-1] == "CREATE TRIGGER labels_track_change BEFORE UPDATE ON labels " \
+                             "FOR EACH ROW EXECUTE FUNCTION track_change()"
@@ -0,0 +1,21 @@
+import uuid
+
+import pytest
+
+from app.utils.cursor_helper import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    task_id = uuid.uuid4()
+    cursor = encode_cursor([task_id])
+    assert decode_cursor(cursor) == [str(task_id)]
+
+
+def test_decode_empty_cursor():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
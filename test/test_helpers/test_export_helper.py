@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.utils.export_helper import iter_ndjson, iter_csv, iter_chunks, CSV_COLUMNS
+
+
+def _record(**fields) -> dict:
+    record = {
+        "id": uuid.UUID(int=1), "type": "image", "title": "Cat?", "description": "Two,\nlines",
+        "data": {"url": "a.jpg"}, "tags": ["x"], "point": 5, "required_labels": 2,
+        "done_at": datetime(2025, 1, 2, tzinfo=timezone.utc),
+        "labels": [{"user_id": uuid.UUID(int=2), "content": "ü",
+                    "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc)}],
+        "consensus": "ü", "consensus_votes": 1,
+    }
+    record.update(fields)
+    return record
+
+
+def test_ndjson_lines():
+    lines = list(iter_ndjson([_record(), _record(consensus=None)]))
+    assert len(lines) == 2 and all(line.endswith("\n") for line in lines)
+    row = json.loads(lines[0])
+    assert row["id"] == str(uuid.UUID(int=1))
+    assert row["labels"][0]["created_at"] == "2025-01-01T00:00:00+00:00"
+    assert json.loads(lines[1])["consensus"] is None
+
+
+def test_csv_lines_round_trip():
+    text = "".join(iter_csv([_record(), _record(tags=None)]))
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0]) == list(CSV_COLUMNS)
+    assert rows[0]["description"] == "Two,\nlines"
+    assert json.loads(rows[0]["data"]) == {"url": "a.jpg"}
+    assert json.loads(rows[0]["labels"])[0]["content"] == "ü"
+    assert rows[1]["tags"] == "null"
+
+
+def test_csv_empty_export_has_header():
+    assert list(iter_csv([])) == [",".join(CSV_COLUMNS) + "\n"]
+
+
+def test_chunks_group_lines():
+    chunks = list(iter_chunks(["aaaa\n"] * 5, size=10))
+    assert chunks == [b"aaaa\naaaa\n", b"aaaa\naaaa\n", b"aaaa\n"]
+    assert list(iter_chunks([], size=10)) == []
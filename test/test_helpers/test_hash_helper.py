@@ -1,4 +1,11 @@
-from app.utils.hash_helper import generate_password_hash, check_password_hash
+import asyncio
+import threading
+
+import pytest
+
+from app.exceptions.HashPoolSaturatedError import HashPoolSaturatedError
+from app.utils.hash_helper import generate_password_hash, check_password_hash, canonical_content_hash, \
+    PasswordHashPool
 
 
 def test_generate_password_hash():
@@ -13,3 +20,31 @@ def test_check_password_hash():
     hashed_password = generate_password_hash(password)
     assert check_password_hash(hashed_password, password) is True
     assert check_password_hash(hashed_password, "wrongpassword") is False
+
+
+def test_canonical_content_hash_ignores_key_order():
+    assert canonical_content_hash('{"a": 1, "b": 2}') == canonical_content_hash('{"b":2,"a":1}')
+    assert canonical_content_hash('{"a": 1}') != canonical_content_hash('{"a": 2}')
+    assert canonical_content_hash("plain label ") == canonical_content_hash("plain label")
+
+
+def test_password_hash_pool_rejects_when_saturated():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool._submit(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(HashPoolSaturatedError):
+            await pool._submit(release.wait)
+        release.set()
+        assert await first is True
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
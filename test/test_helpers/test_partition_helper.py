@@ -0,0 +1,37 @@
+from sqlalchemy import Column, MetaData, Table, UUID, create_mock_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.utils.partition_helper import hash_partition_options, add_hash_partitions
+
+
+def _table(partitions):
+    table = Table("labels", MetaData(),
+                  Column("id", UUID, primary_key=True),
+                  Column("task_id", UUID, primary_key=bool(partitions)),
+                  **hash_partition_options("task_id", partitions))
+    add_hash_partitions(table, partitions)
+    return table
+
+
+def _ddl(table):
+    statements = []
+    engine = create_mock_engine("postgresql://", lambda sql, *args, **kwargs: statements.append(
+        str(sql.compile(dialect=postgresql.dialect()))))
+    table.metadata.create_all(engine, checkfirst=False)
+    return statements
+
+
+def test_unpartitioned_table_has_no_partitions():
+    statements = _ddl(_table(0))
+    assert len(statements) == 1
+    assert "PARTITION" not in statements[0]
+
+
+def test_hash_partitioned_table_creates_children():
+    table = _table(4)
+    assert "PARTITION BY HASH (task_id)" in str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    statements = _ddl(table)
+    assert len(statements) == 5
+    assert "CREATE TABLE IF NOT EXISTS labels_p3 PARTITION OF labels FOR VALUES WITH (MODULUS 4, REMAINDER 3)" \
+           in statements
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.utils.pool_helper import InstrumentedQueuePool, pool_stats
+
+
+def test_pool_stats_count_checkouts_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0,
+                           pool_timeout=0.01)
+    connection = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert sum(stats["wait_histogram"].values()) == 2
+    connection.close()
+
+
+def test_pool_stats_survive_dispose():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1)
+    engine.connect().close()
+    engine.dispose()
+    assert pool_stats(engine.pool)["checkouts"] == 1
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.utils.replica_helper import ReplicaRouter
+
+
+def _engine(name, tmp_path):
+    """SQLite stand-in for a database that answers with its own name."""
+    engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE whoami (name TEXT)"))
+        connection.execute(text("INSERT INTO whoami VALUES (:name)"), {"name": name})
+    return engine
+
+
+def _whoami(session):
+    try:
+        return session.execute(text("SELECT name FROM whoami")).scalar()
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = sessionmaker(bind=_engine("primary", tmp_path))
+    replicas = [_engine("replica1", tmp_path), _engine("replica2", tmp_path)]
+    return primary, replicas
+
+
+def test_round_robin_over_replicas(databases):
+    primary, replicas = databases
+    router = ReplicaRouter(primary, replicas)
+    assert [_whoami(router.session()) for _ in range(4)] == ["replica1", "replica2", "replica1", "replica2"]
+
+
+def test_least_connections_prefers_idle_replica(databases):
+    primary, replicas = databases
+    router = ReplicaRouter(primary, replicas, strategy="least_connections")
+    busy = replicas[0].connect()
+    try:
+        assert _whoami(router.session()) == "replica2"
+    finally:
+        busy.close()
+
+
+def test_reads_pinned_to_primary_after_write(databases):
+    primary, replicas = databases
+    router = ReplicaRouter(primary, replicas, pin_seconds=60)
+    assert _whoami(router.session(time.time())) == "primary"
+    assert _whoami(router.session()).startswith("replica")
+
+
+def test_pin_expires(databases):
+    primary, replicas = databases
+    router = ReplicaRouter(primary, replicas, pin_seconds=5)
+    assert _whoami(router.session(time.time() - 10)).startswith("replica")
+
+
+def test_write_time_in_the_future_does_not_pin(databases):
+    primary, replicas = databases
+    router = ReplicaRouter(primary, replicas, pin_seconds=5)
+    assert _whoami(router.session(time.time() + 3600)).startswith("replica")
+
+
+def test_without_replicas_reads_use_primary(databases):
+    primary, _ = databases
+    assert _whoami(ReplicaRouter(primary, []).session()) == "primary"
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+from app.utils.uuid_helper import uuid7, uuid7_time, uuid7_lower_bound
+
+
+def test_uuid7_layout():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_is_monotonic():
+    values = [uuid7() for _ in range(10000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_time_round_trip():
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    value = uuid7()
+    assert before <= uuid7_time(value) <= datetime.now(timezone.utc) + timedelta(milliseconds=1)
+
+
+def test_uuid7_lower_bound_orders_before_later_ids():
+    moment = datetime.now(timezone.utc) - timedelta(seconds=1)
+    assert uuid7_lower_bound(moment) < uuid7()
+    assert uuid7_lower_bound(datetime.now(timezone.utc) + timedelta(seconds=1)) > uuid7()
@@ -123,11 +123,13 @@ def test_task_with_labels_and_reports_relationship(test_session):
 
     # Add labels and reports to the task
     user = User(name="user1", password="password")
-    test_session.add(user)
+    other_user = User(name="user1_other", password="password")
+    test_session.add_all([user, other_user])
     test_session.commit()
 
+    # One label per user and task
     label1 = TaskLabel(user_id=user.id, task_id=task.id, content="Label 1")
-    label2 = TaskLabel(user_id=user.id, task_id=task.id, content="Label 2")
+    label2 = TaskLabel(user_id=other_user.id, task_id=task.id, content="Label 2")
     report1 = TaskReport(task_id=task.id, user_id=user.id, details="Report 1")
     test_session.add_all([label1, label2, report1])
     test_session.commit()
@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.DatabaseManager import DatabaseManager
+from app.SnapshotManager import SnapshotManager
+from app.routers.datasets_router import router as d_router
+from app.routers.tasks_router import router as t_router
+from app.routers.users_router import router as u_router
+
+app = FastAPI()
+app.include_router(d_router)
+app.include_router(t_router)
+app.include_router(u_router)
+client = TestClient(app)
+
+db_manager = DatabaseManager(testing=True)
+
+
+@pytest.fixture(scope="module")
+def db_session():
+    """Set up the database using DatabaseManager and yield a session."""
+    db_manager.init_db()
+    session = db_manager.SessionLocal()
+    yield session
+    session.close()
+    db_manager.drop_db()
+
+
+@pytest.fixture
+def auth_headers(db_session):
+    """Create a test user and return auth headers."""
+    user_data = {
+        "name": "export_user",
+        "password": "SecureP@ssw0rd!"
+    }
+    client.post("/users/signup", json=user_data)
+    response = client.post("/users/login", json=user_data)
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def done_tasks(db_session):
+    """Create one done task per type and return their ids."""
+    ids = {}
+    for task_type in ("image", "audio"):
+        response = client.post("/tasks/new", json={
+            "type": task_type,
+            "data": {"url": f"/path/to/{task_type}"},
+            "title": "Export Task",
+            "description": "A finished task for the export.",
+            "point": 10,
+            "tags": ["export"],
+            "is_done": True
+        })
+        ids[task_type] = response.json()["id"]
+    return ids
+
+
+class TestDatasetExport:
+    def test_export_ndjson(self, auth_headers, done_tasks):
+        """Test streaming the export as NDJSON, filtered by type."""
+        response = client.get("/datasets/export", params={"type": "image"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert done_tasks["image"] in [record["id"] for record in records]
+        assert all(record["type"] == "image" for record in records)
+        assert records[0]["labels"] == [] and records[0]["consensus"] is None
+
+    def test_export_csv(self, auth_headers, done_tasks):
+        """Test streaming the export as CSV."""
+        response = client.get("/datasets/export", params={"format": "csv", "tag": "export"}, headers=auth_headers)
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert set(done_tasks.values()) <= {row["id"] for row in rows}
+        assert json.loads(rows[0]["tags"]) == ["export"]
+
+    def test_export_requires_auth(self, db_session):
+        """Test that the export is not open to anonymous callers."""
+        response = client.get("/datasets/export")
+        assert response.status_code == 401
+
+
+class TestDatasetSnapshots:
+    @pytest.fixture
+    def snapshots(self, tmp_path, db_session, done_tasks):
+        """Build a snapshot in an empty directory from the done tasks."""
+        manager = SnapshotManager()
+        directory = manager.directory
+        manager.directory = tmp_path
+        db_session.execute(text("UPDATE tasks SET done_at = now() - interval '1 hour' WHERE is_done"))
+        db_session.commit()
+        manager.build(db_session)
+        yield manager
+        manager.directory = directory
+
+    def test_list_and_download(self, auth_headers, snapshots):
+        """Test listing the snapshots and downloading the latest as an Arrow file."""
+        versions = client.get("/datasets/snapshots", headers=auth_headers).json()
+        assert versions and versions[-1]["rows"] >= 2
+        response = client.get(f"/datasets/snapshots/{versions[-1]['version']}", headers=auth_headers)
+        assert response.status_code == 200
+        table = pa.ipc.open_file(pa.BufferReader(response.content)).read_all()
+        assert table.num_rows == versions[-1]["rows"]
+
+    def test_range_request(self, auth_headers, snapshots):
+        """Test fetching part of a snapshot with a Range header."""
+        version = snapshots.versions()[-1]["version"]
+        response = client.get(f"/datasets/snapshots/{version}", headers={**auth_headers, "Range": "bytes=0-5"})
+        assert response.status_code == 206
+        assert response.content == b"ARROW1"
+
+    def test_unknown_version(self, auth_headers, snapshots):
+        """Test that a version that is not on disk is a 404."""
+        response = client.get("/datasets/snapshots/999999", headers=auth_headers)
+        assert response.status_code == 404
@@ -1,11 +1,15 @@
+import json
 import uuid
 from pprint import pprint
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 
 from app.DatabaseManager import DatabaseManager
+from app.config import settings
+from app.routers import tasks_router
 from app.routers.tasks_router import router as t_router
 from app.routers.users_router import router as u_router
 
@@ -40,6 +44,14 @@ def auth_headers(db_session):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def reviewer_headers(auth_headers, monkeypatch):
+    """Auth headers of the test user, listed as a reviewer."""
+    user_id = client.get("/users/user/", headers=auth_headers).json()["id"]
+    monkeypatch.setattr(settings, "REVIEWER_USER_IDS", [str(user_id)])
+    return auth_headers
+
+
 @pytest.fixture
 def sample_task():
     """Return a sample task payload."""
@@ -85,6 +97,52 @@ class TestTaskCreation:
         assert response.status_code == 422
 
 
+class TestBulkTaskCreation:
+    def test_bulk_ndjson(self, db_session, sample_task):
+        """Test streaming NDJSON rows, with one invalid row reported by line."""
+        rows = [sample_task, {**sample_task, "point": -1}, {**sample_task, "title": "Second"}]
+        body = "\n".join(json.dumps(row) for row in rows)
+        response = client.post("/tasks/bulk", content=body.encode(),
+                               headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["inserted"] == 2
+        assert data["failed"] == 1
+        assert data["errors"][0]["line"] == 2
+
+    def test_bulk_csv(self, db_session):
+        """Test a CSV upload with JSON cells."""
+        body = (
+            'type,data,point,title,tags\n'
+            'image,"{""url"": ""a.jpg""}",5,CSV Task,"[""bulk""]"\n'
+            'image,not json,5,Broken,\n'
+        )
+        response = client.post("/tasks/bulk", content=body.encode(), headers={"Content-Type": "text/csv"})
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 1
+        assert response.json()["failed"] == 1
+
+    def test_bulk_database_error(self, db_session, sample_task, monkeypatch):
+        """Test that a failed chunk insert reports the rows written so far and the chunk's lines."""
+        writes = []
+
+        async def flaky_insert(db, rows):
+            writes.append(rows)
+            if len(writes) > 1:
+                raise OperationalError("INSERT", {}, Exception("connection lost"))
+            return len(rows)
+
+        monkeypatch.setattr(tasks_router.settings, "BULK_INSERT_CHUNK_SIZE", 2)
+        monkeypatch.setattr(tasks_router, "add_tasks_async", flaky_insert)
+        body = "\n".join(json.dumps(sample_task) for _ in range(4))
+        response = client.post("/tasks/bulk", content=body.encode(),
+                               headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 503
+        data = response.json()
+        assert data["inserted"] == 2
+        assert (data["aborted"]["first_line"], data["aborted"]["last_line"]) == (3, 4)
+
+
 class TestTaskFeed:
     def test_get_task_feed_success(self, db_session, auth_headers, sample_task):
         """Test successful retrieval of task feed."""
@@ -93,7 +151,7 @@ class TestTaskFeed:
 
         response = client.get("/tasks/feed", params={"limit": 2}, headers=auth_headers)
         assert response.status_code == 200
-        tasks = response.json()
+        tasks = response.json()["tasks"]
         assert isinstance(tasks, list)
         assert len(tasks) <= 2
 
@@ -105,6 +163,34 @@ class TestTaskFeed:
             assert "point" in task
             assert "tags" in task
 
+    def test_get_task_feed_pagination(self, db_session, auth_headers, sample_task):
+        """Test walking the task feed page by page with the cursor."""
+        for _ in range(3):
+            client.post("/tasks/new", json=sample_task)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/tasks/feed", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(task["id"] for task in page["tasks"])
+            assert page["has_more"] == (page["next_cursor"] is not None)
+            if not page["has_more"]:
+                break
+            cursor = page["next_cursor"]
+
+        assert len(seen) == len(set(seen))
+        assert len(seen) >= 3
+
+    def test_get_task_feed_invalid_cursor(self, db_session, auth_headers):
+        """Test task feed with a malformed cursor."""
+        response = client.get("/tasks/feed", params={"limit": 2, "cursor": "not-a-cursor"}, headers=auth_headers)
+        assert response.status_code == 400
+
     def test_get_task_feed_unauthorized(self, db_session):
         """Test task feed access without authentication."""
         response = client.get("/tasks/feed", params={"limit": 2})
@@ -155,6 +241,34 @@ class TestTaskSubmission:
         assert response.status_code == 422
 
 
+class TestBatchSubmission:
+    def test_submit_batch_partial_success(self, db_session, auth_headers, sample_task):
+        """Test that invalid items are reported without failing the batch."""
+        task_ids = [client.post("/tasks/new", json=sample_task).json()["id"] for _ in range(2)]
+        missing_task_id = str(uuid.uuid4())
+
+        payload = {"items": [
+            {"task_id": task_ids[0], "content": {"label": "a"}},
+            {"task_id": missing_task_id, "content": {"label": "b"}},
+            {"task_id": task_ids[1], "content": {"label": "c"}},
+            {"task_id": task_ids[1], "content": {"label": "d"}},
+        ]}
+        response = client.post("/tasks/submit/batch", json=payload, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["submitted"] == 2
+        assert data["failed"] == 2
+        statuses = [result["status"] for result in data["results"]]
+        assert statuses == ["success", "error", "success", "error"]
+        assert data["results"][1]["detail"] == "Task not found"
+        assert data["results"][3]["detail"] == "Duplicate task in batch"
+
+    def test_submit_batch_empty(self, db_session, auth_headers):
+        """Test that an empty batch is rejected by validation."""
+        response = client.post("/tasks/submit/batch", json={"items": []}, headers=auth_headers)
+        assert response.status_code == 422
+
+
 class TestTaskReporting:
     def test_report_task_success(self, db_session, auth_headers, sample_task):
         """Test successful task reporting."""
@@ -195,6 +309,30 @@ class TestTaskReporting:
         assert response.status_code == 422
 
 
+    def test_list_quarantined_tasks(self, db_session, reviewer_headers):
+        """Test that the review queue returns a page of quarantined tasks."""
+        response = client.get("/tasks/quarantined?limit=10", headers=reviewer_headers)
+        assert response.status_code == 200
+        assert response.json()["has_more"] is False
+
+    def test_review_queue_requires_reviewer(self, db_session, auth_headers, sample_task):
+        """Test that users who are not reviewers can neither list nor release quarantined tasks."""
+        task_id = client.post("/tasks/new", json=sample_task).json()["id"]
+        assert client.get("/tasks/quarantined", headers=auth_headers).status_code == 403
+        assert client.post(f"/tasks/{task_id}/release", headers=auth_headers).status_code == 403
+
+    def test_release_task_not_quarantined(self, db_session, reviewer_headers, sample_task):
+        """Test releasing a task that is not quarantined."""
+        task_id = client.post("/tasks/new", json=sample_task).json()["id"]
+        response = client.post(f"/tasks/{task_id}/release", headers=reviewer_headers)
+        assert response.status_code == 409
+
+    def test_release_nonexistent_task(self, db_session, reviewer_headers):
+        """Test releasing a task that does not exist."""
+        response = client.post(f"/tasks/{uuid.uuid4()}/release", headers=reviewer_headers)
+        assert response.status_code == 404
+
+
 class TestUserLabeledTasks:
     def test_get_user_labeled_tasks_success(self, db_session, auth_headers, sample_task):
         """Test successful retrieval of user's labeled tasks."""
@@ -233,7 +371,7 @@ class TestUserLabeledTasks:
         pprint(response.json())
         assert response.status_code == 200
 
-        tasks = response.json()
+        tasks = response.json()["tasks"]
         assert isinstance(tasks, list)
         assert len(tasks) == 1
         assert tasks[0]["id"] == task_id
@@ -241,6 +379,8 @@ class TestUserLabeledTasks:
         assert "data" in tasks[0]
         assert "point" in tasks[0]
         assert "label" in tasks[0]
+        assert json.loads(tasks[0]["label"]) == {"label": "test_label"}
+        assert response.json()["has_more"] is False
 
     def test_get_user_labeled_tasks_unauthorized(self, db_session):
         """Test labeled tasks access without authentication."""
@@ -269,4 +409,5 @@ class TestUserLabeledTasks:
 
         response = client.get("/tasks/labeled", headers=auth_headers)
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["tasks"] == []
+        assert response.json()["next_cursor"] is None
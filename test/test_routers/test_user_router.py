@@ -1,8 +1,11 @@
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 
 from app.DatabaseManager import DatabaseManager
+from app.LeaderboardManager import LeaderboardManager
+from app.routers import users_router
 from app.routers.users_router import router
 from app.utils.JWT_helper import create_access_token
 
@@ -11,6 +14,7 @@ app.include_router(router)
 client = TestClient(app)
 
 db_manager = DatabaseManager()
+leaderboard = LeaderboardManager()
 
 
 @pytest.fixture(scope="module")
@@ -32,6 +36,8 @@ def test_create_user_success(db_session):
     })
     assert response.status_code == 201
     assert response.json()["name"] == "signup_test_user"
+    # The write pins the client's reads to the primary on every worker
+    assert response.cookies.get("last_write") == response.headers["X-Last-Write"]
 
 
 def test_create_user_duplicate(db_session):
@@ -47,6 +53,30 @@ def test_login_user_success(db_session):
 
     assert response.status_code == 200
     assert "access_token" in response.json()
+    assert "refresh_token" in response.json()
+
+
+def test_refresh_token_rotation(db_session):
+    client.post("/users/signup", json={"name": "refresh_user", "password": "SecureP@ssw0rd!"})
+    login = client.post("/users/login", json={"name": "refresh_user", "password": "SecureP@ssw0rd!"}).json()
+
+    refreshed = client.post("/users/token/refresh", json={"refresh_token": login["refresh_token"]})
+    assert refreshed.status_code == 200
+    tokens = refreshed.json()
+    response = client.get("/users/user", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 200
+
+    # A rotated refresh token cannot be used again
+    replay = client.post("/users/token/refresh", json={"refresh_token": login["refresh_token"]})
+    assert replay.status_code == 401
+
+    # Refresh tokens are not accepted as access tokens
+    response = client.get("/users/user", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+    assert client.post("/users/token/revoke", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
 
 
 def test_login_user_invalid_credentials(db_session):
@@ -55,6 +85,16 @@ def test_login_user_invalid_credentials(db_session):
     assert response.json()["detail"] == "Invalid credentials"
 
 
+def test_login_user_database_error(db_session, monkeypatch):
+    async def failing_lookup(db, name):
+        raise OperationalError("SELECT", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(users_router, "get_user_by_name_async", failing_lookup)
+    response = client.post("/users/login", json={"name": "login_user", "password": "SecureP@ssw0rd!"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
 def test_get_user_information_success(db_session):
     signup_response = client.post("/users/signup", json={
         "name": "info_test_user",
@@ -91,6 +131,9 @@ def test_update_user_information_success(db_session):
     response = client.put("/users/user", json={"new_name": "updated_name"}, headers=headers)
     assert response.status_code == 200
     assert response.json()["name"] == "updated_name"
+    # The cached principal is dropped on update
+    response = client.get("/users/user", headers=headers)
+    assert response.json()["name"] == "updated_name"
 
 
 def test_update_user_password_success(db_session):
@@ -112,6 +155,7 @@ def test_update_user_password_success(db_session):
 def test_leaderboard_access(db_session):
     db_manager.drop_db()
     db_manager.init_db()
+    leaderboard.reset()
 
     client.post("/users/signup", json={"name": "Alice", "password": "SecureP@ssw0rd!", "points": 100})
     client.post("/users/signup", json={"name": "Bob", "password": "SecureP@ssw0rd!", "points": 200})
@@ -133,3 +177,26 @@ def test_leaderboard_access(db_session):
     expected_order = ["Charlie", "Bob", "Alice"]
     actual_order = [user["name"] for user in data]
     assert actual_order == expected_order
+
+
+def test_leaderboard_pagination_and_my_rank(db_session):
+    db_manager.drop_db()
+    db_manager.init_db()
+    leaderboard.reset()
+
+    for name, points in [("Dana", 10), ("Erin", 20), ("Frank", 30), ("Grace", 40)]:
+        client.post("/users/signup", json={"name": name, "password": "SecureP@ssw0rd!", "points": points})
+
+    login_response = client.post("/users/login", json={"name": "Erin", "password": "SecureP@ssw0rd!"})
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = client.get("/users/leaderboard", params={"offset": 1, "limit": 2}, headers=headers)
+    assert response.status_code == 200
+    assert [user["name"] for user in response.json()] == ["Frank", "Erin"]
+    assert [user["rank"] for user in response.json()] == [2, 3]
+
+    response = client.get("/users/leaderboard/me", params={"radius": 1}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rank"] == 3
+    assert [user["name"] for user in data["neighbors"]] == ["Frank", "Erin", "Dana"]